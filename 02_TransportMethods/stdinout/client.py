@@ -4,6 +4,8 @@ import sys
 from mcp import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
+from stdio_pool import StdioWorkerPool
+
 
 async def main() -> None:
     server_params = StdioServerParameters(
@@ -18,6 +20,14 @@ async def main() -> None:
             res = await session.call_tool("add", {"a": 7, "b": 5})
             print("7 + 5 =", res.content[0].text)
 
+    # the same calls, spread over warm server processes
+    async with StdioWorkerPool(server_params, size=4) as session:
+        await session.initialize()
+        results = await asyncio.gather(
+            *(session.call_tool("add", {"a": i, "b": i}) for i in range(100))
+        )
+        print("sum of 100 pooled adds =", sum(int(r.content[0].text) for r in results))
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -8,5 +8,10 @@ def add(a: int, b: int) -> int:
     return a + b
 
 
+@mcp.tool(description="Return the payload unchanged")
+def echo(payload: str) -> str:
+    return payload
+
+
 if __name__ == "__main__":
     mcp.run(transport="stdio")
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import os
+import sys
+from collections import deque
+from datetime import timedelta
+from typing import Any, TextIO
+
+import anyio
+import mcp.types as types
+from mcp import ClientSession, McpError
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+logger = logging.getLogger(__name__)
+
+# errors meaning the worker's process is gone, not that the request failed
+_DISCONNECTED = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+
+
+class _Worker:
+    def __init__(self, index: int):
+        self.index = index
+        self.session: ClientSession | None = None
+        self.generation = 0  # bumped on every (re)start
+        self.busy = False
+        self.wake = asyncio.Event()  # set to stop or restart it
+        self.starts = 0
+        self.failed_start: BaseException | None = None
+
+
+class StdioWorkerPool:
+    """
+    `size` warm stdio server processes behind one ClientSession-like object:
+
+        async with StdioWorkerPool(server_params, size=4) as session:
+            await session.initialize()
+            result = await session.call_tool("add", {"a": 7, "b": 5})
+
+    Each request goes to an idle worker, or waits for one, so each server
+    process handles one request at a time. Workers whose process exits are
+    restarted. A crash is noticed when a request to the worker fails (that
+    request raises) or when an idle worker misses its health-check ping
+    every `health_interval` seconds.
+
+    The servers must be stateless between requests: consecutive calls can
+    land on different processes.
+    """
+
+    def __init__(
+        self,
+        server: StdioServerParameters,
+        size: int | None = None,
+        health_interval: float = 10.0,
+        restart_delay: float = 0.5,
+        errlog: TextIO = sys.stderr,
+    ):
+        self.server = server
+        self.size = size or os.cpu_count() or 1
+        self.health_interval = health_interval
+        self.restart_delay = restart_delay
+        self.errlog = errlog
+        self.restarts = 0
+        self._workers = [_Worker(i) for i in range(self.size)]
+        # (worker, generation) ready for a request, and requests waiting for
+        # one. A released worker goes straight to the oldest waiter, so a
+        # caller that just released one cannot take it back ahead of them.
+        self._idle: deque[tuple[_Worker, int]] = deque()
+        self._waiters: deque[asyncio.Future] = deque()
+        self._tasks: list[asyncio.Task] = []
+        self._started: list[asyncio.Event] = []
+        self._closing = False
+        self._info: types.InitializeResult | None = None
+
+    async def __aenter__(self) -> "StdioWorkerPool":
+        self._started = [asyncio.Event() for _ in self._workers]
+        self._tasks = [
+            asyncio.create_task(self._serve(worker, started))
+            for worker, started in zip(self._workers, self._started)
+        ]
+        await asyncio.gather(*(started.wait() for started in self._started))
+        if self._info is None:
+            await self.aclose()
+            raise RuntimeError(
+                f"no stdio worker could start: {self._workers[0].failed_start!r}"
+            )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        self._closing = True
+        for worker in self._workers:
+            worker.wake.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _serve(self, worker: _Worker, started: asyncio.Event) -> None:
+        """Runs one worker process, and starts a new one whenever it exits."""
+        while not self._closing:
+            worker.wake.clear()
+            try:
+                async with (
+                    stdio_client(self.server, errlog=self.errlog) as (read, write),
+                    ClientSession(read, write) as session,
+                ):
+                    info = await session.initialize()
+                    self._info = self._info or info
+                    worker.session = session
+                    worker.generation += 1
+                    worker.starts += 1
+                    self._release(worker, worker.generation)
+                    started.set()
+                    await self._watch(worker, session)
+            except Exception as e:
+                worker.failed_start = worker.failed_start or e
+                logger.warning("stdio worker %d failed: %r", worker.index, e)
+            finally:
+                worker.session = None
+                started.set()
+            if not self._closing:
+                self.restarts += 1
+                logger.info("restarting stdio worker %d", worker.index)
+                await asyncio.sleep(self.restart_delay)
+
+    async def _watch(self, worker: _Worker, session: ClientSession) -> None:
+        """Returns when the worker must stop or its process is gone."""
+        while not self._closing:
+            with anyio.move_on_after(self.health_interval):
+                await worker.wake.wait()
+                return
+            if worker.busy:
+                continue
+            try:
+                with anyio.fail_after(self.health_interval):
+                    await session.send_ping()
+            except (TimeoutError, McpError, *_DISCONNECTED):
+                logger.warning("stdio worker %d stopped responding", worker.index)
+                return
+
+    def _release(self, worker: _Worker, generation: int) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result((worker, generation))
+                return
+        self._idle.append((worker, generation))
+
+    async def _acquire(self) -> tuple[_Worker, int]:
+        while True:
+            if self._idle:
+                worker, generation = self._idle.popleft()
+            else:
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                try:
+                    worker, generation = await waiter
+                except asyncio.CancelledError:
+                    if waiter.done() and not waiter.cancelled():
+                        self._release(*waiter.result())
+                    raise
+            # entries of a worker that restarted since it was queued are stale
+            if worker.generation == generation and worker.session is not None:
+                return worker, generation
+
+    async def _request(self, method: str, *args, **kwargs) -> Any:
+        worker, generation = await self._acquire()
+        worker.busy = True
+        try:
+            return await getattr(worker.session, method)(*args, **kwargs)
+        except McpError as e:
+            if e.error.code == types.CONNECTION_CLOSED:
+                worker.wake.set()
+            raise
+        except _DISCONNECTED:
+            worker.wake.set()
+            raise
+        finally:
+            worker.busy = False
+            if not worker.wake.is_set() and worker.generation == generation:
+                self._release(worker, generation)
+
+    async def initialize(self) -> types.InitializeResult:
+        """The workers are initialized on start; returns the first one's result."""
+        return self._info
+
+    async def send_ping(self) -> types.EmptyResult:
+        return await self._request("send_ping")
+
+    async def list_tools(self, *args, **kwargs) -> types.ListToolsResult:
+        return await self._request("list_tools", *args, **kwargs)
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: dict[str, Any] | None = None,
+        read_timeout_seconds: timedelta | None = None,
+        **kwargs,
+    ) -> types.CallToolResult:
+        return await self._request(
+            "call_tool", name, arguments, read_timeout_seconds, **kwargs
+        )
+
+    async def list_resources(self, *args, **kwargs) -> types.ListResourcesResult:
+        return await self._request("list_resources", *args, **kwargs)
+
+    async def list_resource_templates(self, *args, **kwargs) -> types.ListResourceTemplatesResult:
+        return await self._request("list_resource_templates", *args, **kwargs)
+
+    async def read_resource(self, uri) -> types.ReadResourceResult:
+        return await self._request("read_resource", uri)
+
+    async def list_prompts(self, *args, **kwargs) -> types.ListPromptsResult:
+        return await self._request("list_prompts", *args, **kwargs)
+
+    async def get_prompt(
+        self, name: str, arguments: dict[str, str] | None = None
+    ) -> types.GetPromptResult:
+        return await self._request("get_prompt", name, arguments)
+
+    def metrics(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": sum(w.session is not None and not w.busy for w in self._workers),
+            "restarts": self.restarts,
+            "workers": [
+                {"index": w.index, "up": w.session is not None, "busy": w.busy, "starts": w.starts}
+                for w in self._workers
+            ],
+        }
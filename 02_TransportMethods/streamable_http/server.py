@@ -1,6 +1,11 @@
+import os
+
 from mcp.server.fastmcp import FastMCP
 
-mcp = FastMCP("Demo Server", stateless_http=True)
+# STATELESS_HTTP=0 keeps a session per client (Mcp-Session-Id) instead
+mcp = FastMCP(
+    "Demo Server", stateless_http=os.getenv("STATELESS_HTTP", "1") != "0"
+)
 
 
 @mcp.tool(description="Add two integers")
@@ -8,5 +13,10 @@ def add(a: int, b: int) -> int:
     return a + b
 
 
+@mcp.tool(description="Return the payload unchanged")
+def echo(payload: str) -> str:
+    return payload
+
+
 if __name__ == "__main__":
     mcp.run(transport="streamable-http")
@@ -0,0 +1,281 @@
+"""
+Benchmarks the three transports of this chapter against their own servers:
+
+- stdio: stdinout/server.py, spawned by the client. One server process
+  serves one client, so concurrent calls share its single session.
+- stdio-pool: `--workers` stdinout/server.py processes behind one
+  StdioWorkerPool (stdinout/stdio_pool.py). Server CPU and RSS are summed
+  over the workers.
+- sse: sse/server.py on port 8005, one session per concurrent client
+- http: streamable_http/server.py on port 8000 with STATELESS_HTTP=0, one
+  session per concurrent client
+- http-stateless: the same server with STATELESS_HTTP=1 (its default)
+
+For every transport, concurrency and payload size, `--requests` calls of
+the `echo` tool are timed. Each row reports throughput, p50/p95/p99
+latency, the server's CPU time and peak RSS, and the client's CPU time.
+Each concurrency level gets a fresh server.
+
+Results go to `--out` as JSON. `--compare` prints the change against an
+earlier results file:
+
+    python transport_benchmark.py --out before.json
+    python transport_benchmark.py --out after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from importlib.metadata import version
+from types import SimpleNamespace
+
+import psutil
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "stdinout"))
+
+from stdio_pool import StdioWorkerPool  # noqa: E402
+
+TRANSPORTS = ["stdio", "stdio-pool", "sse", "http", "http-stateless"]
+HTTP_SERVERS = {
+    # transport: (directory, port, url, extra environment)
+    "sse": ("sse", 8005, "http://127.0.0.1:8005/sse", {}),
+    "http": ("streamable_http", 8000, "http://127.0.0.1:8000/mcp", {"STATELESS_HTTP": "0"}),
+    "http-stateless": ("streamable_http", 8000, "http://127.0.0.1:8000/mcp", {"STATELESS_HTTP": "1"}),
+}
+
+
+def wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"nothing listening on port {port}")
+
+
+class ProcessGroup:
+    """The psutil.Process calls used here, summed over several processes."""
+
+    def __init__(self, processes: list[psutil.Process]):
+        self.processes = processes
+
+    def cpu_times(self) -> SimpleNamespace:
+        times = [p.cpu_times() for p in self.processes]
+        return SimpleNamespace(
+            user=sum(t.user for t in times), system=sum(t.system for t in times)
+        )
+
+    def memory_info(self) -> SimpleNamespace:
+        return SimpleNamespace(rss=sum(p.memory_info().rss for p in self.processes))
+
+
+@asynccontextmanager
+async def connect(
+    transport: str, clients: int, workers: int
+) -> AsyncIterator[tuple[list[ClientSession], psutil.Process]]:
+    """`clients` initialized sessions to a fresh server, and the server process."""
+    async with AsyncExitStack() as stack:
+        if transport.startswith("stdio"):
+            params = StdioServerParameters(
+                command=sys.executable,
+                args=["server.py"],
+                cwd=os.path.join(HERE, "stdinout"),
+            )
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            if transport == "stdio-pool":
+                pool = await stack.enter_async_context(
+                    StdioWorkerPool(params, size=workers, errlog=devnull)
+                )
+                yield [pool] * clients, ProcessGroup(psutil.Process().children())
+                return
+            read, write = await stack.enter_async_context(
+                stdio_client(params, errlog=devnull)
+            )
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            (server,) = psutil.Process().children()
+            yield [session] * clients, server
+            return
+
+        directory, port, url, env = HTTP_SERVERS[transport]
+        process = subprocess.Popen(
+            [sys.executable, "server.py"],
+            cwd=os.path.join(HERE, directory),
+            env={**os.environ, **env},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        stack.callback(process.wait)
+        stack.callback(process.terminate)
+        wait_for_port(port)
+
+        sessions = []
+        for _ in range(clients):
+            if transport == "sse":
+                streams = await stack.enter_async_context(sse_client(url))
+            else:
+                streams = await stack.enter_async_context(streamablehttp_client(url))
+            session = await stack.enter_async_context(ClientSession(*streams[:2]))
+            await session.initialize()
+            sessions.append(session)
+        yield sessions, psutil.Process(process.pid)
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def run_level(
+    sessions: list[ClientSession],
+    server: psutil.Process,
+    requests: int,
+    payload: str,
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    todo = iter(range(requests))
+
+    async def worker(session: ClientSession) -> None:
+        nonlocal errors
+        for _ in todo:
+            t0 = time.perf_counter()
+            try:
+                result = await session.call_tool("echo", {"payload": payload})
+                failed = result.isError
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - t0)
+            errors += failed
+
+    peak_rss = 0
+
+    async def sample_rss() -> None:
+        nonlocal peak_rss
+        while True:
+            peak_rss = max(peak_rss, server.memory_info().rss)
+            await asyncio.sleep(0.05)
+
+    client = psutil.Process()
+    server_cpu, client_cpu = server.cpu_times(), client.cpu_times()
+    sampler = asyncio.create_task(sample_rss())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(s) for s in sessions))
+    elapsed = time.perf_counter() - t0
+    sampler.cancel()
+    server_after, client_after = server.cpu_times(), client.cpu_times()
+
+    latencies.sort()
+    server_cpu_s = (server_after.user + server_after.system) - (
+        server_cpu.user + server_cpu.system
+    )
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "server_cpu_s": round(server_cpu_s, 3),
+        "server_cpu_pct": round(100 * server_cpu_s / elapsed, 1),
+        "server_cpu_ms_per_request": round(1000 * server_cpu_s / requests, 3),
+        "server_peak_rss_mb": round(max(peak_rss, server.memory_info().rss) / 2**20, 1),
+        "client_cpu_s": round(
+            (client_after.user + client_after.system)
+            - (client_cpu.user + client_cpu.system),
+            3,
+        ),
+    }
+
+
+def key(row: dict) -> tuple:
+    return row["transport"], row["concurrency"], row["payload_bytes"]
+
+
+def print_row(row: dict) -> None:
+    print(
+        f"{row['transport']:<15} c={row['concurrency']:<4} {row['payload_bytes']:>8}B  "
+        f"{row['throughput_rps']:8.1f} req/s  "
+        f"p50 {row['p50_ms']:7.2f}  p95 {row['p95_ms']:7.2f}  p99 {row['p99_ms']:7.2f}ms  "
+        f"server cpu {row['server_cpu_pct']:5.1f}%  rss {row['server_peak_rss_mb']:6.1f}MB  "
+        f"client cpu {100 * row['client_cpu_s'] / row['seconds']:5.1f}%  errors {row['errors']}"
+    )
+
+
+def compare(rows: list[dict], path: str) -> None:
+    with open(path) as f:
+        before = {key(row): row for row in json.load(f)["results"]}
+    print(f"\nchange against {path}:")
+    for row in rows:
+        old = before.get(key(row))
+        if old is None:
+            continue
+        print(
+            f"{row['transport']:<15} c={row['concurrency']:<4} {row['payload_bytes']:>8}B  "
+            f"throughput {row['throughput_rps'] / old['throughput_rps'] - 1:+7.1%}  "
+            f"p95 {row['p95_ms'] / old['p95_ms'] - 1:+7.1%}  "
+            f"server cpu/request {row['server_cpu_ms_per_request'] / old['server_cpu_ms_per_request'] - 1:+7.1%}"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    rows = []
+    for transport in args.transports:
+        for concurrency in args.concurrency:
+            async with connect(transport, concurrency, args.workers) as (sessions, server):
+                for size in args.payload:
+                    payload = "x" * size
+                    await run_level(sessions, server, args.warmup, payload)
+                    row = {
+                        "transport": transport,
+                        "concurrency": concurrency,
+                        "payload_bytes": size,
+                        **await run_level(sessions, server, args.requests, payload),
+                    }
+                    print_row(row)
+                    rows.append(row)
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "mcp": version("mcp"),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": rows,
+    }
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nwrote {len(rows)} results to {args.out}")
+
+    if args.compare:
+        compare(rows, args.compare)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=TRANSPORTS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--payload", type=int, nargs="+", default=[16, 4096, 65536])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="stdio-pool size")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--out", default="transport_results.json")
+    parser.add_argument("--compare")
+    asyncio.run(main(parser.parse_args()))
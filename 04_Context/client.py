@@ -32,9 +32,12 @@ async def main():
         print("→ Calling process_items…")
         items = ["one", "two", "three", "four", "five"]
         result = await client.call_tool("process_items", {"items": items})
-        processed = [c.text for c in result]
+        processed = [c.text for c in result.content]
         print("→ Result:", processed)
 
+        stats = await client.call_tool("session_stats", {})
+        print("→ Session stats:", stats.data)
+
 
 if __name__ == "__main__":
     asyncio.run(main())
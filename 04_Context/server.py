@@ -1,12 +1,29 @@
 import asyncio
+import os
+
+import uvicorn
 
 from fastmcp import Context, FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from session_reaper import IdleSessionReaper, session_manager
+from session_store import SessionStore, SqliteSessionBackend
 
 mcp = FastMCP(
     name="ProgressDemoServer",
     stateless_http=False,
 )
 
+# SESSION_DB shares sessions between workers and keeps them across restarts
+SESSION_DB = os.getenv("SESSION_DB")
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+sessions = SessionStore(
+    idle_ttl=SESSION_IDLE_TTL,
+    max_sessions=int(os.getenv("SESSION_MAX_SESSIONS", "10000")),
+    backend=SqliteSessionBackend(SESSION_DB) if SESSION_DB else None,
+)
+
 
 @mcp.tool(
     name="process_items", description="Processes a list of items with progress updates"
@@ -19,8 +36,31 @@ async def process_items(items: list[str], ctx: Context) -> list[str]:
         await ctx.report_progress(progress=i, total=total)
         await asyncio.sleep(0.5)
         results.append(item.upper())
+
+    state = sessions.get(ctx.session_id)
+    sessions.put(
+        ctx.session_id,
+        {"runs": state.get("runs", 0) + 1, "items": state.get("items", 0) + total},
+    )
     return results
 
 
+@mcp.tool(name="session_stats", description="Runs and items processed in this session")
+async def session_stats(ctx: Context) -> dict:
+    return {"runs": 0, "items": 0, **sessions.get(ctx.session_id)}
+
+
+@mcp.custom_route("/metrics/sessions", methods=["GET"])
+async def session_metrics(request: Request) -> JSONResponse:
+    return JSONResponse({**sessions.metrics(), **reaper.metrics()})
+
+
+# sessions whose client went away without a DELETE are ended at the
+# transport after SESSION_IDLE_TTL, and their state dropped with them
+mcp_app = mcp.http_app(transport="streamable-http")
+reaper = IdleSessionReaper(
+    mcp_app, session_manager(mcp_app), idle_ttl=SESSION_IDLE_TTL, on_reap=sessions.delete
+)
+
 if __name__ == "__main__":
-    mcp.run(transport="streamable-http")
+    uvicorn.run(reaper, host="127.0.0.1", port=8000)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+from mcp.server.streamable_http import MCP_SESSION_ID_HEADER
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_SESSION_HEADER = MCP_SESSION_ID_HEADER.encode()
+
+
+def session_manager(app: Starlette) -> StreamableHTTPSessionManager:
+    """The SDK session manager behind the MCP route of `server.http_app()`."""
+    for route in app.routes:
+        if getattr(route, "path", None) == app.state.path:
+            endpoint = route.endpoint
+            # with auth, the endpoint wraps fastmcp's ASGI app
+            return getattr(endpoint, "session_manager", None) or endpoint.app.session_manager
+    raise LookupError(f"no MCP route at {app.state.path}")
+
+
+class IdleSessionReaper:
+    """
+    ASGI middleware for a stateful streamable-http app that ends sessions
+    idle for `idle_ttl` seconds: no request in flight (an open GET stream
+    counts as one) and none finished for that long.
+
+    The SDK's session manager keeps the transport, streams and server task
+    of every session until the client sends DELETE, and clients that just
+    go away never do. The reaper terminates those transports and removes
+    them from the manager, then calls `on_reap(session_id)`, e.g. to drop
+    the session's own state; so does a DELETE from the client.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        manager: StreamableHTTPSessionManager,
+        idle_ttl: float = 1800.0,
+        interval: float | None = None,
+        on_reap: Callable[[str], None] | None = None,
+    ):
+        self.app = app
+        self.manager = manager
+        self.idle_ttl = idle_ttl
+        self.interval = interval if interval is not None else min(idle_ttl / 4, 60.0)
+        self.on_reap = on_reap
+        self.reaped = 0
+        self._in_flight: dict[str, int] = {}
+        self._last_seen: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+        session_id = None
+        for name, value in scope["headers"]:
+            if name == _SESSION_HEADER:
+                session_id = value.decode()
+                break
+
+        if session_id is None:
+            # an opening request: the session id comes back in the response
+            async def send_and_track(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    for name, value in message.get("headers", ()):
+                        if name.lower() == _SESSION_HEADER:
+                            self._last_seen[value.decode()] = time.monotonic()
+                            break
+                await send(message)
+
+            await self.app(scope, receive, send_and_track)
+            return
+
+        self._in_flight[session_id] = self._in_flight.get(session_id, 0) + 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight[session_id] -= 1
+            if not self._in_flight[session_id]:
+                del self._in_flight[session_id]
+            if scope["method"] == "DELETE":  # the client ended it
+                self._last_seen.pop(session_id, None)
+                if self.on_reap is not None:
+                    self.on_reap(session_id)
+            else:
+                self._last_seen[session_id] = time.monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.reap()
+
+    async def reap(self) -> int:
+        """Ends the sessions idle for longer than `idle_ttl`; returns how many."""
+        cutoff = time.monotonic() - self.idle_ttl
+        # _server_instances is the manager's only registry of open sessions
+        # (up to mcp 1.30); it has no public way to end one from the server side
+        instances = self.manager._server_instances
+        reaped = 0
+        for session_id in list(self._last_seen):
+            if session_id in self._in_flight or self._last_seen[session_id] >= cutoff:
+                continue
+            del self._last_seen[session_id]
+            transport = instances.pop(session_id, None)
+            getattr(self.manager, "_session_owners", {}).pop(session_id, None)
+            if transport is not None:
+                await transport.terminate()
+                reaped += 1
+            if self.on_reap is not None:
+                self.on_reap(session_id)
+        self.reaped += reaped
+        return reaped
+
+    def metrics(self) -> dict:
+        return {
+            "transports": len(self.manager._server_instances),
+            "tracked": len(self._last_seen),
+            "reaped": self.reaped,
+        }
@@ -0,0 +1,196 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class _Entry:
+    data: bytes  # compact JSON of the session's state
+    last_used: float
+    saved: float  # when the backend copy was last written
+
+
+def _encode(state: dict) -> bytes:
+    return json.dumps(state, separators=(",", ":")).encode()
+
+
+class SqliteSessionBackend:
+    """
+    Session states in a local SQLite file, shared by every worker on the
+    host and kept across restarts. WAL mode lets workers read while another
+    one writes.
+    """
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions"
+            " (id TEXT PRIMARY KEY, data BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+
+    def load(self, session_id: str) -> tuple[bytes, float] | None:
+        return self.db.execute(
+            "SELECT data, last_used FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+
+    def saved(self, session_id: str) -> float | None:
+        """When the session was last written, by any worker; None if it is gone."""
+        row = self.db.execute(
+            "SELECT last_used FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def save(self, session_id: str, data: bytes, last_used: float) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+            (session_id, data, last_used),
+        )
+
+    def delete(self, session_id: str) -> None:
+        self.db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def purge(self, idle_since: float) -> int:
+        return self.db.execute(
+            "DELETE FROM sessions WHERE last_used < ?", (idle_since,)
+        ).rowcount
+
+    def close(self) -> None:
+        self.db.close()
+
+
+class SessionStore:
+    """
+    Per-session state of a stateful streamable-http server, keyed by the
+    `mcp-session-id`.
+
+    Clients that never close their session just stop using it, so a
+    session unused for `idle_ttl` seconds is dropped. Beyond `max_sessions`
+    entries or `max_bytes` of state, the least recently used ones go first.
+    A state is held as one compact JSON blob, decoded on `get`.
+
+    With a `backend`, every `put` is written through, so other workers and
+    a restarted worker find the session. The copy in memory is only used
+    while its `saved` stamp matches the backend's; if another worker wrote
+    or removed the session since, it is reloaded (or dropped). Idle
+    sessions are purged from the backend every `purge_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = 1800.0,
+        max_sessions: int = 10_000,
+        max_bytes: int = 64 * 2**20,
+        backend: SqliteSessionBackend | None = None,
+        purge_interval: float = 60.0,
+    ):
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.purge_interval = purge_interval
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.restored = 0
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+        self.purged = 0
+        self._purged_at = time.time()
+        self._sessions: OrderedDict[str, _Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _entry(self, session_id: str, now: float) -> _Entry | None:
+        entry = self._sessions.get(session_id)
+        if entry is not None and entry.last_used < now - self.idle_ttl:
+            self._drop(session_id)
+            self.evicted_idle += 1
+            entry = None
+        if self.backend is None:
+            return entry
+        if entry is not None:
+            if self.backend.saved(session_id) == entry.saved:
+                return entry
+            self._drop(session_id)  # another worker wrote or removed it
+            entry = None
+        row = self.backend.load(session_id)
+        if row is not None and row[1] >= now - self.idle_ttl:
+            entry = _Entry(data=row[0], last_used=now, saved=row[1])
+            self._sessions[session_id] = entry
+            self.bytes += len(entry.data)
+            self.restored += 1
+        return entry
+
+    def get(self, session_id: str) -> dict:
+        """The session's state; empty for an unknown or expired session."""
+        now = time.time()
+        entry = self._entry(session_id, now)
+        if entry is None:
+            self.misses += 1
+            return {}
+        self.hits += 1
+        entry.last_used = now
+        self._sessions.move_to_end(session_id)
+        if self.backend is not None and entry.saved < now - self.idle_ttl / 2:
+            # keep a session that is only read from being purged as idle
+            self.backend.save(session_id, entry.data, now)
+            entry.saved = now
+        return json.loads(entry.data)
+
+    def put(self, session_id: str, state: dict) -> None:
+        now = time.time()
+        data = _encode(state)
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self.bytes -= len(entry.data)
+        self._sessions[session_id] = _Entry(data=data, last_used=now, saved=now)
+        self.bytes += len(data)
+        if self.backend is not None:
+            self.backend.save(session_id, data, now)
+        self._evict(now)
+
+    def delete(self, session_id: str) -> None:
+        """Forgets a session the client has closed."""
+        self._drop(session_id)
+        if self.backend is not None:
+            self.backend.delete(session_id)
+
+    def _drop(self, session_id: str) -> None:
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self.bytes -= len(entry.data)
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.idle_ttl
+        sessions = self._sessions
+        while sessions:
+            session_id, oldest = next(iter(sessions.items()))
+            if oldest.last_used < cutoff:
+                self.evicted_idle += 1
+            elif len(sessions) > self.max_sessions or self.bytes > self.max_bytes:
+                self.evicted_capacity += 1
+            else:
+                break
+            del sessions[session_id]
+            self.bytes -= len(oldest.data)
+
+        if self.backend is not None and now - self._purged_at >= self.purge_interval:
+            self._purged_at = now
+            self.purged += self.backend.purge(cutoff)
+
+    def metrics(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "restored": self.restored,
+            "evicted_idle": self.evicted_idle,
+            "evicted_capacity": self.evicted_capacity,
+            "purged": self.purged,
+        }
@@ -1,10 +1,38 @@
 import asyncio
+import json
 import os
 
 from fastmcp import Client
 from fastmcp.client.transports import StreamableHttpTransport
 
 
+async def read_chunks(client: Client, path: str, **range_args):
+    """
+    Yields the text of a range of a file (see the read_file tool), one
+    chunk per call, however large the range.
+    """
+    result = await client.call_tool("read_file", {"path": path, **range_args})
+    yield result.content[0].text
+    served = result.structured_content
+    while served["next_offset"] is not None:
+        result = await client.call_tool(
+            "read_file",
+            {
+                "path": path,
+                "offset": served["next_offset"],
+                "length": served["stop"] - served["next_offset"],
+            },
+        )
+        yield result.content[0].text
+        served = result.structured_content
+
+
+async def print_matches(progress: float, total: float | None, message: str | None):
+    """Prints the matches search_content streams while it searches."""
+    for match in json.loads(message or "[]"):
+        print(f"  {match['path']}:{match['line']}: {match['text']}")
+
+
 async def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     demo_root = os.path.join(script_dir, "demo_root")
@@ -22,10 +50,28 @@ async def main():
     async with client:
         result = await client.call_tool("find_file", {"filename": "helper.py"})
         print("✅ Found paths:")
-        if not result:
+        if not result.data:
             print("  (no matches)")
-        for r in result:
-            print("  -", r.text)
+        for path in result.data:
+            print("  -", path)
+
+        print("\n📄 main.py, lines 1-5:")
+        result = await client.call_tool(
+            "read_file", {"path": "main.py", "line": 1, "lines": 5}
+        )
+        print(result.content[0].text)
+
+        print("📄 helper.py, whole file:")
+        async for chunk in read_chunks(client, "utils/helper.py"):
+            print(chunk, end="")
+
+        print("\n🔎 Lines matching 'def ':")
+        result = await client.call_tool(
+            "search_content",
+            {"pattern": "def ", "max_results": 20},
+            progress_handler=print_matches,
+        )
+        print(f"  {result.data['files_searched']} files searched")
 
 
 if __name__ == "__main__":
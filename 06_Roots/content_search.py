@@ -0,0 +1,269 @@
+import asyncio
+import mmap
+import os
+import re
+import threading
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from fastmcp.exceptions import ToolError
+
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "0")) or os.cpu_count() or 1
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "10000"))
+SEARCH_BATCH = 256  # files searched per worker task
+BINARY_PROBE = 8192  # a NUL byte in this many leading bytes marks a binary file
+MAX_LINE_CHARS = 400  # longer matching lines are cut
+MMAP_MIN_BYTES = 1 << 16  # smaller files are read whole, cheaper than mapping them
+
+
+class GitIgnore:
+    """The rules of one .gitignore file, matched against paths below its directory."""
+
+    def __init__(self, base: str, lines: list[str]):
+        self.base = base
+        self.rules: list[tuple[re.Pattern, bool, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip(" ")
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate or line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            if line:
+                pattern = re.compile(_translate(line.lstrip("/")))
+                self.rules.append((pattern, negate, dir_only, anchored))
+
+    @classmethod
+    def load(cls, directory: str) -> "GitIgnore | None":
+        try:
+            with open(os.path.join(directory, ".gitignore"), encoding="utf-8", errors="replace") as f:
+                return cls(directory, f.readlines())
+        except OSError:
+            return None
+
+    def match(self, path: str, is_dir: bool) -> bool | None:
+        """True if `path` is ignored, False if re-included, None if no rule applies."""
+        relative = path[len(self.base) :].lstrip(os.sep).replace(os.sep, "/")
+        name = relative.rsplit("/", 1)[-1]
+        for pattern, negate, dir_only, anchored in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if pattern.fullmatch(relative if anchored else name):
+                return not negate
+        return None
+
+
+def _translate(pattern: str) -> str:
+    """A gitignore glob as a regular expression over /-separated paths."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and (close := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : close]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = close + 1
+        else:
+            if pattern[i] == "\\" and i + 1 < len(pattern):
+                i += 1
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def _ignored(ignores: list[GitIgnore], path: str, is_dir: bool) -> bool:
+    for ignore in reversed(ignores):  # the closest .gitignore decides
+        decision = ignore.match(path, is_dir)
+        if decision is not None:
+            return decision
+    return False
+
+
+def walk(roots: tuple[str, ...]) -> Iterator[str]:
+    """
+    The regular files below `roots` that are not ignored by a .gitignore
+    on the way down. .git directories and symlinks are skipped, so the
+    walk neither leaves the roots nor loops.
+    """
+    for root in roots:
+        stack = [(root, [])]
+        while stack:
+            directory, ignores = stack.pop()
+            ignore = GitIgnore.load(directory)
+            if ignore is not None:
+                ignores = [*ignores, ignore]
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir():
+                        if entry.name != ".git" and not _ignored(ignores, entry.path, True):
+                            stack.append((entry.path, ignores))
+                    elif entry.is_file() and not _ignored(ignores, entry.path, False):
+                        yield entry.path
+                except OSError:
+                    continue
+
+
+def compile_pattern(pattern: str, regex: bool, ignore_case: bool) -> re.Pattern | bytes:
+    """The needle search_files looks for: raw bytes for a case-sensitive literal."""
+    if not pattern:
+        raise ToolError("pattern must not be empty")
+    if not regex and not ignore_case:
+        return pattern.encode()
+    try:
+        return re.compile(
+            pattern.encode() if regex else re.escape(pattern.encode()),
+            re.IGNORECASE | re.MULTILINE if ignore_case else re.MULTILINE,
+        )
+    except re.error as e:
+        raise ToolError(f"invalid regular expression: {e}") from e
+
+
+def search_files(paths: list[str], needle: re.Pattern | bytes, limit: int) -> tuple[list[dict], int]:
+    """
+    Runs in a worker process: the matching lines of `paths`, at most
+    `limit` of them, and the number of binary files skipped. Files from
+    MMAP_MIN_BYTES up are scanned through mmap, so only their pages are
+    touched and nothing is copied; a line is reported once, however many
+    matches it holds.
+    """
+    matches: list[dict] = []
+    binary = 0
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    continue
+                if size < MMAP_MIN_BYTES:
+                    binary += _search_buffer(path, f.read(), needle, limit, matches)
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        binary += _search_buffer(path, mm, needle, limit, matches)
+        except (OSError, ValueError):
+            continue
+        if len(matches) >= limit:
+            break
+    return matches, binary
+
+
+def _search_buffer(
+    path: str, data: bytes | mmap.mmap, needle: re.Pattern | bytes, limit: int, matches: list[dict]
+) -> bool:
+    """Adds the matching lines of one file to `matches`; True if it is binary."""
+    if data.find(b"\0", 0, BINARY_PROBE) != -1:
+        return True
+    pos, line, counted = 0, 1, 0
+    while len(matches) < limit:
+        if isinstance(needle, bytes):
+            found = data.find(needle, pos)
+        else:
+            match = needle.search(data, pos)
+            found = -1 if match is None else match.start()
+        if found == -1:
+            return False
+        start = data.rfind(b"\n", 0, found) + 1
+        end = data.find(b"\n", found)
+        end = len(data) if end == -1 else end
+        line += data[counted:start].count(b"\n")
+        counted = start
+        text = data[start : min(end, start + MAX_LINE_CHARS * 4)].decode("utf-8", errors="replace")
+        matches.append({"path": path, "line": line, "text": text[:MAX_LINE_CHARS].rstrip("\r")})
+        pos = end + 1
+    return False
+
+
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _executor(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return _pools[workers]
+
+
+async def search(
+    roots: tuple[str, ...],
+    needle: re.Pattern | bytes,
+    max_results: int,
+    on_matches: Callable[[list[dict], int], Awaitable[None]] | None = None,
+    workers: int = SEARCH_WORKERS,
+) -> dict:
+    """
+    Searches the files below `roots` in batches across a process pool,
+    with two batches per worker in flight while the walk goes on. Matches
+    are passed to `on_matches` (with the number of files searched so far)
+    as batches finish, in no particular order. Stops once `max_results`
+    lines matched; batches not yet started are then cancelled, as they are
+    when the caller is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _executor(workers)
+    files = walk(roots)
+    pending: dict[asyncio.Future, int] = {}
+    matches: list[dict] = []
+    searched = binary = 0
+    walked = truncated = False
+    try:
+        while True:
+            while not walked and len(pending) < 2 * workers:
+                batch = await asyncio.to_thread(lambda: list(islice(files, SEARCH_BATCH)))
+                if not batch:
+                    walked = True
+                    break
+                # one match over the cap tells that the results were cut
+                future = loop.run_in_executor(
+                    executor, search_files, batch, needle, max_results - len(matches) + 1
+                )
+                pending[future] = len(batch)
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                searched += pending.pop(future)
+                found, skipped = future.result()
+                binary += skipped
+                if len(found) > max_results - len(matches):
+                    found, truncated = found[: max_results - len(matches)], True
+                matches.extend(found)
+                if found and on_matches is not None:
+                    await on_matches(found, searched)
+            if len(matches) >= max_results and (pending or not walked):
+                truncated = True
+            if truncated:
+                break
+    finally:
+        for future in pending:
+            future.cancel()
+    return {
+        "matches": matches,
+        "files_searched": searched,
+        "binary_skipped": binary,
+        "truncated": truncated,
+    }
@@ -0,0 +1,190 @@
+import hashlib
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import accumulate, islice, repeat
+from operator import add
+
+from fastmcp.exceptions import ToolError
+from pydantic import BaseModel
+
+READ_MAX_BYTES = int(os.getenv("READ_MAX_BYTES", str(1 << 20)))
+LINE_STRIDE = 128  # a line index keeps the offset of every LINE_STRIDE-th line
+INDEX_BLOCK = 1 << 24  # bytes split into lines per step while indexing
+MAX_INDEXES = 64
+CHECK_BYTES = 4096  # bytes at each end of the indexed part compared on change
+
+
+class FileRange(BaseModel):
+    path: str
+    size: int
+    offset: int  # the bytes served: [offset, end)
+    end: int
+    stop: int  # end of the requested range
+    line: int | None = None  # first line served (1-based), for line reads
+    lines: int | None = None  # number of lines served
+    next_offset: int | None = None  # where to continue; None once the range is served
+    next_line: int | None = None
+
+
+class LineIndex:
+    """
+    Byte offsets of every LINE_STRIDE-th line of one version of a file,
+    indexed only as far as reads have needed so far. A line start then
+    costs one lookup and at most LINE_STRIDE - 1 newline searches, however
+    far into the file it is.
+    """
+
+    def __init__(self, st: os.stat_result):
+        self.file = (st.st_dev, st.st_ino)
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.checkpoints = array("Q")
+        self.lines = 0  # newline-terminated lines indexed
+        self.scanned = 0  # where line `lines` starts
+        self.digest = self._digest(b"")  # of the ends of [0, scanned)
+        self.lock = threading.Lock()
+
+    def _digest(self, mm: mmap.mmap | bytes) -> bytes:
+        head = mm[: min(self.scanned, CHECK_BYTES)]
+        tail = mm[max(0, self.scanned - CHECK_BYTES) : self.scanned]
+        return hashlib.blake2b(head + tail, digest_size=16).digest()
+
+    def update(self, mm: mmap.mmap, st: os.stat_result) -> bool:
+        """
+        Takes over a changed file if it only grew (an appended log): same
+        file, not shorter, and the first and last CHECK_BYTES of the
+        indexed part unchanged; False if it must be rebuilt.
+        """
+        with self.lock:
+            if (
+                (st.st_dev, st.st_ino) != self.file
+                or st.st_size < self.size
+                or self._digest(mm) != self.digest
+            ):
+                return False
+            self.size, self.mtime_ns = st.st_size, st.st_mtime_ns
+            return True
+
+    def _index(self, mm: mmap.mmap, line: int) -> None:
+        while len(self.checkpoints) <= line // LINE_STRIDE and self.scanned < self.size:
+            cut = mm.rfind(b"\n", self.scanned, self.scanned + INDEX_BLOCK) + 1
+            if cut == 0:
+                # one line longer than a block: find its end without splitting
+                cut = mm.find(b"\n", self.scanned) + 1
+                if cut == 0:
+                    return  # the last line has no newline (yet)
+                if self.lines % LINE_STRIDE == 0:
+                    self.checkpoints.append(self.scanned)
+                self.lines += 1
+                self.scanned = cut
+                continue
+            lengths = map(len, mm[self.scanned : cut - 1].split(b"\n"))
+            starts = list(accumulate(map(add, lengths, repeat(1)), initial=self.scanned))
+            count = len(starts) - 1
+            self.checkpoints.extend(
+                islice(starts, (-self.lines) % LINE_STRIDE, count, LINE_STRIDE)
+            )
+            self.lines += count
+            self.scanned = cut
+
+    def line_start(self, mm: mmap.mmap, line: int) -> int:
+        """Offset of 0-based `line`, or the file size if there is no such line."""
+        with self.lock:
+            scanned = self.scanned
+            self._index(mm, line)
+            if self.scanned != scanned:
+                self.digest = self._digest(mm)
+        k = line // LINE_STRIDE
+        if k < len(self.checkpoints):
+            current, pos = k * LINE_STRIDE, self.checkpoints[k]
+        else:  # past the indexed lines, only an unterminated last line is left
+            current, pos = self.lines, self.scanned
+        while current < line and pos < self.size:
+            newline = mm.find(b"\n", pos)
+            pos = self.size if newline == -1 else newline + 1
+            current += 1
+        return pos
+
+
+_indexes: OrderedDict[str, LineIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _line_index(path: str, mm: mmap.mmap, st: os.stat_result) -> LineIndex:
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is not None and (index.size, index.mtime_ns) != (st.st_size, st.st_mtime_ns):
+            if not index.update(mm, st):
+                index = None
+        if index is None:
+            index = _indexes[path] = LineIndex(st)
+            while len(_indexes) > MAX_INDEXES:
+                _indexes.popitem(last=False)
+        _indexes.move_to_end(path)
+        return index
+
+
+def _char_start(mm: mmap.mmap, start: int, end: int) -> int:
+    """Moves `end` back to the start of a UTF-8 character."""
+    for _ in range(3):
+        if end <= start or mm[end] & 0xC0 != 0x80:
+            break
+        end -= 1
+    return end
+
+
+def read_range(
+    path: str,
+    offset: int = 0,
+    length: int | None = None,
+    line: int | None = None,
+    lines: int | None = None,
+    max_bytes: int = READ_MAX_BYTES,
+) -> tuple[str, FileRange]:
+    """
+    The text of a byte range (`offset`, `length`) or of a line range (from
+    1-based `line`, `lines` lines) of the file at `path`, by default to its
+    end, and where it lies. Only the pages of the range are read, through
+    mmap. At most `max_bytes` are returned, cut after a line for line reads
+    and at a character otherwise. The rest of the range is then
+    [`next_offset`, `stop`), and `next_line` is the next line after whole
+    lines were served. Invalid UTF-8 is replaced.
+    """
+    if offset < 0 or (length is not None and length < 0):
+        raise ToolError("offset and length must not be negative")
+    if (line is not None and line < 1) or (lines is not None and lines < 0):
+        raise ToolError("line starts at 1 and lines must not be negative")
+
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        if size == 0:
+            return "", FileRange(path=path, size=0, offset=0, end=0, stop=0, line=line, lines=0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if line is not None:
+                index = _line_index(path, mm, st)
+                start = index.line_start(mm, line - 1)
+                stop = size if lines is None else index.line_start(mm, line - 1 + lines)
+            else:
+                start = min(offset, size)
+                stop = size if length is None else min(size, start + length)
+
+            end = min(stop, start + max_bytes)
+            if end < stop:
+                if line is not None:
+                    end = mm.rfind(b"\n", start, end) + 1 or end
+                end = _char_start(mm, start, end)
+            data = mm[start:end]
+
+    served = FileRange(path=path, size=size, offset=start, end=end, stop=stop)
+    if line is not None:
+        served.line = line
+        served.lines = data.count(b"\n") + (end == size and not data.endswith(b"\n") and bool(data))
+        if end < stop and served.lines:
+            served.next_line = line + served.lines
+    if end < stop:
+        served.next_offset = end
+    return data.decode("utf-8", errors="replace"), served
@@ -0,0 +1,76 @@
+import os
+import time
+import weakref
+from urllib.parse import unquote, urlparse
+
+from fastmcp import Context
+from fastmcp.exceptions import ToolError
+
+ROOTS_TTL = float(os.getenv("ROOTS_TTL", "30"))
+
+
+def uri_to_path(uri: str) -> str | None:
+    """The local path of a file:// URI, None for other schemes."""
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+
+    path = unquote(parsed.path)
+
+    if (
+        os.name == "nt"
+        and path.startswith("/")
+        and len(path) > 2
+        and path[2] == ":"
+    ):
+        path = path[1:]
+    return path
+
+
+class RootsCache:
+    """
+    The file:// roots of each client session, as resolved real paths, so
+    tools can check paths against them without asking the client for its
+    roots on every call. Entries expire after `ttl` seconds; `clear()` drops
+    them all when a client reports that its roots changed (the
+    notification does not say which session sent it).
+    """
+
+    def __init__(self, ttl: float = ROOTS_TTL):
+        self.ttl = ttl
+        self._sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    async def get(self, ctx: Context) -> tuple[str, ...]:
+        now = time.monotonic()
+        entry = self._sessions.get(ctx.session)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        paths = tuple(
+            os.path.realpath(path)
+            for root in await ctx.list_roots()
+            if (path := uri_to_path(str(root.uri))) is not None
+        )
+        self._sessions[ctx.session] = (now + self.ttl, paths)
+        return paths
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+
+def resolve(path: str, roots: tuple[str, ...]) -> str:
+    """
+    The real path of `path` if it lies within one of `roots`, following
+    symlinks, so a link cannot lead outside them. A relative path is taken
+    relative to each root in turn.
+    """
+    candidates = [path] if os.path.isabs(path) else [os.path.join(r, path) for r in roots]
+    inside = []
+    for candidate in candidates:
+        real = os.path.realpath(candidate)
+        if any(real == r or real.startswith(r.rstrip(os.sep) + os.sep) for r in roots):
+            if os.path.exists(real):
+                return real
+            inside.append(real)
+    if inside:
+        return inside[0]
+    raise ToolError(f"{path} is not within the client's roots")
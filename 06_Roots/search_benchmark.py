@@ -0,0 +1,125 @@
+"""
+Builds a synthetic tree of `--files` files (text in nested directories,
+a few binary files and a .gitignore'd build directory) and searches it
+with content_search.py, literally and with a regular expression, with
+one worker process and with `--workers`. Reports files searched per
+second, the time to the first streamed match and the number of matches;
+the last run goes through the search_content tool of server.py.
+
+    python search_benchmark.py --files 100000 --workers 4
+    python search_benchmark.py --dir /tmp/search-tree   # keep the tree between runs
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import mcp.types as mt
+from fastmcp import Client
+
+from content_search import SEARCH_WORKERS, compile_pattern, search
+from server import mcp
+
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda".split()
+NEEDLE = "needle_42"
+PER_DIRECTORY = 100
+
+
+def build_tree(root: str, files: int, seed: int = 0) -> None:
+    """`files` files of about 2 KB, 1 in 100 holding NEEDLE, 1 in 200 binary."""
+    rng = random.Random(seed)
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write("build/\n*.log\n")
+    os.makedirs(os.path.join(root, "build"), exist_ok=True)
+    for i in range(100):  # ignored, so never searched
+        with open(os.path.join(root, "build", f"out{i}.txt"), "w") as f:
+            f.write(f"{NEEDLE}\n")
+    for i in range(files):
+        directory = os.path.join(root, f"pkg{i // 10000}", f"mod{i // PER_DIRECTORY % 100}")
+        if i % PER_DIRECTORY == 0:
+            os.makedirs(directory, exist_ok=True)
+        if i % 200 == 199:
+            with open(os.path.join(directory, f"blob{i}.bin"), "wb") as f:
+                f.write(rng.randbytes(2048))
+            continue
+        lines = [" ".join(rng.choices(WORDS, k=8)) for _ in range(40)]
+        if i % 100 == 0:
+            lines[rng.randrange(40)] += f" {NEEDLE} = {i}"
+        with open(os.path.join(directory, f"file{i}.txt"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+async def run_search(label: str, root: str, needle, workers: int) -> None:
+    first = None
+
+    async def on_matches(matches: list[dict], searched: int) -> None:
+        nonlocal first
+        first = first or time.perf_counter()
+
+    t0 = time.perf_counter()
+    result = await search((root,), needle, 100_000, on_matches, workers=workers)
+    report(label, time.perf_counter() - t0, first and first - t0, result)
+
+
+async def run_tool(label: str, root: str, workers: int) -> None:
+    first = None
+
+    async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+        nonlocal first
+        first = first or time.perf_counter()
+
+    async def list_roots(context) -> list[mt.Root]:
+        return [mt.Root(uri=f"file://{root}")]
+
+    async with Client(mcp, roots=list_roots) as client:
+        t0 = time.perf_counter()
+        result = await client.call_tool(
+            "search_content",
+            {"pattern": NEEDLE, "max_results": 10_000},
+            progress_handler=on_progress,
+        )
+        report(label, time.perf_counter() - t0, first and first - t0, result.data)
+
+
+def report(label: str, elapsed: float, first: float | None, result: dict) -> None:
+    first_ms = f"{first * 1000:6.0f}ms" if first else "     -  "
+    print(
+        f"{label:<24} {elapsed:7.2f}s  {result['files_searched'] / elapsed:9.0f} files/s  "
+        f"first match {first_ms}  {len(result['matches']):6d} matches  "
+        f"{result['binary_skipped']:5d} binary"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    root = args.dir or tempfile.mkdtemp(prefix="search-tree-")
+    os.makedirs(root, exist_ok=True)
+    root = os.path.realpath(root)
+    try:
+        if not os.path.exists(os.path.join(root, ".gitignore")):
+            t0 = time.perf_counter()
+            build_tree(root, args.files)
+            print(f"built {args.files} files in {root} in {time.perf_counter() - t0:.1f}s\n")
+
+        literal = compile_pattern(NEEDLE, regex=False, ignore_case=False)
+        regex = compile_pattern(r"needle_\d+ = \d+", regex=True, ignore_case=False)
+        for workers in sorted({1, args.workers}):
+            # the first search also starts the pool and warms the page cache
+            await run_search(f"literal, {workers} worker(s)", root, literal, workers)
+            await run_search(f"literal, {workers} worker(s)", root, literal, workers)
+            await run_search(f"regex, {workers} worker(s)", root, regex, workers)
+        await run_tool(f"tool, {SEARCH_WORKERS} worker(s)", root, SEARCH_WORKERS)
+    finally:
+        if not args.dir:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=SEARCH_WORKERS)
+    parser.add_argument("--dir", help="build the tree here (once) and keep it")
+    asyncio.run(main(parser.parse_args()))
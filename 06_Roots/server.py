@@ -1,9 +1,33 @@
+import asyncio
+import json
 import os
-from urllib.parse import unquote, urlparse
 
+import mcp.types as mt
 from fastmcp import Context, FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import ToolResult
+
+from content_search import SEARCH_MAX_RESULTS, compile_pattern, search
+from file_reader import read_range
+from roots import ROOTS_TTL, RootsCache, resolve
 
 mcp = FastMCP(name="FileSearchServer")
+roots = RootsCache()
+
+
+async def _roots_changed(notification: mt.RootsListChangedNotification) -> None:
+    roots.clear()
+
+
+# Neither fastmcp (up to 2.11) nor the SDK (up to mcp 1.30) has a public
+# hook for notifications from the client, so the low-level server's handler
+# table is patched. Should it go away, cached roots only expire after
+# ROOTS_TTL seconds.
+_handlers = getattr(mcp._mcp_server, "notification_handlers", None)
+if isinstance(_handlers, dict):
+    _handlers[mt.RootsListChangedNotification] = _roots_changed
+else:
+    print(f"[FileSearchServer] roots list_changed not supported, roots kept for {ROOTS_TTL}s")
 
 
 @mcp.tool(
@@ -14,26 +38,9 @@ async def find_file(filename: str, ctx: Context) -> list[str]:
     Recursively searches all file:// roots for 'filename' and
     returns all found absolute paths.
     """
-    roots = await ctx.list_roots()
     matches: list[str] = []
 
-    for root in roots:
-        uri_str = str(root.uri)
-        parsed = urlparse(uri_str)
-
-        if parsed.scheme != "file":
-            continue
-
-        path = unquote(parsed.path)
-
-        if (
-            os.name == "nt"
-            and path.startswith("/")
-            and len(path) > 2
-            and path[2] == ":"
-        ):
-            path = path[1:]
-
+    for path in await roots.get(ctx):
         for dirpath, _, files in os.walk(path):
             if filename in files:
                 matches.append(os.path.join(dirpath, filename))
@@ -41,5 +48,64 @@ async def find_file(filename: str, ctx: Context) -> list[str]:
     return matches
 
 
+@mcp.tool(
+    name="read_file",
+    description=(
+        "Read part of a file within the root directories: bytes from `offset` "
+        "(`length` bytes) or lines from 1-based `line` (`lines` lines), by "
+        "default to the end of the file. Large ranges come in chunks; "
+        "continue from next_offset up to stop"
+    ),
+)
+async def read_file(
+    path: str,
+    ctx: Context,
+    offset: int = 0,
+    length: int | None = None,
+    line: int | None = None,
+    lines: int | None = None,
+) -> ToolResult:
+    """The text of the range, and where it lies as structured content."""
+    real = resolve(path, await roots.get(ctx))
+    if not os.path.isfile(real):
+        raise ToolError(f"{path} is not a file")
+    text, served = await asyncio.to_thread(read_range, real, offset, length, line, lines)
+    return ToolResult(
+        content=[mt.TextContent(type="text", text=text)],
+        structured_content=served.model_dump(),
+    )
+
+
+@mcp.tool(
+    name="search_content",
+    description=(
+        "Search the files within the root directories for lines containing "
+        "`pattern`, a literal string or, with `regex`, a regular expression. "
+        "Binary files and files ignored by .gitignore are skipped. Matches "
+        "are also streamed as JSON in progress messages as they are found"
+    ),
+)
+async def search_content(
+    pattern: str,
+    ctx: Context,
+    regex: bool = False,
+    ignore_case: bool = False,
+    max_results: int = 1000,
+) -> dict:
+    """
+    Searches in parallel across a process pool (see content_search.py) and
+    stops after `max_results` matching lines; cancelling the call stops
+    the search too.
+    """
+    needle = compile_pattern(pattern, regex, ignore_case)
+    if not 0 < max_results <= SEARCH_MAX_RESULTS:
+        raise ToolError(f"max_results must be between 1 and {SEARCH_MAX_RESULTS}")
+
+    async def stream(matches: list[dict], searched: int) -> None:
+        await ctx.report_progress(progress=searched, message=json.dumps(matches))
+
+    return await search(await roots.get(ctx), needle, max_results, stream)
+
+
 if __name__ == "__main__":
     mcp.run(transport="streamable-http")
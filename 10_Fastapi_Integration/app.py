@@ -1,6 +1,8 @@
 import uvicorn
-from fastapi import FastAPI
-from server import mcp
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from instrumentation import CONTENT_TYPE
+from server import mcp, metrics
 
 mcp_app = mcp.http_app(path="/mcp")
 
@@ -8,5 +10,26 @@ app = FastAPI(lifespan=mcp_app.router.lifespan_context)
 
 app.mount("/mcpserver", mcp_app)
 
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+
+@app.post("/metrics/profile/{tool}")
+def start_profile(tool: str, calls: int = 20, every: int = 1):
+    """Profile `calls` of the next calls of a tool, one in `every`."""
+    metrics.profile(tool, calls=calls, every=every)
+    return {"tool": tool, "calls": calls, "every": every}
+
+
+@app.get("/metrics/profile/{tool}")
+def get_profile(tool: str, limit: int = 30):
+    report = metrics.profile_report(tool, limit=limit)
+    if report is None:
+        raise HTTPException(status_code=404, detail="No profile captured for this tool")
+    return PlainTextResponse(report)
+
+
 if __name__ == "__main__":
     uvicorn.run(app=app, host="127.0.0.1", port=8000)
@@ -1,44 +1,120 @@
 import asyncio
+import json
+
+import mcp.types as mt
 from fastmcp import Client
+from fastmcp.client.messages import MessageHandler
 from fastmcp.client.transports import StreamableHttpTransport
+from mcp import McpError
+from pydantic import AnyUrl
 
 SERVER = "http://127.0.0.1:3000/mcp/"
+LIST_URI = "resource://list_products"
+SNAPSHOT_URI = "resource://products/snapshot"
+CHANGES_URI = "resource://products/changes/{since}"
 
 
 def section(title: str):
     print(f"\n{'=' * 10} {title} {'=' * 10}")
 
 
+class CatalogMirror(MessageHandler):
+    """
+    A local copy of the product catalogue, kept up to date from the deltas
+    in the server's update notifications for LIST_URI instead of reading
+    the whole list after every change.
+
+    Each notification carries the new version and the ids it added,
+    changed or removed. The mirror then reads only those products, from
+    the changes since its own version, and reads the snapshot again only
+    if its version is older than the server's change history.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.products: dict[int, dict] = {}
+        self.full_reads = 0
+        self.bytes_read = 0
+        self.changed = asyncio.Condition()
+        self._pending: asyncio.Queue[int] = asyncio.Queue()
+
+    async def on_resource_updated(self, message: mt.ResourceUpdatedNotification) -> None:
+        # runs in the session's receive loop, which must not wait on requests
+        meta = message.params.meta
+        if str(message.params.uri) == LIST_URI and meta is not None:
+            self._pending.put_nowait(meta.model_dump()["version"])
+
+    async def _read(self, client: Client, uri: str) -> dict:
+        text = (await client.read_resource(uri))[0].text
+        self.bytes_read += len(text)
+        return json.loads(text)
+
+    async def full_read(self, client: Client) -> None:
+        snapshot = await self._read(client, SNAPSHOT_URI)
+        self.products = {p["id"]: p for p in snapshot["products"]}
+        self.version = snapshot["version"]
+        self.full_reads += 1
+
+    async def catch_up(self, client: Client) -> None:
+        try:
+            delta = await self._read(client, CHANGES_URI.format(since=self.version))
+        except McpError:  # too old for the change history
+            await self.full_read(client)
+            return
+        for product in delta["added"] + delta["changed"]:
+            self.products[product["id"]] = product
+        for product_id in delta["removed"]:
+            self.products.pop(product_id, None)
+        self.version = delta["version"]
+
+    async def start(self, client: Client) -> None:
+        """Subscribes to LIST_URI, then reads the catalogue once."""
+        await client.session.subscribe_resource(AnyUrl(LIST_URI))
+        await self.full_read(client)
+
+    async def follow(self, client: Client) -> None:
+        """Applies the updates to LIST_URI until cancelled."""
+        while True:
+            version = await self._pending.get()
+            if version > self.version:  # several notifications can share one catch-up
+                await self.catch_up(client)
+            async with self.changed:
+                self.changed.notify_all()
+
+    async def wait_for(self, version: int) -> None:
+        async with self.changed:
+            await self.changed.wait_for(lambda: self.version >= version)
+
+
 async def main() -> None:
-    async with Client(StreamableHttpTransport(SERVER)) as session:
+    mirror = CatalogMirror()
+    async with Client(StreamableHttpTransport(SERVER), message_handler=mirror) as session:
         resources = await session.list_resources()
         section("Available Resources")
         for res in resources:
             print(f"Resource Name: {res.name}    URI: {res.uri}")
 
-        list_uri = str(resources[0].uri)
-
         tools = await session.list_tools()
         section("Available Tools")
         for tool in tools:
             print(f"Tool Name: {tool.name}")
 
-        all_products = await session.read_resource(list_uri)
-        section("All Products (Before)")
-        print(all_products[0].text)
+        await mirror.start(session)
+        follower = asyncio.create_task(mirror.follow(session))
+        section(f"All Products (Before, version {mirror.version})")
+        print(list(mirror.products.values()))
 
-        create_tool_name = tools[0].name
+        section("Calling Tool: create_product")
+        before = mirror.version
+        created = await session.call_tool("create_product", {"name": "Widget", "price": 19.99})
+        print("Created product:", created.data)
 
-        section(f"Calling Tool: {create_tool_name}")
-        created = await session.call_tool(
-            create_tool_name,
-            {"name": "Widget", "price": 19.99},
-        )
-        print("Created product:", created[0].text)
+        await mirror.wait_for(before + 1)
+        section(f"All Products (After, version {mirror.version})")
+        print(list(mirror.products.values()))
+        print(f"{mirror.full_reads} full read(s), {mirror.bytes_read} bytes read in all")
 
-        updated_products = await session.read_resource(list_uri)
-        section("All Products (After)")
-        print(updated_products[0].text)
+        follower.cancel()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,20 @@
+from itertools import count
+
 from fastapi import FastAPI, HTTPException
 from fastmcp import FastMCP
+from fastmcp.exceptions import ResourceError
+from fastmcp.server.openapi import MCPType, RouteMap
 from pydantic import BaseModel
 
+from subscriptions import ChangeLog, ResourceSubscriptions
+
 app = FastAPI(title="Product API")
 _products: dict[int, dict] = {}
+_ids = count(1)
+
+LIST_URI = "resource://list_products"
+# every write to _products is recorded here and pushed to LIST_URI subscribers
+changes = ChangeLog()
 
 
 class Product(BaseModel):
@@ -11,13 +22,17 @@ class Product(BaseModel):
     price: float
 
 
-@app.get("/products")
+async def _publish(added=(), changed=(), removed=()) -> None:
+    await subscriptions.notify(LIST_URI, changes.record(added, changed, removed))
+
+
+@app.get("/products", operation_id="list_products")
 def list_products():
     """List all products"""
     return list(_products.values())
 
 
-@app.get("/products/{product_id}")
+@app.get("/products/{product_id}", operation_id="get_product")
 def get_product(product_id: int):
     """Get a product by its ID"""
     if product_id not in _products:
@@ -25,15 +40,65 @@ def get_product(product_id: int):
     return _products[product_id]
 
 
-@app.post("/products")
-def create_product(p: Product):
+@app.post("/products", operation_id="create_product")
+async def create_product(p: Product):
     """Create a new product"""
-    new_id = len(_products) + 1
+    new_id = next(_ids)
     _products[new_id] = {"id": new_id, **p.model_dump()}
+    await _publish(added=[new_id])
     return _products[new_id]
 
 
-mcp = FastMCP.from_fastapi(app=app, name="ProductMCP")
+@app.put("/products/{product_id}", operation_id="update_product")
+async def update_product(product_id: int, p: Product):
+    """Replace a product"""
+    if product_id not in _products:
+        raise HTTPException(status_code=404, detail="Product not found")
+    _products[product_id] = {"id": product_id, **p.model_dump()}
+    await _publish(changed=[product_id])
+    return _products[product_id]
+
+
+@app.delete("/products/{product_id}", operation_id="delete_product")
+async def delete_product(product_id: int):
+    """Delete a product"""
+    if _products.pop(product_id, None) is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    await _publish(removed=[product_id])
+    return {"id": product_id}
+
+
+mcp = FastMCP.from_fastapi(
+    app=app,
+    name="ProductMCP",
+    route_maps=[
+        RouteMap(methods=["GET"], pattern=r".*\{.*\}.*", mcp_type=MCPType.RESOURCE_TEMPLATE),
+        RouteMap(methods=["GET"], mcp_type=MCPType.RESOURCE),
+    ],
+)
+subscriptions = ResourceSubscriptions(mcp)
+
+
+@mcp.resource("resource://products/snapshot")
+def products_snapshot() -> dict:
+    """All products and the catalogue version they make up"""
+    return {"version": changes.version, "products": list(_products.values())}
+
+
+@mcp.resource("resource://products/changes/{since}")
+def product_changes(since: int) -> dict:
+    """
+    The products added or changed since version `since` and the ids of
+    those removed, for a client that missed some update notifications.
+    Fails if `since` is older than the changes kept: read the snapshot.
+    """
+    delta = changes.since(since)
+    if delta is None:
+        raise ResourceError(f"version {since} is not in the change history, read the snapshot")
+    delta["added"] = [_products[i] for i in delta["added"] if i in _products]
+    delta["changed"] = [_products[i] for i in delta["changed"] if i in _products]
+    return delta
+
 
 if __name__ == "__main__":
     mcp.run(transport="streamable-http", host="127.0.0.1", port=3000)
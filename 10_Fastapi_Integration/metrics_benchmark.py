@@ -0,0 +1,102 @@
+"""
+Measures what MetricsMiddleware adds to a tool call:
+
+- end to end: `add` served in-memory, so no network time hides the
+  overhead. Rounds alternate between a plain and an instrumented server,
+  and the median rounds are compared, with and without sampled profiling.
+- absolute: the middleware's own time per call, around a `call_next` that
+  returns at once
+
+    python metrics_benchmark.py --calls 2000 --rounds 7
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import mcp.types as mt
+from fastmcp import Client, FastMCP
+from fastmcp.server.middleware import MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+
+from instrumentation import MetricsMiddleware
+
+
+def make_server(metrics: MetricsMiddleware | None) -> FastMCP:
+    server = FastMCP("AddServer")
+    if metrics is not None:
+        server.add_middleware(metrics)
+
+    @server.tool(description="Add two integers")
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    return server
+
+
+async def per_call(client: Client, calls: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(calls):
+        await client.call_tool("add", {"a": i, "b": 1})
+    return (time.perf_counter() - t0) / calls
+
+
+async def middleware_cost(calls: int) -> float:
+    metrics = MetricsMiddleware()
+    context = MiddlewareContext(
+        message=mt.CallToolRequestParams(name="add", arguments={"a": 1, "b": 2})
+    )
+    result = ToolResult(content=[mt.TextContent(type="text", text="3")])
+
+    async def call_next(context):
+        return result
+
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        await call_next(context)
+    bare = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        await metrics.on_call_tool(context, call_next)
+    return (time.perf_counter() - t0 - bare) / calls
+
+
+async def main(args: argparse.Namespace) -> None:
+    metrics = MetricsMiddleware()
+    plain, instrumented = Client(make_server(None)), Client(make_server(metrics))
+    async with plain, instrumented:
+        await per_call(plain, 200)  # warm up
+        await per_call(instrumented, 200)
+        times = {"plain": [], "instrumented": []}
+        for _ in range(args.rounds):
+            times["plain"].append(await per_call(plain, args.calls))
+            times["instrumented"].append(await per_call(instrumented, args.calls))
+
+        metrics.profile("add", calls=args.calls, every=args.profile_every)
+        profiled = await per_call(instrumented, args.calls)
+
+    base = statistics.median(times["plain"])
+    with_metrics = statistics.median(times["instrumented"])
+    print(f"plain         {base * 1e6:8.1f}us/call")
+    print(
+        f"instrumented  {with_metrics * 1e6:8.1f}us/call  "
+        f"overhead {with_metrics / base - 1:+.1%}"
+    )
+    print(
+        f"profiling 1/{args.profile_every} {profiled * 1e6:6.1f}us/call  "
+        f"overhead {profiled / base - 1:+.1%}"
+    )
+    print(f"middleware    {await middleware_cost(100_000) * 1e6:8.2f}us/call on its own")
+    print(
+        next(line for line in metrics.render().splitlines()
+             if line.startswith("mcp_request_duration_seconds_count"))
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--profile-every", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
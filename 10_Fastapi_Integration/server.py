@@ -1,6 +1,10 @@
 from fastmcp import FastMCP
 
+from instrumentation import MetricsMiddleware
+
 mcp = FastMCP("AddServer", stateless_http=True)
+metrics = MetricsMiddleware()
+mcp.add_middleware(metrics)
 
 
 @mcp.tool(description="Add two integers")
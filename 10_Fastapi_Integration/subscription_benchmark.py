@@ -0,0 +1,90 @@
+"""
+Compares two ways a client can keep up with the ProductMCP catalogue
+(mcp_app.py) as products are created, served in-memory, for catalogues of
+`--sizes` products:
+
+- re-read: read the whole list resource after every change
+- mirror: subscribe and apply the delta each update notification carries
+  (CatalogMirror in fromapp_client.py)
+
+For each, reports the bytes the client received per update and the time
+from the write until the client is up to date.
+
+    python subscription_benchmark.py --sizes 100 1000 10000 --updates 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastmcp import Client
+
+import mcp_app
+from fromapp_client import CatalogMirror, LIST_URI
+
+
+class CountingMirror(CatalogMirror):
+    def __init__(self):
+        super().__init__()
+        self.notified_bytes = 0
+
+    async def on_resource_updated(self, message) -> None:
+        self.notified_bytes += len(json.dumps(message.params.meta.model_dump()))
+        await super().on_resource_updated(message)
+
+
+def fill(size: int) -> None:
+    mcp_app._products.clear()
+    for _ in range(size):
+        product_id = next(mcp_app._ids)
+        mcp_app._products[product_id] = {"id": product_id, "name": f"Product {product_id}", "price": 9.99}
+
+
+async def reread(updates: int) -> tuple[float, float]:
+    received = 0
+    async with Client(mcp_app.mcp) as client:
+        t0 = time.perf_counter()
+        for i in range(updates):
+            await client.call_tool("create_product", {"name": f"New {i}", "price": 1.0})
+            received += len((await client.read_resource(LIST_URI))[0].text)
+        elapsed = time.perf_counter() - t0
+    return received / updates, elapsed / updates
+
+
+async def mirrored(updates: int) -> tuple[float, float]:
+    mirror = CountingMirror()
+    async with Client(mcp_app.mcp, message_handler=mirror) as client:
+        await mirror.start(client)
+        follower = asyncio.create_task(mirror.follow(client))
+        before = (mirror.bytes_read, mirror.notified_bytes)
+        t0 = time.perf_counter()
+        for i in range(updates):
+            version = mirror.version
+            await client.call_tool("create_product", {"name": f"New {i}", "price": 1.0})
+            await mirror.wait_for(version + 1)
+        elapsed = time.perf_counter() - t0
+        follower.cancel()
+    assert mirror.products == mcp_app._products
+    received = mirror.bytes_read + mirror.notified_bytes - sum(before)
+    return received / updates, elapsed / updates
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'products':>9}  {'re-read B/update':>17} {'ms':>7}  {'mirror B/update':>16} {'ms':>7}")
+    for size in args.sizes:
+        fill(size)
+        reread_bytes, reread_s = await reread(args.updates)
+        fill(size)
+        mirror_bytes, mirror_s = await mirrored(args.updates)
+        print(
+            f"{size:9d}  {reread_bytes:17.0f} {reread_s * 1000:7.2f}  "
+            f"{mirror_bytes:16.0f} {mirror_s * 1000:7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--updates", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+import logging
+import os
+import weakref
+from collections import deque
+from collections.abc import Iterable
+
+import anyio
+import mcp.types as mt
+from fastmcp import FastMCP
+from mcp.server.session import ServerSession
+
+logger = logging.getLogger(__name__)
+
+CHANGE_HISTORY = int(os.getenv("CHANGE_HISTORY", "1000"))  # versions a client can catch up on
+# a subscriber that takes longer to accept a notification is dropped
+NOTIFY_TIMEOUT = float(os.getenv("NOTIFY_TIMEOUT", "5"))
+
+
+class ChangeLog:
+    """
+    A version counter for a collection and the ids each of its last
+    `history` versions added, changed or removed, so a client that missed
+    some versions can fetch just what changed since the one it has.
+    """
+
+    def __init__(self, history: int = CHANGE_HISTORY):
+        self.version = 0
+        self._entries: deque[tuple[int, list, list, list]] = deque(maxlen=history)
+
+    def record(self, added: Iterable = (), changed: Iterable = (), removed: Iterable = ()) -> dict:
+        """Starts a new version; returns its delta."""
+        self.version += 1
+        entry = (self.version, list(added), list(changed), list(removed))
+        self._entries.append(entry)
+        return {"version": self.version, "added": entry[1], "changed": entry[2], "removed": entry[3]}
+
+    def since(self, version: int) -> dict | None:
+        """
+        The ids added, changed and removed after `version`, merged, or None
+        if `version` is older than the history kept (or newer than ours).
+        """
+        oldest = self._entries[0][0] - 1 if self._entries else self.version
+        if not oldest <= version <= self.version:
+            return None
+        added: dict = {}  # dicts keep the order ids were seen in
+        changed: dict = {}
+        removed: dict = {}
+        for entry_version, entry_added, entry_changed, entry_removed in self._entries:
+            if entry_version <= version:
+                continue
+            for key in entry_added:
+                added[key] = None
+                removed.pop(key, None)
+            for key in entry_changed:
+                if key not in added:
+                    changed[key] = None
+            for key in entry_removed:
+                added.pop(key, None)
+                changed.pop(key, None)
+                removed[key] = None
+        return {
+            "version": self.version,
+            "added": list(added),
+            "changed": list(changed),
+            "removed": list(removed),
+        }
+
+
+class ResourceSubscriptions:
+    """
+    Handles resources/subscribe and resources/unsubscribe for a server and
+    sends `notifications/resources/updated` to the sessions subscribed to
+    a URI. A notification can carry a delta in its `_meta`, so clients can
+    apply the change instead of reading the resource again.
+    """
+
+    def __init__(self, server: FastMCP):
+        self._server = server._mcp_server
+        self._sessions: dict[str, weakref.WeakSet[ServerSession]] = {}
+
+        self._server.subscribe_resource()(self._subscribe)
+        self._server.unsubscribe_resource()(self._unsubscribe)
+        # the SDK's get_capabilities hardcodes resources.subscribe=False even
+        # with a subscribe handler registered, so clients would never subscribe
+        get_capabilities = self._server.get_capabilities
+
+        def with_subscribe(*args, **kwargs) -> mt.ServerCapabilities:
+            capabilities = get_capabilities(*args, **kwargs)
+            if capabilities.resources is not None:
+                capabilities.resources.subscribe = True
+            return capabilities
+
+        self._server.get_capabilities = with_subscribe
+
+    async def _subscribe(self, uri) -> None:
+        session = self._server.request_context.session
+        self._sessions.setdefault(str(uri), weakref.WeakSet()).add(session)
+
+    async def _unsubscribe(self, uri) -> None:
+        sessions = self._sessions.get(str(uri))
+        if sessions is not None:
+            sessions.discard(self._server.request_context.session)
+
+    def subscribers(self, uri: str) -> int:
+        return len(self._sessions.get(uri, ()))
+
+    async def notify(self, uri: str, delta: dict | None = None) -> None:
+        """
+        Tells the sessions subscribed to `uri` that it changed, and how. All
+        of them at once, so this takes as long as the slowest subscriber,
+        at most NOTIFY_TIMEOUT seconds.
+        """
+        sessions = self._sessions.get(uri)
+        if not sessions:
+            return
+        notification = mt.ServerNotification(
+            mt.ResourceUpdatedNotification(
+                method="notifications/resources/updated",
+                params=mt.ResourceUpdatedNotificationParams(uri=uri, _meta=delta),
+            )
+        )
+
+        async def send(session: ServerSession) -> None:
+            try:
+                with anyio.fail_after(NOTIFY_TIMEOUT):
+                    await session.send_notification(notification)
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError, TimeoutError):
+                sessions.discard(session)
+            except Exception:
+                logger.exception("Failed to notify a subscriber of %s", uri)
+
+        async with anyio.create_task_group() as tg:
+            for session in list(sessions):
+                tg.start_soon(send, session)
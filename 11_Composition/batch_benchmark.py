@@ -0,0 +1,107 @@
+"""
+Starts server.py and makes `--calls` add_add calls over streamable HTTP,
+one after another, pipelined and batched (see batching.py), reporting the
+time taken and the number of HTTP requests the client sent for each.
+
+    python batch_benchmark.py --calls 2000 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+import httpx
+from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
+
+from batching import call_tools
+
+URL = "http://127.0.0.1:8000/mcp"  # no trailing slash, which costs a redirect
+
+
+class CountingTransport:
+    def __init__(self):
+        self.requests = 0
+
+    async def _count(self, request: httpx.Request) -> None:
+        if request.method == "POST":
+            self.requests += 1
+
+    def client(self, headers=None, timeout=None, auth=None) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            auth=auth,
+            follow_redirects=True,
+            event_hooks={"request": [self._count]},
+        )
+
+    def transport(self) -> StreamableHttpTransport:
+        return StreamableHttpTransport(URL, httpx_client_factory=self.client)
+
+
+async def sequential(client: Client, calls: list) -> list:
+    return [await client.call_tool(name, arguments) for name, arguments in calls]
+
+
+async def run(label: str, call, calls: list) -> None:
+    counter = CountingTransport()
+    async with Client(counter.transport()) as client:
+        await client.list_tools()
+        before = counter.requests
+        t0 = time.perf_counter()
+        results = await call(client, calls)
+        elapsed = time.perf_counter() - t0
+    assert [r.data for r in results] == [a["a"] + a["b"] for _, a in calls]
+    print(
+        f"{label:<10} {elapsed:7.2f}s  {len(calls) / elapsed:8.0f} calls/s  "
+        f"{counter.requests - before:6d} HTTP requests"
+    )
+
+
+async def wait_for_server(timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with Client(URL) as client:
+                await client.ping()
+                return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def main(args: argparse.Namespace) -> None:
+    calls = [("add_add", {"a": i, "b": 1}) for i in range(args.calls)]
+    server = subprocess.Popen(
+        [sys.executable, "server.py"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_server()
+        await run("sequential", sequential, calls)
+        await run(
+            "pipelined",
+            lambda c, calls: call_tools(c, calls, mode="pipeline", concurrency=args.concurrency),
+            calls,
+        )
+        await run(
+            "batched",
+            lambda c, calls: call_tools(c, calls, batch_size=args.batch_size),
+            calls,
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
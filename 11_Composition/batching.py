@@ -0,0 +1,138 @@
+import asyncio
+import weakref
+from typing import Any, Literal
+
+import mcp.types as mt
+from fastmcp import Client, FastMCP
+from fastmcp.client.client import CallToolResult
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import Tool, ToolResult
+from pydantic import BaseModel, TypeAdapter
+
+BATCH_TOOL = "call_tools"
+
+_content = TypeAdapter(list[mt.ContentBlock])
+
+
+class ToolCall(BaseModel):
+    name: str
+    arguments: dict[str, Any] = {}
+
+
+def add_batch_tool(server: FastMCP, max_calls: int = 1000, concurrency: int = 32) -> None:
+    """
+    Registers the `call_tools` tool on `server`. It takes up to `max_calls`
+    calls of the server's other tools (mounted ones included), runs them
+    with at most `concurrency` in flight and returns one result per call,
+    in request order. A failing call is an error entry and does not fail
+    the batch.
+
+    The calls run the tools directly (`Tool.run`), so the server's
+    middleware sees the `call_tools` call, not each call in it. Calling
+    through an in-memory Client would add the SDK's per-call JSON schema
+    checks on both ends, which made a batch about eight times slower.
+    """
+
+    def error(text: str) -> dict:
+        return {"is_error": True, "content": [{"type": "text", "text": text}]}
+
+    async def run(call: ToolCall, tools: dict[str, Tool], gate: asyncio.Semaphore) -> dict:
+        tool = tools.get(call.name)
+        if tool is None or not tool.enabled:
+            return error(f"Unknown tool: {call.name}")
+        async with gate:
+            try:
+                result = await tool.run(call.arguments)
+            except Exception as e:  # ToolError, ValidationError, ...
+                return error(str(e))
+        entry = {
+            "is_error": False,
+            "content": [c.model_dump(mode="json", exclude_none=True) for c in result.content],
+        }
+        if result.structured_content is not None:
+            entry["structured_content"] = result.structured_content
+        return entry
+
+    @server.tool(
+        name=BATCH_TOOL,
+        description=(
+            "Run several tool calls concurrently in one request; "
+            "returns their results in the same order"
+        ),
+    )
+    async def call_tools(calls: list[ToolCall]) -> ToolResult:
+        if len(calls) > max_calls:
+            raise ToolError(f"At most {max_calls} calls per batch")
+        if any(call.name == BATCH_TOOL for call in calls):
+            raise ToolError(f"{BATCH_TOOL} cannot be batched")
+        tools = await server.get_tools()
+        gate = asyncio.Semaphore(concurrency)
+        results = await asyncio.gather(*(run(call, tools, gate) for call in calls))
+        return ToolResult(
+            content=[mt.TextContent(type="text", text=f"{len(results)} results")],
+            structured_content={"results": results},
+        )
+
+
+# per client: output schemas of the server's tools, or None without batch support
+_servers: "weakref.WeakKeyDictionary[Client, dict[str, dict] | None]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _batch_result(entry: dict, output_schema: dict | None) -> CallToolResult:
+    structured = entry.get("structured_content")
+    data = structured
+    if structured is not None and (output_schema or {}).get("x-fastmcp-wrap-result"):
+        data = structured.get("result")
+    return CallToolResult(
+        content=_content.validate_python(entry["content"]),
+        structured_content=structured,
+        data=data,
+        is_error=entry["is_error"],
+    )
+
+
+async def call_tools(
+    client: Client,
+    calls: list[tuple[str, dict[str, Any]]],
+    mode: Literal["auto", "batch", "pipeline"] = "auto",
+    batch_size: int = 1000,
+    concurrency: int = 16,
+) -> list[CallToolResult]:
+    """
+    Calls many tools, returning their results in order without raising for
+    failed calls (check `is_error`).
+
+    If the server offers `call_tools` (see `add_batch_tool`), every
+    `batch_size` calls travel as one request. Otherwise they are pipelined:
+    sent concurrently on the session, `concurrency` at a time, instead of
+    waiting for each response before sending the next call.
+    """
+    if client not in _servers:
+        tools = {t.name: t.outputSchema for t in await client.list_tools()}
+        _servers[client] = tools if BATCH_TOOL in tools else None
+    schemas = _servers[client]
+    gate = asyncio.Semaphore(concurrency)
+
+    if mode == "batch" or (mode == "auto" and schemas is not None):
+
+        async def batch(chunk: list[tuple[str, dict]]) -> list[CallToolResult]:
+            async with gate:
+                result = await client.call_tool(
+                    BATCH_TOOL,
+                    {"calls": [{"name": n, "arguments": a} for n, a in chunk]},
+                )
+            return [
+                _batch_result(entry, (schemas or {}).get(name))
+                for (name, _), entry in zip(chunk, result.structured_content["results"])
+            ]
+
+        chunks = [calls[i : i + batch_size] for i in range(0, len(calls), batch_size)]
+        return [r for rs in await asyncio.gather(*map(batch, chunks)) for r in rs]
+
+    async def one(name: str, arguments: dict) -> CallToolResult:
+        async with gate:
+            return await client.call_tool(name, arguments, raise_on_error=False)
+
+    return await asyncio.gather(*(one(name, arguments) for name, arguments in calls))
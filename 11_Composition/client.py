@@ -3,6 +3,8 @@ import asyncio
 from fastmcp import Client
 from fastmcp.client.transports import StreamableHttpTransport
 
+from batching import call_tools
+
 
 async def main():
     transport = StreamableHttpTransport(url="http://127.0.0.1:8000/mcp/")
@@ -16,10 +18,15 @@ async def main():
         print()
 
         result_add = await client.call_tool("add_add", {"a": 5, "b": 7})
-        print("5 + 7 =", result_add[0].text)
+        print("5 + 7 =", result_add.content[0].text)
 
         result_subtract = await client.call_tool("subtract_subtract", {"a": 10, "b": 3})
-        print("10 - 3 =", result_subtract[0].text)
+        print("10 - 3 =", result_subtract.content[0].text)
+
+        # many calls in one round trip
+        calls = [("add_add", {"a": i, "b": i}) for i in range(1000)]
+        results = await call_tools(client, calls)
+        print("sum of 1000 batched adds =", sum(r.data for r in results))
 
 
 if __name__ == "__main__":
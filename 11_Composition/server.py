@@ -1,11 +1,18 @@
+import logging
+
 from fastmcp import FastMCP
 
+from batching import add_batch_tool
+from instrumentation import serve_metrics
+
+logger = logging.getLogger(__name__)
+
 add_server = FastMCP(name="AddServer")
 
 
 @add_server.tool(description="Add two integers")
 def add(a: int, b: int) -> int:
-    print(f"Executing add tool with a={a}, b={b}")
+    logger.debug("Executing add tool with a=%s, b=%s", a, b)
     return a + b
 
 
@@ -14,7 +21,7 @@ subtract_server = FastMCP(name="SubtractServer")
 
 @subtract_server.tool(description="Subtract two integers")
 def subtract(a: int, b: int) -> int:
-    print(f"Executing subtract tool with a={a}, b={b}")
+    logger.debug("Executing subtract tool with a=%s, b=%s", a, b)
     return a - b
 
 
@@ -22,6 +29,9 @@ main_app = FastMCP(name="MainApp")
 
 main_app.mount("add", add_server)
 main_app.mount("subtract", subtract_server)
+add_batch_tool(main_app)
+# Prometheus metrics of every tool, mounted ones included, at /metrics
+metrics = serve_metrics(main_app)
 
 if __name__ == "__main__":
     main_app.run(transport="streamable-http")
@@ -1,12 +1,27 @@
+import logging
+import sys
+
 from fastmcp import FastMCP
 
+from instrumentation import serve_metrics
+
+logger = logging.getLogger(__name__)
+
 legacy_backend_mcp = FastMCP(name="LegacySSEBackendAdd")
 
-@legacy_backend_mcp.tool(description="Add two integers")
+@legacy_backend_mcp.tool(
+    description="Add two integers",
+    annotations={"readOnlyHint": True, "idempotentHint": True},
+)
 def add(a: int, b: int) -> int:
-    print(f"[LegacySSEBackendAdd] add a={a} b={b}")
+    logger.debug("[LegacySSEBackendAdd] add a=%s b=%s", a, b)
     return a + b
 
+# Prometheus metrics at /metrics, next to the SSE endpoint
+metrics = serve_metrics(legacy_backend_mcp)
+
+PORT = int(sys.argv[1]) if len(sys.argv) > 1 else 9001
+
 if __name__ == "__main__":
-    print("Starting LegacySSEBackendAdd (SSE) on port 9001")
-    legacy_backend_mcp.run(transport="sse", host="127.0.0.1", port=9001)
+    print(f"Starting LegacySSEBackendAdd (SSE) on port {PORT}")
+    legacy_backend_mcp.run(transport="sse", host="127.0.0.1", port=PORT)
@@ -1,12 +1,27 @@
+import logging
+import sys
+
 from fastmcp import FastMCP
 
+from instrumentation import serve_metrics
+
+logger = logging.getLogger(__name__)
+
 legacy_backend_subtract = FastMCP(name="LegacySSEBackendSubtract")
 
-@legacy_backend_subtract.tool(description="Subtract two integers")
+@legacy_backend_subtract.tool(
+    description="Subtract two integers",
+    annotations={"readOnlyHint": True, "idempotentHint": True},
+)
 def subtract(a: int, b: int) -> int:
-    print(f"[LegacySSEBackendSubtract] subtract a={a} b={b}")
+    logger.debug("[LegacySSEBackendSubtract] subtract a=%s b=%s", a, b)
     return a - b
 
+# Prometheus metrics at /metrics, next to the SSE endpoint
+metrics = serve_metrics(legacy_backend_subtract)
+
+PORT = int(sys.argv[1]) if len(sys.argv) > 1 else 9002
+
 if __name__ == "__main__":
-    print("Starting LegacySSEBackendSubtract (SSE) on port 9002")
-    legacy_backend_subtract.run(transport="sse", host="127.0.0.1", port=9002)
+    print(f"Starting LegacySSEBackendSubtract (SSE) on port {PORT}")
+    legacy_backend_subtract.run(transport="sse", host="127.0.0.1", port=PORT)
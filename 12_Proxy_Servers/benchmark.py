@@ -0,0 +1,134 @@
+"""
+Drives client.py-style traffic through one or more proxy scripts and prints
+latency percentiles for each, e.g.
+
+    python benchmark.py configurable_proxy.py pooled_proxy.py --concurrency 50
+
+The legacy SSE backends and each proxy are started as subprocesses; every
+proxy must listen on port 8000 like the other scripts in this folder. With
+--replicas N, backend_server_1.py is started on ports 9001, 9011, 9021, ...
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROXY_URL = "http://127.0.0.1:8000/mcp/"
+CALLS = [("add_add", {"a": 7, "b": 5}), ("subtract_subtract", {"a": 7, "b": 5})]
+
+
+def start(script: str, *args: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, script, *args],
+        cwd=HERE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"nothing listening on port {port}")
+
+
+def stop(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """Nearest-rank percentile; NaN without samples (e.g. every call failed)."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] if ordered else float("nan")
+
+
+async def run_load(url: str, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(n: int) -> None:
+        nonlocal errors
+        async with Client(transport=StreamableHttpTransport(url=url)) as client:
+            for i in range(n):
+                name, args = CALLS[i % len(CALLS)]
+                t0 = time.perf_counter()
+                try:
+                    await client.call_tool(name, args)
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+    per_worker = max(1, requests // concurrency)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def report(label: str, r: dict) -> None:
+    print(
+        f"{label:<28} calls={r['calls']:<6} errors={r['errors']:<4} "
+        f"rps={r['rps']:8.1f}  p50={r['p50']:7.2f}ms  "
+        f"p95={r['p95']:7.2f}ms  p99={r['p99']:7.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("proxies", nargs="+", help="proxy scripts to compare")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--replicas", type=int, default=1)
+    args = parser.parse_args()
+
+    ports = {9001 + 10 * i: "backend_server_1.py" for i in range(args.replicas)}
+    ports[9002] = "backend_server_2.py"
+    backends = [start(script, str(port)) for port, script in ports.items()]
+    try:
+        for port in ports:
+            wait_for_port(port)
+        for script in args.proxies:
+            proxy = start(script)
+            try:
+                wait_for_port(8000)
+                # warm up: the first call pays for tool discovery
+                asyncio.run(run_load(PROXY_URL, 4, 2))
+                result = asyncio.run(
+                    run_load(PROXY_URL, args.requests, args.concurrency)
+                )
+                report(script, result)
+            finally:
+                stop(proxy)
+    finally:
+        for proc in backends:
+            stop(proc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+import mcp.types as mt
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+
+class _Abandoned(Exception):
+    """The request other callers were waiting on was cancelled."""
+
+
+class ProxyCacheMiddleware(Middleware):
+    """
+    Takes repeated and concurrent identical requests off the backends.
+
+    - upstream listings (tools, resources, templates, prompts) are cached by
+      the pooled clients until the backend sends a `list_changed`
+      notification; pass `on_upstream_message` as their message handler
+    - results of tools annotated with both `readOnlyHint` and
+      `idempotentHint` are cached for `tool_ttl` seconds (the annotations
+      are read once per tool listing), resource reads
+      for `resource_ttl` seconds (or until a `resources/updated`
+      notification for that URI)
+    - identical requests that arrive while one is already in flight wait
+      for that one instead of going upstream themselves; if that one is
+      cancelled, they retry
+
+    At most `max_entries` values are kept; expired ones and then the least
+    recently used go first.
+    """
+
+    def __init__(
+        self,
+        tool_ttl: float = 30.0,
+        resource_ttl: float = 30.0,
+        max_entries: int = 10_000,
+    ):
+        self.tool_ttl = tool_ttl
+        self.resource_ttl = resource_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._values: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        self._cacheable: dict[str, bool] = {}
+        self._generation = 0
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any:
+        entry = self._values.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._values.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._values[key]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except _Abandoned:
+                return await self.get_or_fetch(key, fetch, ttl)
+
+        self.misses += 1
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            # only the caller that went upstream was cancelled, not the waiters
+            future.set_exception(_Abandoned())
+            future.exception()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't warn if there are none
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+        # a notification may have invalidated the cache while we were fetching
+        if generation == self._generation:
+            expires = time.monotonic() + ttl if ttl is not None else float("inf")
+            self._values[key] = (expires, value)
+            self._evict()
+        future.set_result(value)
+        return value
+
+    def _evict(self) -> None:
+        if len(self._values) <= self.max_entries:
+            return
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._values.items() if expires <= now]:
+            del self._values[key]
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+    def invalidate(self, kind: str, arg: str | None = None) -> None:
+        self._generation += 1
+        if kind == "list_tools":
+            self._cacheable.clear()
+        stale = [
+            k for k in self._values if k[0] == kind and (arg is None or k[1] == arg)
+        ]
+        for key in stale:
+            del self._values[key]
+
+    async def cached_listing(self, kind: str, backend: str, fetch):
+        return await self.get_or_fetch((kind, backend), fetch)
+
+    async def on_upstream_message(self, message) -> None:
+        if not isinstance(message, mt.ServerNotification):
+            return
+
+        root = message.root
+        if isinstance(root, mt.ToolListChangedNotification):
+            self.invalidate("list_tools")
+        elif isinstance(root, mt.PromptListChangedNotification):
+            self.invalidate("list_prompts")
+        elif isinstance(root, mt.ResourceListChangedNotification):
+            self.invalidate("list_resources")
+            self.invalidate("list_resource_templates")
+        elif isinstance(root, mt.ResourceUpdatedNotification):
+            self.invalidate("read", str(root.params.uri))
+
+    @staticmethod
+    def _is_cacheable(tool) -> bool:
+        annotations = tool.annotations
+        # idempotent alone still allows writes, which must reach the backend
+        return bool(
+            annotations and annotations.readOnlyHint and annotations.idempotentHint
+        )
+
+    async def on_list_tools(self, context: MiddlewareContext, call_next):
+        tools = await call_next(context)
+        self._cacheable = {tool.key: self._is_cacheable(tool) for tool in tools}
+        return tools
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        name = context.message.name
+        cacheable = self._cacheable.get(name)
+        if cacheable is None:
+            # called before any listing of this generation
+            tool = await context.fastmcp_context.fastmcp.get_tool(name)
+            cacheable = self._cacheable[name] = self._is_cacheable(tool)
+        if not cacheable:
+            return await call_next(context)
+
+        args = json.dumps(context.message.arguments or {}, sort_keys=True)
+        return await self.get_or_fetch(
+            ("call", name, args), lambda: call_next(context), self.tool_ttl
+        )
+
+    async def on_read_resource(self, context: MiddlewareContext, call_next):
+        uri = str(context.message.uri)
+        return await self.get_or_fetch(
+            ("read", uri), lambda: call_next(context), self.resource_ttl
+        )
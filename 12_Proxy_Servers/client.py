@@ -1,23 +1,37 @@
 import asyncio
+import os
+
 from fastmcp import Client
 from fastmcp.client.transports import StreamableHttpTransport
 
+from traffic import RecordingTransport, TrafficRecorder
+
 PROXY_URL = "http://127.0.0.1:8000/mcp/"
+# record this client's traffic for replay.py, e.g. TRAFFIC_FILE=traffic.jsonl
+TRAFFIC_FILE = os.getenv("TRAFFIC_FILE")
 
 async def main():
     print(f"Connecting to proxy at {PROXY_URL}")
-    client = Client(transport=StreamableHttpTransport(url=PROXY_URL))
+    transport = StreamableHttpTransport(url=PROXY_URL)
+    recorder = TrafficRecorder(TRAFFIC_FILE) if TRAFFIC_FILE else None
+    if recorder:
+        transport = RecordingTransport(transport, recorder)
+    client = Client(transport=transport)
 
     async with client:
         print("Calling add")
         res_add = await client.call_tool("add_add", {"a": 7, "b": 5})
-        if res_add:
-            print(f"add response: {res_add[0].text}")
+        if res_add.content:
+            print(f"add response: {res_add.content[0].text}")
 
         print("Calling subtract")
         res_sub = await client.call_tool("subtract_subtract", {"a": 7, "b": 5})
-        if res_sub:
-            print(f"subtract response: {res_sub[0].text}")
+        if res_sub.content:
+            print(f"subtract response: {res_sub.content[0].text}")
+
+    if recorder:
+        recorder.close()
+        print(f"recorded {recorder.requests} requests to {TRAFFIC_FILE}")
 
 if __name__ == "__main__":
     asyncio.run(main())
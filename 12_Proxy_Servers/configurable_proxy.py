@@ -1,19 +1,10 @@
-from fastmcp import FastMCP
+from caching import ProxyCacheMiddleware
+from load_balancer import proxy_from_config
+from proxy_config import config
 
-config = {
-    "mcpServers": {
-        "add": {
-            "url": "http://127.0.0.1:9001/sse",
-            "transport": "sse"
-        },
-        "subtract": {
-            "url": "http://127.0.0.1:9002/sse",
-            "transport": "sse"
-        }
-    }
-}
-
-proxy = FastMCP.as_proxy(config, name="ModernProxyToLegacy")
+proxy = proxy_from_config(
+    config, name="ModernProxyToLegacy", cache=ProxyCacheMiddleware(tool_ttl=30)
+)
 
 if __name__ == "__main__":
     print("starting proxy on port 8000")
@@ -0,0 +1,168 @@
+"""
+Request metrics for this chapter's servers, a trimmed copy of
+10_Fastapi_Integration/instrumentation.py (without its profiler) so the
+chapter runs on its own.
+"""
+
+import json
+import time
+from bisect import bisect_left
+
+from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from mcp.server.lowlevel.server import request_ctx
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+HISTOGRAMS = (
+    # metric, _Series attribute, help
+    ("mcp_request_duration_seconds", "duration", "Request latency."),
+    ("mcp_request_size_bytes", "request_bytes", "Size of the JSON arguments or URI."),
+    ("mcp_response_size_bytes", "response_bytes", "Size of the returned content."),
+)
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: str) -> list[str]:
+        lines, total = [], 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {total}")
+        return lines
+
+
+class _Series:
+    __slots__ = ("duration", "request_bytes", "response_bytes", "errors")
+
+    def __init__(self):
+        self.duration = Histogram(LATENCY_BUCKETS)
+        self.request_bytes = Histogram(SIZE_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.errors = 0
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _transport() -> str:
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        request = None
+    if request is None:
+        return "stdio"  # or in-memory
+    return "sse" if "/messages" in request.url.path else "streamable-http"
+
+
+def _content_size(contents) -> int:
+    size = 0
+    for c in contents:
+        data = getattr(c, "text", None) or getattr(c, "data", None) or getattr(c, "content", "")
+        size += len(data.encode()) if isinstance(data, str) else len(data)
+    return size
+
+
+class MetricsMiddleware(Middleware):
+    """
+    Per-tool and per-resource request metrics, rendered in the Prometheus
+    text format by `render()`: latency and request/response size
+    histograms by kind, name and transport, errors and calls in flight.
+    """
+
+    def __init__(self):
+        self._series: dict[tuple[str, str, str], _Series] = {}
+        self._in_flight: dict[tuple[str, str], int] = {}
+
+    async def _observe(self, kind, name, request_size, call_next, context, contents):
+        key = (kind, name, _transport())
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        flight = (kind, name)
+        self._in_flight[flight] = self._in_flight.get(flight, 0) + 1
+        series.request_bytes.observe(request_size)
+
+        t0 = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception:
+            series.errors += 1
+            raise
+        finally:
+            series.duration.observe(time.perf_counter() - t0)
+            self._in_flight[flight] -= 1
+        series.response_bytes.observe(_content_size(contents(result)))
+        return result
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        arguments = context.message.arguments
+        request_size = len(json.dumps(arguments)) if arguments else 0
+        return await self._observe(
+            "tool", context.message.name, request_size, call_next, context,
+            lambda result: result.content,
+        )
+
+    async def on_read_resource(self, context: MiddlewareContext, call_next):
+        uri = str(context.message.uri)
+        return await self._observe(
+            "resource", uri, len(uri), call_next, context, lambda result: result
+        )
+
+    def render(self) -> str:
+        series = [
+            (f'kind="{kind}",name="{_label(name)}",transport="{transport}"', s)
+            for (kind, name, transport), s in sorted(self._series.items())
+        ]
+        lines = []
+        for metric, attr, help_text in HISTOGRAMS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, s in series:
+                lines.extend(getattr(s, attr).lines(metric, labels))
+
+        lines.append("# HELP mcp_request_errors_total Requests that raised.")
+        lines.append("# TYPE mcp_request_errors_total counter")
+        for labels, s in series:
+            lines.append(f"mcp_request_errors_total{{{labels}}} {s.errors}")
+
+        lines.append("# HELP mcp_requests_in_flight Requests currently running.")
+        lines.append("# TYPE mcp_requests_in_flight gauge")
+        for (kind, name), count in sorted(self._in_flight.items()):
+            lines.append(
+                f'mcp_requests_in_flight{{kind="{kind}",name="{_label(name)}"}} {count}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(server: FastMCP, path: str = "/metrics") -> MetricsMiddleware:
+    """
+    Adds a MetricsMiddleware to `server` and serves its metrics at `path`
+    on the server's own HTTP transport (SSE or streamable HTTP).
+    """
+    metrics = MetricsMiddleware()
+    server.add_middleware(metrics)
+
+    @server.custom_route(path, methods=["GET"])
+    async def prometheus_metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+    return metrics
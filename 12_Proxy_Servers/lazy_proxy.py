@@ -0,0 +1,146 @@
+import asyncio
+import json
+import os
+from typing import Any, cast
+
+import mcp.types as mt
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.server.proxy import ProxyTool
+from fastmcp.tools.tool import ToolResult
+
+from caching import ProxyCacheMiddleware
+from load_balancer import ReplicaSet
+from proxy_config import config
+from session_pool import SessionPool
+
+SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tool_snapshot.json"
+)
+
+
+class LazyProxyTool(ProxyTool):
+    """A ProxyTool whose `client` is a client factory, called only when the tool runs."""
+
+    async def run(self, arguments: dict[str, Any], context=None) -> ToolResult:
+        client = await self._client()
+        async with client:
+            result = await client.call_tool_mcp(name=self.name, arguments=arguments)
+        if result.isError:
+            raise ToolError(cast(mt.TextContent, result.content[0]).text)
+        return ToolResult(
+            content=result.content,
+            structured_content=result.structuredContent,
+        )
+
+
+class LazyProxy:
+    """
+    Proxy for a `mcpServers` config that starts serving without touching
+    any backend.
+
+    Tool catalogues come from the JSON snapshot at `snapshot_path`; a backend
+    is only connected when one of its tools is called. `revalidate()` lists
+    every backend in the background, updates the served tools and rewrites
+    the snapshot, so an unreachable backend only loses its own calls.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        name: str,
+        snapshot_path: str = SNAPSHOT_PATH,
+        cache: ProxyCacheMiddleware | None = None,
+    ):
+        self.snapshot_path = snapshot_path
+        self.server = FastMCP(name=name)
+        if cache is not None:
+            self.server.add_middleware(cache)
+
+        self.snapshot: dict[str, dict[str, dict]] = {}
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path) as f:
+                self.snapshot = json.load(f)
+
+        self.backends: dict[str, FastMCP] = {}
+        self.factories = {}
+        for server_name, entry in config["mcpServers"].items():
+            urls = entry["url"]
+            if isinstance(urls, str):
+                factory = SessionPool(urls, size=2, cache=cache).acquire
+            else:
+                factory = ReplicaSet(
+                    urls,
+                    strategy=entry.get("strategy", "least_outstanding"),
+                    cache=cache,
+                ).acquire
+
+            backend = FastMCP(name=server_name)
+            for tool in self.snapshot.get(server_name, {}).values():
+                backend.add_tool(
+                    LazyProxyTool.from_mcp_tool(factory, mt.Tool.model_validate(tool))
+                )
+            self.server.mount(backend, prefix=server_name)
+            self.backends[server_name] = backend
+            self.factories[server_name] = factory
+
+    async def _refresh(self, server_name: str) -> None:
+        client = await self.factories[server_name]()
+        async with client:
+            tools = await client.list_tools()
+
+        fresh = {t.name: t.model_dump(mode="json", exclude_none=True) for t in tools}
+        known = self.snapshot.get(server_name, {})
+        if fresh == known:
+            return
+
+        backend = self.backends[server_name]
+        for tool_name in known.keys() - fresh.keys():
+            backend.remove_tool(tool_name)
+        for tool_name, tool in fresh.items():
+            if known.get(tool_name) != tool:
+                if tool_name in known:
+                    backend.remove_tool(tool_name)
+                backend.add_tool(
+                    LazyProxyTool.from_mcp_tool(
+                        self.factories[server_name], mt.Tool.model_validate(tool)
+                    )
+                )
+        self.snapshot[server_name] = fresh
+        print(f"[LazyProxy] {server_name}: {len(fresh)} tools (catalogue changed)")
+
+    async def revalidate(self) -> None:
+        names = list(self.backends)
+        results = await asyncio.gather(
+            *(self._refresh(n) for n in names), return_exceptions=True
+        )
+        for server_name, result in zip(names, results):
+            if isinstance(result, Exception):
+                print(
+                    f"[LazyProxy] {server_name} unavailable, keeping snapshot: {result}"
+                )
+
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot, f, indent=2)
+        os.replace(tmp, self.snapshot_path)
+
+
+async def main() -> None:
+    lazy = LazyProxy(
+        config, name="LazyProxyToLegacy", cache=ProxyCacheMiddleware(tool_ttl=30)
+    )
+    print(
+        f"starting lazy proxy on port 8000 ({len(lazy.snapshot)} backends from snapshot)"
+    )
+    revalidation = asyncio.create_task(lazy.revalidate())
+    try:
+        await lazy.server.run_async(
+            transport="streamable-http", host="127.0.0.1", port=8000
+        )
+    finally:
+        revalidation.cancel()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+import asyncio
+import random
+
+from fastmcp import Client, FastMCP
+from fastmcp.server.proxy import FastMCPProxy
+
+from caching import ProxyCacheMiddleware
+from session_pool import PooledClient, SessionPool
+
+
+class Replica:
+    def __init__(self, url: str, pool_size: int, max_in_flight: int, cache=None):
+        self.url = url
+        self.pool = SessionPool(
+            url, size=pool_size, max_in_flight=max_in_flight, cache=cache
+        )
+        self.healthy = True
+        self.failures = 0
+
+    @property
+    def outstanding(self) -> int:
+        return sum(c.in_flight for c in self.pool.clients)
+
+
+class ReplicaSet:
+    """
+    Spreads proxied calls for one backend over several replicas.
+
+    `strategy` is "least_outstanding" (pick the replica with the fewest calls
+    in flight) or "p2c" (power of two choices: compare two random replicas).
+    A background task probes every replica each `health_interval` seconds;
+    after `max_failures` failed probes a replica is ejected until a probe
+    succeeds again.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        strategy: str = "least_outstanding",
+        health_interval: float = 5.0,
+        max_failures: int = 2,
+        pool_size: int = 2,
+        max_in_flight: int = 32,
+        cache=None,
+    ):
+        if strategy not in ("least_outstanding", "p2c"):
+            raise ValueError(f"Unknown load balancing strategy: {strategy!r}")
+        self.strategy = strategy
+        self.health_interval = health_interval
+        self.max_failures = max_failures
+        self.replicas = [Replica(url, pool_size, max_in_flight, cache) for url in urls]
+        self._health_task: asyncio.Task | None = None
+
+    def _pick(self, candidates: list[Replica]) -> Replica:
+        if self.strategy == "p2c" and len(candidates) > 1:
+            a, b = random.sample(candidates, 2)
+            return a if a.outstanding <= b.outstanding else b
+        return min(candidates, key=lambda r: r.outstanding)
+
+    def _eject(self, replica: Replica, reason: object) -> None:
+        if replica.healthy:
+            print(f"[ReplicaSet] ejecting {replica.url}: {reason}")
+        replica.healthy = False
+
+    async def acquire(self) -> PooledClient:
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+        candidates = [r for r in self.replicas if r.healthy]
+        while candidates:
+            replica = self._pick(candidates)
+            try:
+                return await replica.pool.acquire()
+            except Exception as exc:
+                # passive check: a replica we cannot even connect to is out
+                self._eject(replica, exc)
+                candidates.remove(replica)
+        raise RuntimeError("No healthy replicas available")
+
+    async def _probe(self, replica: Replica) -> None:
+        if replica.healthy and replica.pool.clients[0].is_connected():
+            await replica.pool.clients[0].ping()
+            return
+        async with Client(replica.url) as probe:
+            await probe.ping()
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            await asyncio.wait_for(self._probe(replica), timeout=self.health_interval)
+        except Exception as exc:
+            replica.failures += 1
+            if replica.failures >= self.max_failures:
+                self._eject(replica, exc)
+            return
+
+        replica.failures = 0
+        if not replica.healthy:
+            # drop the stale sessions; the pool reconnects on next acquire
+            await replica.pool.stop()
+            replica.healthy = True
+            print(f"[ReplicaSet] {replica.url} is back")
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.gather(*(self._check(r) for r in self.replicas))
+            await asyncio.sleep(self.health_interval)
+
+
+def proxy_from_config(
+    config: dict,
+    name: str,
+    strategy: str = "least_outstanding",
+    cache: ProxyCacheMiddleware | None = None,
+) -> FastMCP:
+    """
+    Like FastMCP.as_proxy(config), but an entry may list several replica
+    URLs under "url"; those are load balanced through a ReplicaSet using the
+    entry's "strategy" (default: `strategy`). Every backend is reached
+    through a SessionPool; a `cache` is installed as middleware and shared
+    by all pooled sessions.
+    """
+    proxy = FastMCP(name=name)
+    if cache is not None:
+        proxy.add_middleware(cache)
+    for server_name, entry in config["mcpServers"].items():
+        urls = entry["url"]
+        if isinstance(urls, str):
+            # a pooled client rather than as_proxy's, so listings are cached too
+            pool = SessionPool(urls, size=2, cache=cache)
+            backend = FastMCPProxy(client_factory=pool.acquire, name=server_name)
+        else:
+            replicas = ReplicaSet(
+                urls, strategy=entry.get("strategy", strategy), cache=cache
+            )
+            backend = FastMCPProxy(client_factory=replicas.acquire, name=server_name)
+        proxy.mount(backend, prefix=server_name)
+    return proxy
@@ -0,0 +1,24 @@
+from fastmcp import FastMCP
+from fastmcp.server.proxy import FastMCPProxy
+
+from caching import ProxyCacheMiddleware
+from session_pool import SessionPool
+
+BACKENDS = {
+    "add": "http://127.0.0.1:9001/sse",
+    "subtract": "http://127.0.0.1:9002/sse",
+}
+POOL_SIZE = 4
+MAX_IN_FLIGHT = 32
+
+cache = ProxyCacheMiddleware(tool_ttl=30)
+proxy = FastMCP(name="PooledProxyToLegacy", middleware=[cache])
+
+for name, url in BACKENDS.items():
+    pool = SessionPool(url, size=POOL_SIZE, max_in_flight=MAX_IN_FLIGHT, cache=cache)
+    backend = FastMCPProxy(client_factory=pool.acquire, name=f"{name}-pool")
+    proxy.mount(backend, prefix=name)
+
+if __name__ == "__main__":
+    print(f"starting pooled proxy on port 8000 ({POOL_SIZE} sessions per backend)")
+    proxy.run(transport="streamable-http", host="127.0.0.1", port=8000)
@@ -0,0 +1,18 @@
+# backends of configurable_proxy.py and lazy_proxy.py
+config = {
+    "mcpServers": {
+        "add": {
+            # replicas of backend_server_1.py, e.g. `python backend_server_1.py 9011`
+            "url": [
+                "http://127.0.0.1:9001/sse",
+                "http://127.0.0.1:9011/sse",
+                "http://127.0.0.1:9021/sse",
+            ],
+            "transport": "sse"
+        },
+        "subtract": {
+            "url": "http://127.0.0.1:9002/sse",
+            "transport": "sse"
+        }
+    }
+}
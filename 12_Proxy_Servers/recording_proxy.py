@@ -0,0 +1,33 @@
+"""
+Proxies any MCP server and records the traffic it forwards (see
+traffic.py), so the clients of that server can be pointed at the proxy
+unchanged and their load replayed later with replay.py:
+
+    python recording_proxy.py http://127.0.0.1:9001/sse --out traffic.jsonl
+    python recording_proxy.py ../04_Context/server.py --port 8100
+"""
+
+import argparse
+
+from fastmcp import FastMCP
+
+from traffic import RecordingMiddleware, TrafficRecorder
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("target", help="URL or server script to proxy")
+    parser.add_argument("--out", default="traffic.jsonl")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    recorder = TrafficRecorder(args.out)
+    proxy = FastMCP.as_proxy(args.target, name="RecordingProxy")
+    proxy.add_middleware(RecordingMiddleware(recorder))
+
+    print(f"Recording {args.target} → {args.out} on http://{args.host}:{args.port}/mcp")
+    try:
+        proxy.run(transport="streamable-http", host=args.host, port=args.port)
+    finally:
+        recorder.close()
+        print(f"recorded {recorder.requests} requests")
@@ -0,0 +1,194 @@
+"""
+Replays recorded traffic (see traffic.py and recording_proxy.py) against
+any local server, given as a URL or a server script, and reports its
+throughput, latency percentiles per method against the recording's, and
+the responses that differ from the recorded ones:
+
+    python replay.py traffic.jsonl http://127.0.0.1:8000/mcp             # original rate
+    python replay.py traffic.jsonl http://127.0.0.1:8000/mcp --speed 4   # 4x as fast
+    python replay.py traffic.jsonl ../04_Context/server.py --max         # as fast as possible
+
+Each recorded session is replayed on a session of its own. At a timed
+rate every request is sent at its (scaled) recorded time whether or not
+earlier ones have been answered, as clients would; `lag` is how late
+requests went out. With --max the requests of a session are sent back to
+back. Exits with status 1 if a response differs, more requests fail than
+in the recording, or p95 latency is over --p95-budget.
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+import mcp.types as mt
+from fastmcp import Client
+from mcp import ClientSession, McpError
+
+from traffic import RESULT_TYPES, dump, load_traffic
+
+CONNECT_AHEAD = 0.5  # seconds
+
+
+@dataclass
+class Sample:
+    recorded: dict
+    ms: float
+    lag_ms: float
+    result: dict | None
+    error: str | None
+
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] if ordered else float("nan")
+
+
+def failed(result: dict | None, error: str | None) -> bool:
+    return error is not None or bool(result and result.get("isError"))
+
+
+def same_response(sample: Sample) -> bool | None:
+    """Whether the replayed response matches the recorded one; None if it was not recorded."""
+    recorded = sample.recorded
+    if failed(recorded.get("result"), recorded.get("error")) or failed(sample.result, sample.error):
+        # error messages carry details that vary between runs
+        return failed(recorded.get("result"), recorded.get("error")) == failed(sample.result, sample.error)
+    if recorded.get("result") is None:
+        return None
+    return recorded["result"] == sample.result
+
+
+async def issue(session: ClientSession, recorded: dict, scheduled: float, samples: list[Sample]) -> None:
+    request = mt.ClientRequest.model_validate(
+        {"method": recorded["method"], "params": recorded["params"]}
+    )
+    t0 = time.perf_counter()
+    result = error = None
+    try:
+        result = dump(await session.send_request(request, RESULT_TYPES[recorded["method"]]))
+    except McpError as e:
+        error = e.error.message
+    ms = (time.perf_counter() - t0) * 1000
+    samples.append(Sample(recorded, ms, max(0.0, (t0 - scheduled) * 1000), result, error))
+
+
+async def replay_session(
+    target: str,
+    requests: list[dict],
+    start: float,
+    speed: float | None,
+    connections: asyncio.Semaphore,
+    samples: list[Sample],
+) -> None:
+    def due(recorded: dict) -> float:
+        return start + recorded["t"] / speed if speed else time.perf_counter()
+
+    if speed:
+        # connect ahead of the first request, so it is not late by the handshake
+        await asyncio.sleep(max(0.0, due(requests[0]) - CONNECT_AHEAD - time.perf_counter()))
+    async with connections, Client(target) as client:
+        if not speed:
+            for recorded in requests:
+                await issue(client.session, recorded, time.perf_counter(), samples)
+            return
+        async with asyncio.TaskGroup() as tasks:
+            for recorded in requests:
+                scheduled = due(recorded)
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                tasks.create_task(issue(client.session, recorded, scheduled, samples))
+
+
+def report(traffic: list[dict], samples: list[Sample], elapsed: float, skipped: int) -> dict:
+    recorded_span = traffic[-1]["t"] - traffic[0]["t"] if traffic else 0.0
+    print(
+        f"replayed {len(samples)} requests in {elapsed:.2f}s ({len(samples) / elapsed:.1f} req/s); "
+        f"recorded {len(traffic)} over {recorded_span:.2f}s, {skipped} not replayable"
+    )
+    by_method: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_method[sample.recorded["method"]].append(sample)
+
+    print(
+        f"\n{'method':<26}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+        f"{'rec p50':>10}{'rec p95':>10}{'lag p95':>10}{'errors':>8}"
+    )
+    for method, group in sorted(by_method.items()) + [("all", samples)]:
+        ms = [s.ms for s in group]
+        recorded_ms = [s.recorded["ms"] for s in group]
+        errors = sum(failed(s.result, s.error) for s in group)
+        print(
+            f"{method:<26}{len(group):7d}{percentile(ms, 50):9.2f}{percentile(ms, 95):9.2f}"
+            f"{percentile(ms, 99):9.2f}{max(ms):9.2f}{percentile(recorded_ms, 50):10.2f}"
+            f"{percentile(recorded_ms, 95):10.2f}{percentile([s.lag_ms for s in group], 95):10.2f}"
+            f"{errors:8d}"
+        )
+    return {
+        "p95": percentile([s.ms for s in samples], 95),
+        "errors": sum(failed(s.result, s.error) for s in samples),
+        "recorded_errors": sum(failed(s.recorded.get("result"), s.recorded.get("error")) for s in samples),
+    }
+
+
+def show_diffs(samples: list[Sample], limit: int) -> int:
+    differing = [s for s in samples if same_response(s) is False]
+    unchecked = sum(same_response(s) is None for s in samples)
+    print(f"\n{len(differing)} responses differ from the recording ({unchecked} not recorded)")
+    for sample in differing[:limit]:
+        recorded = sample.recorded
+        print(f"\n{recorded['method']} {json.dumps(recorded['params'])} (recorded at {recorded['t']:.3f}s)")
+        before = json.dumps(recorded.get("result") or {"error": recorded.get("error")}, indent=1, sort_keys=True)
+        after = json.dumps(sample.result or {"error": sample.error}, indent=1, sort_keys=True)
+        diff = difflib.unified_diff(
+            before.splitlines(), after.splitlines(), "recorded", "replayed", lineterm="", n=1
+        )
+        print("\n".join(diff))
+    return len(differing)
+
+
+async def main(args: argparse.Namespace) -> int:
+    traffic = load_traffic(args.recording)
+    replayable = [r for r in traffic if r["method"] in RESULT_TYPES]
+    if not replayable:
+        print("nothing to replay")
+        return 1
+    first = replayable[0]["t"]
+    sessions: dict[str, list[dict]] = defaultdict(list)
+    for recorded in replayable:
+        sessions[recorded["session"]].append({**recorded, "t": recorded["t"] - first})
+
+    speed = None if args.max else args.speed
+    connections = asyncio.Semaphore(args.connections)
+    samples: list[Sample] = []
+    # at a timed rate, leave the sessions at the start time to connect first
+    start = time.perf_counter() + (CONNECT_AHEAD if speed else 0.0)
+    await asyncio.gather(
+        *(
+            replay_session(args.target, requests, start, speed, connections, samples)
+            for requests in sessions.values()
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    summary = report(replayable, samples, elapsed, len(traffic) - len(replayable))
+    differing = show_diffs(samples, args.diffs)
+    over_budget = args.p95_budget is not None and summary["p95"] > args.p95_budget
+    if over_budget:
+        print(f"\np95 {summary['p95']:.2f}ms is over the budget of {args.p95_budget}ms")
+    return 1 if differing or over_budget or summary["errors"] > summary["recorded_errors"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recording", help="JSON Lines file written by a TrafficRecorder")
+    parser.add_argument("target", help="URL or server script to replay against")
+    parser.add_argument("--speed", type=float, default=1.0, help="rate relative to the recording")
+    parser.add_argument("--max", action="store_true", help="send requests as fast as possible")
+    parser.add_argument("--connections", type=int, default=64, help="sessions open at once")
+    parser.add_argument("--diffs", type=int, default=5, help="differing responses to show")
+    parser.add_argument("--p95-budget", type=float, help="fail if p95 latency exceeds this (ms)")
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
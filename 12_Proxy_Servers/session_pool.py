@@ -0,0 +1,154 @@
+import asyncio
+
+import anyio
+import httpx
+from fastmcp.server.proxy import ProxyClient
+
+# errors that mean the session itself is gone, not that a call failed
+CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    httpx.TransportError,
+)
+
+
+class PooledClient(ProxyClient):
+    """ProxyClient that stays connected and caps concurrent calls on its session."""
+
+    def __init__(self, url: str, max_in_flight: int = 32, cache=None, **kwargs):
+        if cache is not None:
+            kwargs.setdefault("message_handler", cache.on_upstream_message)
+        super().__init__(url, **kwargs)
+        self.url = url
+        self.cache = cache
+        self.in_flight = 0
+        self.broken = False
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    async def __aenter__(self):
+        await self._slots.acquire()
+        self.in_flight += 1
+        try:
+            return await super().__aenter__()
+        except BaseException:
+            self.in_flight -= 1
+            self._slots.release()
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None and issubclass(exc_type, CONNECTION_ERRORS):
+            self.broken = True
+        try:
+            await super().__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def _listing(self, kind: str, fetch):
+        if self.cache is None:
+            return await fetch()
+        return await self.cache.cached_listing(kind, self.url, fetch)
+
+    async def list_tools(self):
+        return await self._listing("list_tools", super().list_tools)
+
+    async def list_resources(self):
+        return await self._listing("list_resources", super().list_resources)
+
+    async def list_resource_templates(self):
+        return await self._listing(
+            "list_resource_templates", super().list_resource_templates
+        )
+
+    async def list_prompts(self):
+        return await self._listing("list_prompts", super().list_prompts)
+
+
+class SessionPool:
+    """
+    Keeps `size` initialized upstream sessions open for one backend.
+
+    `acquire` is meant to be passed as `client_factory` to FastMCPProxy: every
+    proxied call reuses an already open session (no new SSE stream, no second
+    `initialize` handshake) and goes to the least busy one. With a
+    ProxyCacheMiddleware as `cache`, upstream listings are served from it.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int = 4,
+        max_in_flight: int = 32,
+        keepalive: float = 30.0,
+        cache=None,
+    ):
+        self.url = url
+        self.keepalive = keepalive
+        self.clients = [PooledClient(url, max_in_flight, cache) for _ in range(size)]
+        self._started = False
+        self._lock = asyncio.Lock()
+        self._keepalive_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self._started:
+                return
+            # hold one reference per client so `async with client` in the
+            # proxy never drops the session when a call finishes
+            try:
+                await asyncio.gather(*(c._connect() for c in self.clients))
+            except Exception:
+                for c in self.clients:
+                    await c._disconnect(force=True)
+                raise
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+            self._started = True
+            print(f"[SessionPool] {len(self.clients)} sessions open to {self.url}")
+
+    async def stop(self) -> None:
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+        for c in self.clients:
+            await c._disconnect(force=True)
+        self._started = False
+
+    async def acquire(self) -> PooledClient:
+        if not self._started:
+            await self.start()
+        live = [c for c in self.clients if c.is_connected() and not c.broken]
+        if not live:
+            # every session is gone: reconnect one now instead of waiting
+            # for the keepalive loop (raises if the backend is down)
+            async with self._lock:
+                live = [c for c in self.clients if c.is_connected() and not c.broken]
+                if not live:
+                    idle = [c for c in self.clients if not c.in_flight]
+                    if not idle:
+                        raise ConnectionError(f"No live sessions to {self.url}")
+                    await self._reconnect(idle[0])
+                    live = idle[:1]
+        return min(live, key=lambda c: c.in_flight)
+
+    async def _reconnect(self, client: PooledClient) -> None:
+        await client._disconnect(force=True)
+        await client._connect()
+        client.broken = False
+
+    async def _keepalive_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive)
+            for c in self.clients:
+                if c.in_flight:
+                    continue
+                try:
+                    if c.broken:
+                        raise ConnectionError("session closed")
+                    await asyncio.wait_for(c.ping(), timeout=5)
+                except Exception as exc:
+                    print(
+                        f"[SessionPool] session to {self.url} lost ({exc}), reconnecting"
+                    )
+                    try:
+                        await self._reconnect(c)
+                    except Exception as exc:
+                        print(f"[SessionPool] reconnect to {self.url} failed: {exc}")
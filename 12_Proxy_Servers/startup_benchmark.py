@@ -0,0 +1,64 @@
+"""
+Measures proxy cold start - building the proxy and answering the first
+tools/list - for 1 vs. 50 configured backends, once with FastMCP.as_proxy
+and once with LazyProxy restoring its tools from a snapshot.
+
+Every backend entry points at a single backend_server_1.py on port 9001.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from fastmcp import Client, FastMCP
+
+from benchmark import start, stop, wait_for_port
+from lazy_proxy import LazyProxy
+
+BACKEND_COUNTS = [1, 50]
+
+
+def make_config(n: int) -> dict:
+    return {
+        "mcpServers": {
+            f"add{i}": {"url": "http://127.0.0.1:9001/sse", "transport": "sse"}
+            for i in range(n)
+        }
+    }
+
+
+async def first_listing(build) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    server = build()
+    async with Client(server) as client:
+        tools = await client.list_tools()
+    return (time.perf_counter() - t0) * 1000, len(tools)
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in BACKEND_COUNTS:
+            cfg = make_config(n)
+            snapshot = os.path.join(tmp, f"snapshot_{n}.json")
+            await LazyProxy(cfg, name="warmup", snapshot_path=snapshot).revalidate()
+
+            eager_ms, eager_tools = await first_listing(
+                lambda: FastMCP.as_proxy(cfg, name="EagerProxy")
+            )
+            lazy_ms, lazy_tools = await first_listing(
+                lambda: LazyProxy(cfg, name="LazyProxy", snapshot_path=snapshot).server
+            )
+            print(
+                f"{n:>3} backends  as_proxy: {eager_ms:8.1f}ms ({eager_tools} tools)  "
+                f"lazy: {lazy_ms:8.1f}ms ({lazy_tools} tools)"
+            )
+
+
+if __name__ == "__main__":
+    backend = start("backend_server_1.py")
+    try:
+        wait_for_port(9001)
+        asyncio.run(main())
+    finally:
+        stop(backend)
@@ -0,0 +1,206 @@
+import base64
+import json
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import mcp.types as mt
+from fastmcp import FastMCP
+from fastmcp.client.transports import ClientTransport
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from mcp import ClientSession, McpError
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import BaseModel
+
+# result types of the requests a recording can hold, to replay them with
+RESULT_TYPES: dict[str, type[BaseModel]] = {
+    "ping": mt.EmptyResult,
+    "tools/list": mt.ListToolsResult,
+    "tools/call": mt.CallToolResult,
+    "resources/list": mt.ListResourcesResult,
+    "resources/templates/list": mt.ListResourceTemplatesResult,
+    "resources/read": mt.ReadResourceResult,
+    "resources/subscribe": mt.EmptyResult,
+    "resources/unsubscribe": mt.EmptyResult,
+    "prompts/list": mt.ListPromptsResult,
+    "prompts/get": mt.GetPromptResult,
+    "completion/complete": mt.CompleteResult,
+    "logging/setLevel": mt.EmptyResult,
+}
+# how a server sends the components its list handlers return: the result
+# key, the conversion method and the argument it names them with
+LISTINGS = {
+    "tools/list": ("tools", "to_mcp_tool", "name"),
+    "resources/list": ("resources", "to_mcp_resource", "uri"),
+    "resources/templates/list": ("resourceTemplates", "to_mcp_template", "uriTemplate"),
+    "prompts/list": ("prompts", "to_mcp_prompt", "name"),
+}
+
+
+def dump(model: BaseModel | None) -> dict | None:
+    """A request's params or a result as it goes over the wire."""
+    if model is None:
+        return None
+    return model.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+class TrafficRecorder:
+    """
+    Appends requests to a JSON Lines file as they complete, one object per
+    request:
+
+        {"t": 1.25, "session": "...", "method": "tools/call",
+         "params": {...}, "ms": 3.1, "result": {...}}
+
+    `t` is when the request was sent, in seconds since the recorder was
+    created, and `ms` how long its response took. A failed request has
+    "error" instead of "result". replay.py re-issues a recording.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.requests = 0
+        self._start = time.monotonic()
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+
+    def now(self) -> float:
+        return time.monotonic() - self._start
+
+    def record(
+        self,
+        session: str,
+        method: str,
+        params: dict | None,
+        sent: float,
+        result: dict | None = None,
+        error: str | None = None,
+    ) -> None:
+        entry: dict[str, Any] = {
+            "t": round(sent, 6),
+            "session": session,
+            "method": method,
+            "params": params,
+            "ms": round((self.now() - sent) * 1000, 3),
+        }
+        if error is not None:
+            entry["error"] = error
+        else:
+            entry["result"] = result
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.requests += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def load_traffic(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return sorted((json.loads(line) for line in f if line.strip()), key=lambda r: r["t"])
+
+
+class RecordingTransport(ClientTransport):
+    """
+    Wraps a client transport so every request a Client sends through it,
+    and the response, is recorded:
+
+        recorder = TrafficRecorder("traffic.jsonl")
+        client = Client(RecordingTransport(StreamableHttpTransport(url), recorder))
+    """
+
+    def __init__(self, transport: ClientTransport, recorder: TrafficRecorder):
+        self.transport = transport
+        self.recorder = recorder
+        self._sessions = 0
+
+    @asynccontextmanager
+    async def connect_session(self, **session_kwargs) -> AsyncIterator[ClientSession]:
+        async with self.transport.connect_session(**session_kwargs) as session:
+            self._sessions += 1
+            session_name = f"{id(self):x}-{self._sessions}"
+            send_request = session.send_request
+
+            async def recorded(request: mt.ClientRequest, result_type, *args, **kwargs):
+                sent = self.recorder.now()
+                root = request.root
+                method, params = root.method, dump(root.params)
+                try:
+                    result = await send_request(request, result_type, *args, **kwargs)
+                except McpError as e:
+                    self.recorder.record(session_name, method, params, sent, error=e.error.message)
+                    raise
+                self.recorder.record(session_name, method, params, sent, dump(result))
+                return result
+
+            session.send_request = recorded
+            yield session
+
+    async def close(self):
+        await self.transport.close()
+
+    def __repr__(self) -> str:
+        return f"<RecordingTransport({self.transport!r})>"
+
+
+class RecordingMiddleware(Middleware):
+    """
+    Records every request a server (such as a proxy) handles, and its
+    response as the client receives it; see recording_proxy.py.
+    """
+
+    def __init__(self, recorder: TrafficRecorder):
+        self.recorder = recorder
+
+    async def on_request(self, context: MiddlewareContext, call_next):
+        message = context.message
+        params = message.params if isinstance(message, mt.Request) else message
+        if not isinstance(params, BaseModel):
+            params = None
+        ctx = context.fastmcp_context
+        session = ctx.session_id
+        sent = self.recorder.now()
+        try:
+            result = await call_next(context)
+        except Exception as e:
+            self.recorder.record(session, context.method, dump(params), sent, error=str(e))
+            raise
+        wire = _wire_result(ctx.fastmcp, context.method, params, result)
+        self.recorder.record(session, context.method, dump(params), sent, wire)
+        return result
+
+
+def _wire_result(server: FastMCP, method: str, params: Any, result: Any) -> dict | None:
+    """What `server` sends for the value its handler returned."""
+    if isinstance(result, ToolResult):
+        return dump(
+            mt.CallToolResult(content=result.content, structuredContent=result.structured_content)
+        )
+    if isinstance(result, list) and method in LISTINGS:
+        key, convert, name = LISTINGS[method]
+        return {
+            key: [
+                dump(
+                    getattr(item, convert)(
+                        **{name: item.key}, include_fastmcp_meta=server.include_fastmcp_meta
+                    )
+                )
+                for item in result
+            ]
+        }
+    if isinstance(result, list) and method == "resources/read":
+        return {"contents": [_resource_contents(str(params.uri), c) for c in result]}
+    if isinstance(result, BaseModel):
+        return dump(result)
+    return None
+
+
+def _resource_contents(uri: str, contents: ReadResourceContents) -> dict:
+    # as the low-level server converts them
+    if isinstance(contents.content, bytes):
+        return {
+            "uri": uri,
+            "mimeType": contents.mime_type or "application/octet-stream",
+            "blob": base64.b64encode(contents.content).decode(),
+        }
+    return {"uri": uri, "mimeType": contents.mime_type or "text/plain", "text": contents.content}
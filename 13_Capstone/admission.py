@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+
+class Overloaded(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AdmissionController:
+    """
+    Lets at most `max_concurrent` agent runs execute at once and up to
+    `max_queue` more wait for a slot. A request arriving at a full queue is
+    rejected right away (429); one that waited `queue_timeout` seconds
+    without getting a slot gives up (503). Both are cheaper for the caller
+    than a request that hangs until its own timeout.
+    """
+
+    def __init__(
+        self, max_concurrent: int = 16, max_queue: int = 64, queue_timeout: float = 10.0
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    async def acquire(self) -> float:
+        """Waits for a slot and returns the time spent queued, in seconds."""
+        if self.running + self.waiting >= self.max_concurrent + self.max_queue:
+            self.rejected += 1
+            raise Overloaded(429, "Too many requests, try again shortly.")
+
+        t0 = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise Overloaded(503, "Furniture assistant is busy, try again later.")
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        return time.perf_counter() - t0
+
+    def release(self) -> None:
+        self.running -= 1
+        self._slots.release()
+
+    def metrics(self) -> dict:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
@@ -0,0 +1,92 @@
+import json
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from langchain_core.messages import BaseMessage
+
+KeyStrategy = Callable[[list[BaseMessage]], str]
+
+
+def exact_key(messages: list[BaseMessage]) -> str:
+    return json.dumps([(m.type, m.content) for m in messages])
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s$]", " ", str(text).lower()).split())
+
+
+def normalized_key(messages: list[BaseMessage]) -> str:
+    """Ignores case, punctuation and whitespace: "How much is the sofa?" == "how much is the  sofa"."""
+    return json.dumps([(m.type, _normalize(m.content)) for m in messages])
+
+
+KEY_STRATEGIES: dict[str, KeyStrategy] = {
+    "exact": exact_key,
+    "normalized": normalized_key,
+}
+
+
+class AnswerCache:
+    """
+    LRU + TTL cache of agent answers, keyed on the conversation content.
+
+    Answers depend on the furniture catalogue, so the cache is tagged with
+    the catalogue version reported by the furniture server and cleared as
+    soon as `set_version` sees a different one.
+    """
+
+    def __init__(
+        self,
+        key: KeyStrategy = normalized_key,
+        ttl: float = 300.0,
+        max_entries: int = 10_000,
+    ):
+        self.key = key
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, messages: list[BaseMessage]) -> str | None:
+        k = self.key(messages)
+        entry = self._entries.get(k)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(k, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(k)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, messages: list[BaseMessage], answer: str) -> None:
+        k = self.key(messages)
+        self._entries[k] = (time.monotonic() + self.ttl, answer)
+        self._entries.move_to_end(k)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set_version(self, version: str) -> None:
+        if version != self.version:
+            if self.version is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "catalogue_version": self.version,
+        }
@@ -1,13 +1,34 @@
-from contextlib import asynccontextmanager
+import asyncio
+import json
+import os
+import time
+import traceback
+from collections.abc import Awaitable, Callable
+from contextlib import aclosing, asynccontextmanager
 from typing import List, Literal
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from pydantic import BaseModel, Field
 
+from admission import AdmissionController, Overloaded
+from answer_cache import KEY_STRATEGIES, AnswerCache
+from conversations import Conversation, ConversationStore
 from llm_furniture_agent import FurnitureAgent
 
+CONVERSATION_WINDOW = int(os.getenv("CONVERSATION_WINDOW", "12"))
+CONVERSATION_SUMMARIZE = os.getenv("CONVERSATION_SUMMARIZE", "1") == "1"
+ANSWER_CACHE_KEY = os.getenv("ANSWER_CACHE_KEY", "normalized")
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "300"))
+CATALOGUE_CHECK_INTERVAL = float(os.getenv("CATALOGUE_CHECK_INTERVAL", "10"))
+AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "16"))
+AGENT_MAX_QUEUE = int(os.getenv("AGENT_MAX_QUEUE", "64"))
+AGENT_QUEUE_TIMEOUT = float(os.getenv("AGENT_QUEUE_TIMEOUT", "10"))
+AGENT_INIT_MAX_BACKOFF = float(os.getenv("AGENT_INIT_MAX_BACKOFF", "30"))
+
 
 class ApiMessage(BaseModel):
     role: Literal["human", "ai", "system"]
@@ -22,6 +43,16 @@ class AskResponse(BaseModel):
     answer: str
 
 
+class ChatRequest(BaseModel):
+    conversation_id: str | None = None
+    message: str = Field(..., min_length=1)
+
+
+class ChatResponse(BaseModel):
+    conversation_id: str
+    answer: str
+
+
 def to_langchain(messages: List[ApiMessage]) -> List[BaseMessage]:
     out: List[BaseMessage] = []
     for m in messages:
@@ -32,14 +63,228 @@ def to_langchain(messages: List[ApiMessage]) -> List[BaseMessage]:
     return out
 
 
+def sse_event(data: dict) -> str:
+    return f"data: {json.dumps(data)}\n\n"
+
+
+def ready_agent(request: Request) -> FurnitureAgent:
+    agent: FurnitureAgent = request.app.state.furniture_agent  # type: ignore
+
+    if not agent.is_initialized:
+        raise HTTPException(
+            status_code=503,
+            detail="Furniture assistant is currently unavailable.",
+            headers={"Retry-After": "1"},
+        )
+    return agent
+
+
+def get_conversation(request: Request, conversation_id: str | None) -> Conversation:
+    store: ConversationStore = request.app.state.conversations
+    if conversation_id is None:
+        return store.create()
+    conversation = store.get(conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired conversation.")
+    return conversation
+
+
+async def admit(request: Request) -> Callable[[], None]:
+    """
+    Waits for an agent slot (429/503 when overloaded) and returns the function
+    that frees it again; calling it more than once is harmless. Queue and
+    agent time end up in `request.state.timing`.
+    """
+    admission: AdmissionController = request.app.state.admission
+    try:
+        queued = await admission.acquire()
+    except Overloaded as exc:
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=exc.detail,
+            headers={"Retry-After": "1"},
+        ) from exc
+
+    request.state.timing = {"queue": queued}
+    started = time.perf_counter()
+    released = False
+
+    def release() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            request.state.timing["agent"] = time.perf_counter() - started
+            admission.release()
+
+    return release
+
+
+def server_timing(request: Request) -> dict[str, str]:
+    """Server-Timing header for the request; empty if it never needed a slot (cache hit)."""
+    timing: dict[str, float] = getattr(request.state, "timing", {})
+    if not timing:
+        return {}
+    return {
+        "Server-Timing": ", ".join(
+            f"{name};dur={sec * 1000:.1f}" for name, sec in timing.items()
+        )
+    }
+
+
+async def cached_ask(
+    request: Request, agent: FurnitureAgent, messages: List[BaseMessage]
+) -> str:
+    cache: AnswerCache = request.app.state.answer_cache
+    answer = cache.get(messages)
+    if answer is None:
+        release = await admit(request)
+        try:
+            answer = await agent.ask(messages)
+        finally:
+            release()
+        if not answer.startswith("Error: "):
+            cache.put(messages, answer)
+    return answer
+
+
+async def initialize_agent(agent: FurnitureAgent) -> None:
+    """Initializes the agent in the background, retrying with backoff, so
+    the server accepts connections (and answers /readyz) right away."""
+    delay = 1.0
+    while True:
+        try:
+            await agent.initialize()
+            return
+        except Exception:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, AGENT_INIT_MAX_BACKOFF)
+
+
+async def watch_catalogue(agent: FurnitureAgent, cache: AnswerCache) -> None:
+    """Clears the answer cache as soon as the furniture server reports a
+    new catalogue version. While that watch fails (say, a server without
+    the long-poll resource), the version is polled every
+    CATALOGUE_CHECK_INTERVAL seconds instead."""
+    while not agent.is_initialized:
+        await asyncio.sleep(1)
+    while True:
+        try:
+            async with aclosing(agent.catalogue_versions()) as versions:
+                async for version in versions:
+                    cache.set_version(version)
+        except Exception:
+            traceback.print_exc()
+        await asyncio.sleep(CATALOGUE_CHECK_INTERVAL)
+        try:
+            cache.set_version(await agent.catalogue_version())
+        except Exception:
+            traceback.print_exc()
+
+
+async def remember(
+    request: Request, conversation: Conversation, message: str, answer: str
+) -> None:
+    conversation.messages += [HumanMessage(content=message), AIMessage(content=answer)]
+    await request.app.state.conversations.compact(conversation)
+
+
+async def stream_events(
+    agent: FurnitureAgent,
+    messages: List[BaseMessage],
+    request: Request,
+    on_done: Callable[[str], Awaitable[None]] | None = None,
+):
+    """
+    SSE chunks for one agent run, ending with a "done" event that carries
+    the final answer (also passed to `on_done`) and the run's timing. The
+    agent is only advanced when the previous event has been sent, so a slow
+    client throttles it. On disconnect the stream is closed, which cancels
+    the running model or tool call.
+    """
+    cache: AnswerCache = request.app.state.answer_cache
+    started = time.perf_counter()
+    answer = cache.get(messages)
+    if answer is not None:
+        yield sse_event({"type": "token", "content": answer})
+        if on_done is not None:
+            await on_done(answer)
+        yield sse_event({"type": "done", "answer": answer, "cached": True})
+        return
+
+    answer = ""
+    try:
+        async with aclosing(agent.stream(messages)) as stream:
+            async for event in stream:
+                if await request.is_disconnected():
+                    return
+                if event["type"] == "answer":
+                    answer = event["content"]  # sent with "done"
+                    continue
+                yield sse_event(event)
+        if answer:
+            cache.put(messages, answer)
+        if on_done is not None:
+            await on_done(answer)
+        timing = {
+            "queue_ms": round(request.state.timing["queue"] * 1000, 1),
+            "agent_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        yield sse_event({"type": "done", "answer": answer, "timing": timing})
+    except Exception as exc:
+        yield sse_event({"type": "error", "detail": str(exc)})
+
+
+def sse_response(
+    events, request: Request, release: Callable[[], None]
+) -> StreamingResponse:
+    """`release` runs when the stream ends and again after the response, in
+    case the client left before the stream was ever started."""
+
+    async def body():
+        try:
+            async for chunk in events:
+                yield chunk
+        finally:
+            release()
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            **server_timing(request),
+        },
+        background=BackgroundTask(release),
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     agent = FurnitureAgent()
-    await agent.initialize()
     app.state.furniture_agent = agent
+    app.state.conversations = ConversationStore(
+        window=CONVERSATION_WINDOW,
+        summarize=agent.summarize if CONVERSATION_SUMMARIZE else None,
+    )
+    app.state.answer_cache = AnswerCache(
+        key=KEY_STRATEGIES[ANSWER_CACHE_KEY], ttl=ANSWER_CACHE_TTL
+    )
+    app.state.admission = AdmissionController(
+        max_concurrent=AGENT_MAX_CONCURRENCY,
+        max_queue=AGENT_MAX_QUEUE,
+        queue_timeout=AGENT_QUEUE_TIMEOUT,
+    )
+    initializer = asyncio.create_task(initialize_agent(agent))
+    catalogue_watcher = asyncio.create_task(
+        watch_catalogue(agent, app.state.answer_cache)
+    )
     try:
         yield
     finally:
+        initializer.cancel()
+        catalogue_watcher.cancel()
+        await asyncio.gather(initializer, return_exceptions=True)
         await agent.close()
 
 
@@ -53,22 +298,20 @@ app = FastAPI(
 async def ask_agent(
     payload: AskWithHistoryRequest,
     request: Request,
+    response: Response,
 ):
-    agent: FurnitureAgent = request.app.state.furniture_agent  # type: ignore
-
-    if not agent.is_initialized:
-        raise HTTPException(
-            status_code=503,
-            detail="Furniture assistant is currently unavailable.",
-        )
+    agent = ready_agent(request)
 
     lc_msgs = to_langchain(payload.messages)
     if not lc_msgs:
         raise HTTPException(status_code=400, detail="No valid messages in request.")
 
     try:
-        answer = await agent.ask(lc_msgs)
+        answer = await cached_ask(request, agent, lc_msgs)
+        response.headers.update(server_timing(request))
         return AskResponse(answer=answer)
+    except HTTPException:
+        raise
     except Exception as exc:
         raise HTTPException(
             status_code=500,
@@ -76,5 +319,90 @@ async def ask_agent(
         ) from exc
 
 
+@app.post("/ask/stream")
+async def ask_agent_stream(
+    payload: AskWithHistoryRequest,
+    request: Request,
+):
+    agent = ready_agent(request)
+
+    lc_msgs = to_langchain(payload.messages)
+    if not lc_msgs:
+        raise HTTPException(status_code=400, detail="No valid messages in request.")
+
+    release = await admit(request)
+    return sse_response(stream_events(agent, lc_msgs, request), request, release)
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(payload: ChatRequest, request: Request, response: Response):
+    """Like /ask, but the history lives on the server: send only the new message."""
+    agent = ready_agent(request)
+    conversation = get_conversation(request, payload.conversation_id)
+
+    async with conversation.lock:
+        history = conversation.prompt_messages()
+        history.append(HumanMessage(content=payload.message))
+        answer = await cached_ask(request, agent, history)
+        await remember(request, conversation, payload.message, answer)
+    response.headers.update(server_timing(request))
+    return ChatResponse(conversation_id=conversation.id, answer=answer)
+
+
+@app.post("/chat/stream")
+async def chat_stream(payload: ChatRequest, request: Request):
+    agent = ready_agent(request)
+    conversation = get_conversation(request, payload.conversation_id)
+    release = await admit(request)
+
+    async def events():
+        yield sse_event({"type": "conversation", "id": conversation.id})
+        async with conversation.lock:
+            history = conversation.prompt_messages()
+            history.append(HumanMessage(content=payload.message))
+
+            async def on_done(answer: str) -> None:
+                await remember(request, conversation, payload.message, answer)
+
+            async for chunk in stream_events(agent, history, request, on_done):
+                yield chunk
+
+    return sse_response(events(), request, release)
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process serves requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz(request: Request):
+    """Readiness: 200 once the agent can answer, 503 until then."""
+    agent: FurnitureAgent = request.app.state.furniture_agent
+    if agent.is_initialized:
+        return {"ready": True, "init_seconds": agent.init_seconds}
+    return JSONResponse(
+        {"ready": False, "error": agent.init_error},
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.get("/metrics/cache")
+async def cache_metrics(request: Request):
+    return request.app.state.answer_cache.metrics()
+
+
+@app.get("/metrics/admission")
+async def admission_metrics(request: Request):
+    return request.app.state.admission.metrics()
+
+
+@app.get("/metrics/agent")
+async def agent_metrics(request: Request):
+    return request.app.state.furniture_agent.metrics()
+
+
 if __name__ == "__main__":
     uvicorn.run("api_server:app", host="0.0.0.0", port=8000)
@@ -0,0 +1,328 @@
+import csv
+import hashlib
+import heapq
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import Literal, NamedTuple
+
+Sort = Literal["relevance", "price_asc", "price_desc"]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _trigrams(word: str) -> set[str]:
+    return {word[i : i + 3] for i in range(len(word) - 2)}
+
+
+class Matches(NamedTuple):
+    items: list[dict]
+    total: int
+    exact: bool  # False: there are more than `total` matches
+
+
+class Catalogue:
+    """
+    In-memory furniture catalogue indexed for partial-name lookups.
+
+    Items are kept sorted by lowercase name, so the names starting with a
+    fragment are one contiguous range found by bisection. For matches
+    further inside a name, every distinct word and every pair of adjacent
+    words maps to the ids of the items containing it, and every trigram to
+    the words containing it. A fragment is matched against the (small) word
+    vocabulary, and only the items of its most selective word or word pair
+    are walked, in name order, until the requested page is filled.
+    Name-prefix matches rank first, then other matches, each alphabetically.
+
+    Items added after loading go to an unsorted tail that is scanned
+    linearly. The formatted listing, the price order and `version` are
+    cached until the next change, after which `on_change` is called.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[dict] = (),
+        count_limit: int = 1000,
+        sort_limit: int = 10_000,
+    ):
+        self.count_limit = count_limit
+        self.sort_limit = sort_limit
+        self.names: list[str] = []
+        self.prices: list[float | None] = []  # None marks a removed item
+        self._lower: list[str] = []
+        self._ids_by_name: dict[str, int] = {}
+        self._items_by_word: dict[str, array] = {}
+        self._words_by_gram: dict[str, set[str]] = {}
+        self._items_by_pair: dict[str, array] = {}
+        self._live = 0
+        self._listing: list[str] | None = None
+        self._by_price: list[int] | None = None
+        self._version: str | None = None
+        self.on_change: Callable[[], None] | None = None
+
+        self._load(items)
+        self._sorted = len(self.names)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "Catalogue":
+        """Loads a CSV (with `name,price` header), JSON array or JSON Lines file."""
+        with open(path, newline="") as f:
+            if path.endswith(".csv"):
+                return cls(csv.DictReader(f), **kwargs)
+            if path.endswith(".jsonl"):
+                return cls((json.loads(line) for line in f if line.strip()), **kwargs)
+            return cls(json.load(f), **kwargs)
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _load(self, items: Iterable[dict]) -> None:
+        """Bulk version of `_insert` for the initial, sorted load."""
+        rows = {}
+        for item in items:
+            name = item["name"]
+            rows[" ".join(name.lower().split())] = (name, float(item["price"]))
+        lowers = sorted(rows)
+
+        self._lower = lowers
+        self._ids_by_name = dict(zip(lowers, range(len(lowers))))
+        self.names = [rows[lower][0] for lower in lowers]
+        self.prices = [rows[lower][1] for lower in lowers]
+        self._live = len(lowers)
+
+        items_by_word: defaultdict[str, list[int]] = defaultdict(list)
+        for item_id, lower in enumerate(lowers):
+            words = lower.split()
+            for key in {*words, *map(" ".join, zip(words, words[1:]))}:
+                items_by_word[key].append(item_id)
+
+        for key, ids in items_by_word.items():
+            if " " in key:
+                self._items_by_pair[key] = array("I", ids)
+            else:
+                self._items_by_word[key] = array("I", ids)
+                for gram in _trigrams(key):
+                    self._words_by_gram.setdefault(gram, set()).add(key)
+
+    def _insert(self, lower: str, name: str, price: float) -> None:
+        existing = self._ids_by_name.get(lower)
+        if existing is not None:
+            if self.prices[existing] is None:
+                self._live += 1
+            self.names[existing] = name
+            self.prices[existing] = price
+            return
+
+        item_id = len(self.names)
+        self.names.append(name)
+        self.prices.append(price)
+        self._lower.append(lower)
+        self._ids_by_name[lower] = item_id
+        self._live += 1
+        items_by_word = self._items_by_word
+        words = lower.split()
+        for word in set(words):
+            ids = items_by_word.get(word)
+            if ids is None:
+                ids = items_by_word[word] = array("I")
+                for gram in _trigrams(word):
+                    self._words_by_gram.setdefault(gram, set()).add(word)
+            ids.append(item_id)
+        items_by_pair = self._items_by_pair
+        for pair in set(map(" ".join, zip(words, words[1:]))):
+            ids = items_by_pair.get(pair)
+            if ids is None:
+                ids = items_by_pair[pair] = array("I")
+            ids.append(item_id)
+
+    def _changed(self) -> None:
+        self._listing = None
+        self._by_price = None
+        self._version = None
+        if self.on_change is not None:
+            self.on_change()
+
+    def add(self, name: str, price: float) -> None:
+        """Adds an item, or updates the price of the item with that name."""
+        self._insert(_normalize(name), name, price)
+        self._changed()
+
+    def remove(self, name: str) -> bool:
+        item_id = self._ids_by_name.get(_normalize(name))
+        if item_id is None or self.prices[item_id] is None:
+            return False
+        self.prices[item_id] = None
+        self._live -= 1
+        self._changed()
+        return True
+
+    def item(self, item_id: int) -> dict:
+        return {"name": self.names[item_id], "price": self.prices[item_id]}
+
+    def _matching_words(self, token: str) -> list[str]:
+        if len(token) < 3:
+            # too short for a trigram; the vocabulary is small enough to scan
+            return [w for w in self._items_by_word if token in w]
+        grams = sorted(
+            (self._words_by_gram.get(g, set()) for g in _trigrams(token)), key=len
+        )
+        return [w for w in grams[0].intersection(*grams[1:]) if token in w]
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        """Ascending ids of the items that contain the query's most selective token."""
+        tokens = query.split()
+        if not tokens:
+            return range(len(self.names))
+
+        # Inner tokens are whole words; the first may be the end of a word
+        # and the last the start of one.
+        matching = []
+        for n, token in enumerate(tokens):
+            words = self._matching_words(token)
+            if n > 0 and n < len(tokens) - 1:
+                words = [w for w in words if w == token]
+            elif n > 0:
+                words = [w for w in words if w.startswith(token)]
+            elif len(tokens) > 1:
+                words = [w for w in words if w.endswith(token)]
+            matching.append(words)
+
+        best: list[array] | None = None
+        options = [[self._items_by_word[w] for w in words] for words in matching]
+        for left, right in zip(matching, matching[1:]):
+            pairs = (self._items_by_pair.get(f"{a} {b}") for a in left for b in right)
+            options.append([ids for ids in pairs if ids is not None])
+        for postings in options:
+            if best is None or sum(map(len, postings)) < sum(map(len, best)):
+                best = postings
+            if not best:
+                return ()
+        if len(best) == 1:
+            return best[0]
+        # an item can contain several of the matching words
+        return _dedupe(heapq.merge(*best))
+
+    def _matches(self, query: str) -> Iterator[int]:
+        lower, prices, end = self._lower, self.prices, self._sorted
+        lo = bisect_left(lower, query, 0, end)
+        hi = bisect_left(lower, query + "\U0010ffff", lo, end)
+        yield from (i for i in range(lo, hi) if prices[i] is not None)
+        for i in range(end, len(lower)):
+            if prices[i] is not None and lower[i].startswith(query):
+                yield i
+
+        for i in self._candidates(query):
+            if lo <= i < hi or prices[i] is None:
+                continue
+            name = lower[i]
+            if query in name and (i < end or not name.startswith(query)):
+                yield i
+
+    def _price_order(self) -> list[int]:
+        if self._by_price is None:
+            prices = self.prices
+            self._by_price = sorted(
+                (i for i, price in enumerate(prices) if price is not None),
+                key=prices.__getitem__,
+            )
+        return self._by_price
+
+    def _in_price_order(
+        self,
+        query: str,
+        min_price: float | None,
+        max_price: float | None,
+        descending: bool,
+    ) -> Iterator[int]:
+        order, prices, lower = self._price_order(), self.prices, self._lower
+        lo, hi = 0, len(order)
+        if min_price is not None:
+            lo = bisect_left(order, min_price, key=prices.__getitem__)
+        if max_price is not None:
+            hi = bisect_right(order, max_price, lo, key=prices.__getitem__)
+        positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        return (order[k] for k in positions if query in lower[order[k]])
+
+    def search(
+        self,
+        fragment: str = "",
+        offset: int = 0,
+        limit: int = 20,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        sort: Sort = "relevance",
+    ) -> Matches:
+        """
+        The `limit` best matches from `offset`, optionally within a price
+        range and ordered by price. Matches are counted up to `count_limit`
+        past the page; beyond that `total` is a lower bound.
+        """
+        query = _normalize(fragment)
+        prices = self.prices
+        matches = self._matches(query)
+        if min_price is not None or max_price is not None:
+            low = float("-inf") if min_price is None else min_price
+            high = float("inf") if max_price is None else max_price
+            matches = (i for i in matches if low <= prices[i] <= high)
+
+        if sort != "relevance":
+            found = list(islice(matches, self.sort_limit + 1))
+            if len(found) > self.sort_limit:
+                # too many to sort per request: walk the cached price order
+                # instead, just far enough for the page
+                walk = self._in_price_order(
+                    query, min_price, max_price, sort == "price_desc"
+                )
+                page = list(islice(walk, offset, offset + limit))
+                return Matches(
+                    items=[self.item(i) for i in page],
+                    total=max(len(found), offset + len(page)),
+                    exact=False,
+                )
+            found.sort(key=prices.__getitem__, reverse=sort == "price_desc")
+            return Matches(
+                items=[self.item(i) for i in found[offset : offset + limit]],
+                total=len(found),
+                exact=True,
+            )
+
+        cap = offset + limit + self.count_limit
+        found = list(islice(matches, cap))
+        return Matches(
+            items=[self.item(i) for i in found[offset : offset + limit]],
+            total=len(found),
+            exact=len(found) < cap,
+        )
+
+    def listing(self) -> list[str]:
+        """`- name: $price` lines for all items, in catalogue order."""
+        if self._listing is None:
+            self._listing = [
+                f"- {name}: ${price:.2f}"
+                for name, price in zip(self.names, self.prices)
+                if price is not None
+            ]
+        return self._listing
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            digest = hashlib.sha256()
+            for name, price in zip(self.names, self.prices):
+                if price is not None:
+                    digest.update(f"{name}\0{price!r}\n".encode())
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+
+def _dedupe(ids: Iterable[int]) -> Iterator[int]:
+    last = -1
+    for i in ids:
+        if i != last:
+            yield i
+            last = i
@@ -0,0 +1,134 @@
+"""
+Builds a synthetic catalogue of `--items` unique furniture names, writes it
+to a CSV file, loads it with Catalogue.from_file and times lookups:
+
+- selective: a few consecutive words of one item's name
+- broad: common words matching a large share of the catalogue
+- deep: the broad queries again, for the 10th page
+
+Match counts are capped at `count_limit` past the page (see Catalogue.search).
+
+    python catalogue_benchmark.py --items 1000000
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+import tempfile
+import time
+
+from catalogue import Catalogue
+
+COLLECTIONS = "Aria Bellamy Cove Dalton Everly Fenwick Griffin Harlow Isla Juniper Kensington Linden Marlow Nash Oakley Pemberton Quinn Rowan Sutton Thorne".split()
+SIZES = "Small Medium Large XL Twin Queen King Petite Wide Tall Low Slim".split()
+COLOURS = "White Black Grey Natural Navy Sage Terracotta Cream Charcoal Olive Mustard Blush Teal Sand Ivory Espresso Honey Slate Rust Walnut-Stained".split()
+STYLES = "Classic Rustic Modern Comfort Vintage Nordic Industrial Compact Deluxe Elegant Coastal Scandi Tuscan Urban Boho Retro Minimal Royal Cosy Heritage".split()
+MATERIALS = "Wood Oak Walnut Pine Steel Glass Leather Fabric Velvet Marble Teak Birch Rattan Bamboo Linen Wool Cherry Maple Ash Beech Iron Brass Concrete Acacia Mango".split()
+KINDS = [
+    "Chair", "Dining Table", "Corner Sofa", "Bookshelf", "Bed Frame", "Wardrobe",
+    "Desk", "Stool", "Armchair", "Coffee Table", "Sideboard", "Dresser",
+    "Nightstand", "Bench", "Ottoman", "Recliner", "Console Table", "Cabinet",
+    "Daybed", "Bar Stool", "Sofa Bed", "Chaise", "Loveseat", "TV Stand",
+    "Shoe Rack", "Vanity", "Hutch", "Futon", "Rocking Chair", "Side Table",
+    "Bunk Bed", "Crib", "Chest", "Footstool", "Hall Tree", "Credenza",
+    "Etagere", "Settee", "Pouf", "Trunk",
+]
+BROAD_QUERIES = ["sofa", "oak", "corner sofa", "table", "harlow"]
+
+
+def synthetic_names(n: int) -> list[str]:
+    """`n` unique names, spread evenly over all word combinations."""
+    parts = (COLLECTIONS, SIZES, COLOURS, STYLES, MATERIALS, KINDS)
+    step = max(1, math.prod(map(len, parts)) // n)
+    # coprime to every part, so each of them cycles through all its words
+    while step > 1 and any(math.gcd(step, len(words)) > 1 for words in parts):
+        step -= 1
+
+    names = []
+    for i in range(n):
+        index, picked = i * step, []
+        for words in reversed(parts):
+            index, k = divmod(index, len(words))
+            picked.append(words[k])
+        names.append(" ".join(reversed(picked)))
+    return names
+
+
+def synthetic_price(i: int) -> float:
+    return (i * 7919) % 2000 + 0.99
+
+
+def write_catalogue(path: str, n: int) -> list[str]:
+    names = synthetic_names(n)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "price"])
+        for i, name in enumerate(names):
+            writer.writerow([name, f"{synthetic_price(i):.2f}"])
+    return names
+
+
+def selective_queries(names: list[str], n: int) -> list[str]:
+    rng = random.Random(42)
+    queries = []
+    for name in rng.sample(names, n):
+        words = name.lower().split()
+        start = rng.randrange(len(words) - 2)
+        queries.append(" ".join(words[start : start + rng.randint(3, 4)]))
+    return queries
+
+
+def time_queries(
+    catalogue: Catalogue, queries: list[str], offset: int = 0
+) -> tuple[float, float, float]:
+    times = []
+    matches = 0
+    for q in queries:
+        t0 = time.perf_counter()
+        result = catalogue.search(q, offset=offset, limit=20)
+        times.append((time.perf_counter() - t0) * 1000)
+        matches += result.total
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.99)], matches / len(queries)
+
+
+def report(label: str, stats: tuple[float, float, float]) -> None:
+    p50, p99, avg_matches = stats
+    print(f"{label:<10} p50 {p50:8.3f}ms  p99 {p99:8.3f}ms  avg matches {avg_matches:9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalogue.csv")
+        names = write_catalogue(path, args.items)
+
+        t0 = time.perf_counter()
+        catalogue = Catalogue.from_file(path)
+        load = time.perf_counter() - t0
+    print(f"loaded {len(catalogue)} items in {load:.2f}s")
+
+    queries = selective_queries(names, args.queries)
+    report("selective", time_queries(catalogue, queries))
+    report("broad", time_queries(catalogue, BROAD_QUERIES))
+    report("deep", time_queries(catalogue, BROAD_QUERIES, offset=180))
+
+    t0 = time.perf_counter()
+    catalogue.listing()
+    first = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    catalogue.listing()
+    print(
+        f"listing    first {first * 1000:.1f}ms, "
+        f"cached {(time.perf_counter() - t0) * 1000:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import asyncio
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+Summarizer = Callable[[str | None, list[BaseMessage]], Awaitable[str]]
+
+
+@dataclass
+class Conversation:
+    id: str
+    messages: list[BaseMessage] = field(default_factory=list)
+    summary: str | None = None
+    last_used: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def prompt_messages(self) -> list[BaseMessage]:
+        if self.summary is None:
+            return list(self.messages)
+        return [
+            SystemMessage(content=f"Summary of the earlier conversation: {self.summary}"),
+            *self.messages,
+        ]
+
+
+class ConversationStore:
+    """
+    Server-side chat histories, kept as ready-made LangChain messages.
+
+    Once a conversation holds more than `window` messages, the oldest ones
+    are cut down to `window // 2` in one go. With `summarize` they are folded
+    into a running summary, otherwise they are dropped. If summarizing
+    fails the messages are kept and compacted on a later turn. Compacting in chunks
+    rather than every turn keeps the start of the prompt identical across
+    turns, so provider-side prompt caching keeps hitting.
+    """
+
+    def __init__(
+        self,
+        window: int = 12,
+        summarize: Summarizer | None = None,
+        idle_ttl: float = 3600.0,
+        max_conversations: int = 10_000,
+    ):
+        self.window = window
+        self.summarize = summarize
+        self.idle_ttl = idle_ttl
+        self.max_conversations = max_conversations
+        self._conversations: OrderedDict[str, Conversation] = OrderedDict()
+
+    def create(self) -> Conversation:
+        self._evict()
+        conversation = Conversation(id=uuid.uuid4().hex)
+        self._conversations[conversation.id] = conversation
+        return conversation
+
+    def get(self, conversation_id: str) -> Conversation | None:
+        self._evict()
+        conversation = self._conversations.get(conversation_id)
+        if conversation is not None:
+            conversation.last_used = time.monotonic()
+            self._conversations.move_to_end(conversation_id)
+        return conversation
+
+    def _evict(self) -> None:
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._conversations:
+            oldest = next(iter(self._conversations.values()))
+            if (
+                oldest.last_used >= cutoff
+                and len(self._conversations) < self.max_conversations
+            ):
+                break
+            del self._conversations[oldest.id]
+
+    async def compact(self, conversation: Conversation) -> None:
+        if len(conversation.messages) <= self.window:
+            return
+
+        cut = len(conversation.messages) - self.window // 2
+        # never start the kept part in the middle of a turn
+        while cut < len(conversation.messages) and not isinstance(
+            conversation.messages[cut], HumanMessage
+        ):
+            cut += 1
+
+        if self.summarize is not None:
+            try:
+                summary = await self.summarize(conversation.summary, conversation.messages[:cut])
+            except Exception:
+                # keep the history as it is, the next turn tries again
+                traceback.print_exc()
+                return
+            conversation.summary = summary
+        conversation.messages = conversation.messages[cut:]
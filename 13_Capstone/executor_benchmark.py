@@ -0,0 +1,97 @@
+"""
+Mixes a CPU-heavy sync tool with `add` traffic on one in-memory server and
+reports the latency of `add` while `--heavy` concurrent callers keep the
+heavy tool busy, once per execution policy of the heavy tool (after a
+first run without heavy traffic). Process workers only take load off the
+event loop given spare CPU cores.
+
+    python executor_benchmark.py --adds 200 --heavy 4 --work 500000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastmcp import Client, FastMCP
+
+from executor_policy import execution
+
+
+# module level, so that process workers can import it by name
+def crunch(n: int) -> int:
+    """Pure-Python CPU work, holding the GIL throughout."""
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+
+POLICIES = ["inline", "auto", "thread", "process"]
+CRUNCH = {p: execution(p, max_workers=2, max_queue=16)(crunch) for p in POLICIES}
+
+
+def make_server(policy: str) -> FastMCP:
+    server = FastMCP("ExecutorBenchmark")
+
+    @server.tool(description="Add two integers")
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    server.tool(CRUNCH[policy])
+    return server
+
+
+async def run(policy: str, args: argparse.Namespace, heavy_callers: int) -> None:
+    async with Client(make_server(policy)) as client:
+        await client.call_tool("crunch", {"n": 1000})  # start the pool
+        await client.call_tool("crunch", {"n": args.work})
+        latencies: list[float] = []
+        heavy_done = 0
+        stop = asyncio.Event()
+
+        async def heavy() -> None:
+            nonlocal heavy_done
+            while not stop.is_set():
+                await client.call_tool("crunch", {"n": args.work})
+                heavy_done += 1
+
+        async def adds() -> None:
+            for i in range(args.adds):
+                t0 = time.perf_counter()
+                await client.call_tool("add", {"a": i, "b": 1})
+                latencies.append(time.perf_counter() - t0)
+                await asyncio.sleep(0.002)
+
+        t0 = time.perf_counter()
+        workers = [asyncio.create_task(heavy()) for _ in range(heavy_callers)]
+        await adds()
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        await asyncio.gather(*workers)
+    CRUNCH[policy].executor.shutdown()
+
+    latencies.sort()
+    label = policy if heavy_callers else "no load"
+    print(
+        f"{label:<8} add p50 {latencies[len(latencies) // 2] * 1000:7.1f}ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f}ms  "
+        f"max {latencies[-1] * 1000:7.1f}ms  "
+        f"heavy {heavy_done / elapsed:5.1f} calls/s"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    await run("inline", args, heavy_callers=0)
+    for policy in args.policies:
+        await run(policy, args, args.heavy)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--adds", type=int, default=200)
+    parser.add_argument("--heavy", type=int, default=4)
+    parser.add_argument("--work", type=int, default=500_000)
+    parser.add_argument(
+        "--policies", nargs="+", choices=POLICIES, default=POLICIES
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,160 @@
+import asyncio
+import functools
+import importlib
+import inspect
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Literal
+
+from fastmcp.exceptions import ToolError
+
+Policy = Literal["auto", "inline", "thread", "process"]
+
+
+@functools.cache
+def _resolve(module: str, qualname: str) -> Callable:
+    """
+    The function a process worker runs, imported by module and qualified
+    name. The module attribute is usually the decorated tool (a FastMCP
+    tool holding the `execution` wrapper), so it is unwrapped to the
+    original function.
+    """
+    target = importlib.import_module(module)
+    for name in qualname.split("."):
+        target = getattr(target, name)
+    return inspect.unwrap(getattr(target, "fn", target))
+
+
+def _call(module: str, qualname: str, args: tuple, kwargs: dict):
+    return _resolve(module, qualname)(*args, **kwargs)
+
+
+class ToolExecutor:
+    """
+    Runs one synchronous tool function according to its policy:
+
+    - inline: on the event loop, for trivial functions
+    - thread: in its own pool of `max_workers` threads, for blocking I/O
+      and for CPU work that mostly runs outside the GIL
+    - process: in its own pool of `max_workers` processes, for pure-Python
+      CPU work. The function must be defined at module level (workers
+      import it by name); arguments and results must be picklable.
+    - auto: inline while a moving average of its call time stays within
+      `inline_budget` seconds, in a thread pool while it is above. Each
+      call moves the average by `smoothing` of the difference, so one
+      slow call does not offload it for good.
+
+    Offloaded calls beyond `max_workers` running plus `max_queue` waiting
+    are refused with a ToolError rather than queued without bound.
+    """
+
+    def __init__(
+        self,
+        fn: Callable,
+        policy: Policy = "auto",
+        max_workers: int = 4,
+        max_queue: int = 32,
+        inline_budget: float = 0.002,
+        smoothing: float = 0.2,
+    ):
+        self.fn = fn
+        self.policy = policy
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.inline_budget = inline_budget
+        self.smoothing = smoothing
+        self.average = 0.0  # seconds per call, moving average
+        self.offloaded = policy in ("thread", "process")
+        self.pending = 0
+        self.inline_calls = 0
+        self.offloaded_calls = 0
+        self.rejected = 0
+        self._pool: Executor | None = None
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            if self.policy == "process":
+                # not fork: the server process runs threads and an event loop
+                self._pool = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix=f"tool-{self.fn.__name__}"
+                )
+        return self._pool
+
+    def _timed(self, args: tuple, kwargs: dict):
+        t0 = time.perf_counter()
+        try:
+            return self.fn(*args, **kwargs)
+        finally:
+            self.average += self.smoothing * (time.perf_counter() - t0 - self.average)
+            if self.policy == "auto":
+                self.offloaded = self.average > self.inline_budget
+
+    async def run(self, args: tuple, kwargs: dict):
+        if not self.offloaded:
+            self.inline_calls += 1
+            return self._timed(args, kwargs)
+
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ToolError(f"{self.fn.__name__} is busy, retry later")
+        self.pending += 1
+        self.offloaded_calls += 1
+        loop = asyncio.get_running_loop()
+        try:
+            if self.policy == "process":
+                return await loop.run_in_executor(
+                    self._executor(),
+                    _call,
+                    self.fn.__module__,
+                    self.fn.__qualname__,
+                    args,
+                    kwargs,
+                )
+            return await loop.run_in_executor(self._executor(), self._timed, args, kwargs)
+        finally:
+            self.pending -= 1
+
+    def metrics(self) -> dict:
+        return {
+            "policy": self.policy,
+            "offloaded": self.offloaded,
+            "average_ms": round(self.average * 1000, 3),
+            "pending": self.pending,
+            "inline_calls": self.inline_calls,
+            "offloaded_calls": self.offloaded_calls,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def execution(policy: Policy = "auto", **options) -> Callable[[Callable], Callable]:
+    """
+    Declares how a sync tool runs, below `@server.tool`:
+
+        @server.tool(description="...")
+        @execution("process", max_workers=2)
+        def crunch(n: int) -> int: ...
+
+    The tool keeps its signature; its ToolExecutor is `crunch.executor`.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        executor = ToolExecutor(fn, policy, **options)
+
+        @functools.wraps(fn)
+        async def tool(*args, **kwargs):
+            return await executor.run(args, kwargs)
+
+        tool.executor = executor
+        return tool
+
+    return decorate
@@ -1,21 +1,52 @@
+import asyncio
 import os
+import threading
+from contextlib import suppress
+from typing import Annotated, Literal
 
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 from fastmcp.server.auth.providers.bearer import BearerAuthProvider
+from fastmcp.tools.tool import ToolResult
+from pydantic import BaseModel, Field
+
+from catalogue import Catalogue, Matches
+from executor_policy import execution
 
 load_dotenv()
 
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN", "").rstrip("/")
 API_AUDIENCE = os.getenv("API_AUDIENCE", "")
 REQUIRED_SCOPES = ["read:add"]
+# optional CSV / JSON / JSON Lines file with name and price per item
+CATALOGUE_FILE = os.getenv("FURNITURE_CATALOGUE_FILE", "")
+# the agent keeps its session connections open between tool calls; stay
+# above its HTTP_KEEPALIVE_EXPIRY (uvicorn's default is 5s)
+KEEPALIVE_TIMEOUT = 75
+# largest page a tool returns in one call
+MAX_PAGE_SIZE = 500
+# how long a read of furniture://catalogue/version/{after} waits for a
+# change; below the agent's MCP_REQUEST_TIMEOUT
+VERSION_WAIT = float(os.getenv("CATALOGUE_VERSION_WAIT", "20"))
+Offset = Annotated[int, Field(ge=0)]
+Limit = Annotated[int, Field(ge=1, le=MAX_PAGE_SIZE)]
 
-auth = BearerAuthProvider(
-    jwks_uri=f"{AUTH0_DOMAIN}/.well-known/jwks.json",
-    issuer=f"{AUTH0_DOMAIN}/",
-    audience=API_AUDIENCE,
-    required_scopes=REQUIRED_SCOPES,
-)
+# running without auth has to be asked for, for local load tests only
+NO_AUTH = os.getenv("FURNITURE_NO_AUTH") == "1"
+
+if AUTH0_DOMAIN:
+    auth = BearerAuthProvider(
+        jwks_uri=f"{AUTH0_DOMAIN}/.well-known/jwks.json",
+        issuer=f"{AUTH0_DOMAIN}/",
+        audience=API_AUDIENCE,
+        required_scopes=REQUIRED_SCOPES,
+    )
+elif NO_AUTH:
+    auth = None
+else:
+    raise RuntimeError(
+        "AUTH0_DOMAIN is not set; set FURNITURE_NO_AUTH=1 to run without auth"
+    )
 
 server = FastMCP(
     name="FurniturePriceInfoServer",
@@ -29,31 +60,142 @@ furniture_db = [
     {"name": "Comfort Corner Sofa", "price": 499.00},
 ]
 
-def _find_matches(fragment: str):
-    q = fragment.lower()
-    return [item for item in furniture_db if q in item["name"].lower()]
+catalogue = (
+    Catalogue.from_file(CATALOGUE_FILE) if CATALOGUE_FILE else Catalogue(furniture_db)
+)
+
+class FurnitureItem(BaseModel):
+    name: str
+    price: float
+
+
+class FurniturePage(BaseModel):
+    items: list[FurnitureItem]
+    total: int
+    total_is_exact: bool
+    next_offset: int | None
+
+
+PAGE_SCHEMA = FurniturePage.model_json_schema()
 
-def _format_item(item):
-    return f"{item['name']} costs ${item['price']:.2f}"
+def _line(item) -> str:
+    return f"- {item['name']}: ${item['price']:.2f}"
 
-@server.tool(description="List all furniture and prices")
-def list_all_furniture() -> str:
-    if not furniture_db:
-        return "No furniture items are available."
-    return "\n".join(
-        f"- {item['name']}: ${item['price']:.2f}" for item in furniture_db
+def _page(matches: Matches, offset: int, lines: list[str] | None = None) -> ToolResult:
+    """
+    The page as typed data (structuredContent, see PAGE_SCHEMA) plus a
+    compact text rendering, which is what the agent's LLM reads.
+    """
+    shown = len(matches.items)
+    rest = matches.total - offset - shown
+    next_offset = offset + shown if rest > 0 else None
+    if not matches.total:
+        text = "No matching furniture item found."
+    else:
+        text = "\n".join(lines if lines is not None else map(_line, matches.items))
+        if next_offset is not None:
+            more = f"{rest}{'' if matches.exact else '+'}"
+            text += f"\n... {more} more (offset={next_offset})"
+    return ToolResult(
+        content=text,
+        structured_content=FurniturePage(
+            items=matches.items,
+            total=matches.total,
+            total_is_exact=matches.exact,
+            next_offset=next_offset,
+        ),
     )
 
-@server.tool(description="Get price/details for furniture by (partial) name")
-def get_furniture_price(name_fragment: str) -> str:
-    matches = _find_matches(name_fragment)
-    if not matches:
-        return "No matching furniture item found."
-    if len(matches) == 1:
-        return _format_item(matches[0])
-    return "Multiple matches:\n" + "\n".join(
-        f"- {item['name']}" for item in matches
+@server.tool(
+    description=(
+        "List furniture and prices, optionally only between min_price and "
+        "max_price, sorted by name or price, `limit` items from `offset`"
+    ),
+    output_schema=PAGE_SCHEMA,
+)
+@execution("auto", max_workers=4)
+def list_all_furniture(
+    min_price: float | None = None,
+    max_price: float | None = None,
+    sort: Literal["name", "price_asc", "price_desc"] = "name",
+    offset: Offset = 0,
+    limit: Limit = 100,
+) -> ToolResult:
+    if sort == "name" and min_price is None and max_price is None:
+        # whole catalogue by name: the text comes from the cached listing
+        matches = catalogue.search("", offset, limit)
+        return _page(matches, offset, catalogue.listing()[offset : offset + limit])
+    matches = catalogue.search(
+        "", offset, limit, min_price, max_price, "relevance" if sort == "name" else sort
     )
+    return _page(matches, offset)
+
+@server.tool(
+    description=(
+        "Get prices of furniture by (partial) name, best matches first or "
+        "sorted by price, optionally only between min_price and max_price"
+    ),
+    output_schema=PAGE_SCHEMA,
+)
+@execution("auto", max_workers=4)
+def get_furniture_price(
+    name_fragment: str,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    sort: Literal["relevance", "price_asc", "price_desc"] = "relevance",
+    offset: Offset = 0,
+    limit: Limit = 20,
+) -> ToolResult:
+    matches = catalogue.search(name_fragment, offset, limit, min_price, max_price, sort)
+    return _page(matches, offset)
+
+@server.resource("furniture://catalogue/version")
+def catalogue_version() -> str:
+    """Changes whenever the catalogue changes; clients use it to drop cached answers."""
+    return catalogue.version
+
+# long-polls of the version waiting for the next change; the server is
+# stateless, so it cannot push resources/updated notifications instead
+_version_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+_version_lock = threading.Lock()
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+def _catalogue_changed() -> None:
+    # catalogue writes may come from tool worker threads
+    with _version_lock:
+        waiters = list(_version_waiters)
+        _version_waiters.clear()
+    for loop, future in waiters:
+        loop.call_soon_threadsafe(_wake, future)
+
+catalogue.on_change = _catalogue_changed
+
+@server.resource("furniture://catalogue/version/{after}")
+async def next_catalogue_version(after: str) -> str:
+    """
+    The catalogue version as soon as it differs from `after`, or `after`
+    again after VERSION_WAIT seconds without a change.
+    """
+    loop = asyncio.get_running_loop()
+    waiter = (loop, loop.create_future())
+    with _version_lock:
+        _version_waiters.add(waiter)
+    try:
+        if catalogue.version == after:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(waiter[1], VERSION_WAIT)
+    finally:
+        with _version_lock:
+            _version_waiters.discard(waiter)
+    return catalogue.version
 
 if __name__ == "__main__":
-    server.run(transport="streamable-http", host="0.0.0.0", port=3000)
+    server.run(
+        transport="streamable-http",
+        host="0.0.0.0",
+        port=3000,
+        uvicorn_config={"timeout_keep_alive": KEEPALIVE_TIMEOUT},
+    )
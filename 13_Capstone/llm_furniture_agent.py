@@ -1,83 +1,476 @@
+import asyncio
+import json
 import os
+import time
 import traceback
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
 
+import anyio
 import httpx
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import create_react_agent
-from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from mcp import ClientSession, McpError
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import CONNECTION_CLOSED, TextContent, Tool
+from pydantic import AnyUrl
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.tools import StructuredTool
 
 load_dotenv()
 
-AUTH0_DOMAIN = os.environ["AUTH0_DOMAIN"].rstrip("/")
-AUTH0_CLIENT_ID = os.environ["AUTH0_CLIENT_ID"]
-AUTH0_CLIENT_SECRET = os.environ["AUTH0_CLIENT_SECRET"]
-API_AUDIENCE = os.environ["API_AUDIENCE"]
+# running without a token has to be asked for, against a furniture server
+# started with FURNITURE_NO_AUTH=1 for local load tests (see load_test.py)
+NO_AUTH = os.getenv("FURNITURE_NO_AUTH") == "1"
+
+if NO_AUTH:
+    AUTH0_DOMAIN = AUTH0_CLIENT_ID = AUTH0_CLIENT_SECRET = API_AUDIENCE = ""
+else:
+    AUTH0_DOMAIN = os.environ["AUTH0_DOMAIN"].rstrip("/")
+    AUTH0_CLIENT_ID = os.environ["AUTH0_CLIENT_ID"]
+    AUTH0_CLIENT_SECRET = os.environ["AUTH0_CLIENT_SECRET"]
+    API_AUDIENCE = os.environ["API_AUDIENCE"]
 
 TOKEN_URL = f"{AUTH0_DOMAIN}/oauth/token"
+FURNITURE_SERVER_URL = os.getenv(
+    "FURNITURE_SERVER_URL", "http://furniture_server:3000/mcp"
+)
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "8"))
+# below the furniture server's keep-alive timeout (see furniture_server.py),
+# so the client never reuses a connection the server is about to close
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+# a request unanswered this long means the session's connection is lost;
+# without it a request in flight when the connection drops never returns.
+# Also how long a request waits for a pooled session to become free.
+MCP_REQUEST_TIMEOUT = float(os.getenv("MCP_REQUEST_TIMEOUT", "30"))
+# backoff of a pooled session reconnecting after its connection was lost
+RECONNECT_DELAY = 0.5
+RECONNECT_MAX_BACKOFF = 30.0
+CATALOGUE_VERSION_URI = "furniture://catalogue/version"
+# tool schemas of the last run, to build the agent from at startup; checked
+# against the server once the agent is ready
+TOOL_CACHE_FILE = os.getenv(
+    "TOOL_CACHE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tool_cache.json"),
+)
+
+# Kept byte-for-byte identical across requests (as is the sorted tool list)
+# so the provider can cache the prompt prefix.
+SYSTEM_PROMPT = (
+    "You are the assistant of a furniture shop. Use the available tools to "
+    "look up furniture and prices, and answer briefly."
+)
+SUMMARY_PROMPT = (
+    "Summarize the conversation between a customer and a furniture shop "
+    "assistant in a few sentences. Keep names, prices and open questions."
+)
+
+
+class TokenAuth(httpx.Auth):
+    """
+    Sets the bearer token on every HTTP request, so open sessions pick up a
+    rotated token without being rebuilt. A 401 forces one refresh and retry.
+    """
+
+    def __init__(self, token: Callable[..., Awaitable[str | None]]):
+        self.token = token
+
+    async def async_auth_flow(self, request: httpx.Request):
+        token = await self.token()
+        if token:
+            request.headers["Authorization"] = f"Bearer {token}"
+        response = yield request
+
+        if response.status_code == 401 and token:
+            request.headers["Authorization"] = f"Bearer {await self.token(force=True)}"
+            yield request
+
+
+def _load_tool_cache(url: str) -> list[Tool] | None:
+    try:
+        with open(TOOL_CACHE_FILE) as f:
+            cached = json.load(f)
+        if cached["url"] != url:
+            return None
+        return [Tool.model_validate(tool) for tool in cached["tools"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _dump_tools(tools: list[Tool]) -> list[dict]:
+    return [t.model_dump(mode="json", by_alias=True, exclude_none=True) for t in tools]
+
+
+def _save_tool_cache(url: str, tools: list[Tool]) -> None:
+    tmp = f"{TOOL_CACHE_FILE}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump({"url": url, "tools": _dump_tools(tools)}, f)
+        os.replace(tmp, TOOL_CACHE_FILE)
+    except OSError:
+        traceback.print_exc()
+
+
+# langchain_openai, langgraph and langchain_core.tools take seconds to
+# import together, so they are imported on first use, in a worker thread
+# while the MCP sessions connect
+
+
+def _default_llm() -> "BaseChatModel":
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0)
+
+
+def _build_graph(llm: "BaseChatModel", tools: list["StructuredTool"]):
+    from langgraph.prebuilt import create_react_agent
+
+    return create_react_agent(llm, tools, prompt=SYSTEM_PROMPT)
+
+
+class McpSessionPool:
+    """
+    `size` long-lived, initialized sessions to the furniture server. Each
+    tool call checks one out exclusively and costs a single HTTP request on
+    the session's kept-alive connection. Each session is owned by a
+    background task, so the pool can be closed from any request, and a
+    session whose connection is lost is replaced: its task opens a new one,
+    with backoff while the server is unreachable.
+
+    `start()` returns once the first session is up; the others join the
+    pool as they connect. Each session lists the tools once when it opens
+    (the SDK checks tool results against the listed output schemas), and
+    again before its next use after `set_tools`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int = MCP_POOL_SIZE,
+        auth: httpx.Auth | None = None,
+        on_request: Callable[[httpx.Request], Awaitable[None]] | None = None,
+        tools: list[Tool] | None = None,
+    ):
+        self.url = url
+        self.size = size
+        self.auth = auth
+        self.on_request = on_request
+        self.tools: list[Tool] = tools or []
+        self.open_sessions = 0
+        self.reconnects = 0
+        self._generation = 0  # bumped by set_tools
+        self._listed: dict[ClientSession, int] = {}
+        # set when the session is found dead or the pool closes
+        self._alive: dict[ClientSession, asyncio.Event] = {}
+        self._idle: asyncio.Queue[ClientSession] = asyncio.Queue()
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error: BaseException | None = None
+        self._task: asyncio.Task | None = None
+
+    def _http_client(self, headers=None, timeout=None, auth=None) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            auth=auth,
+            limits=httpx.Limits(keepalive_expiry=HTTP_KEEPALIVE_EXPIRY),
+            event_hooks={"request": [self.on_request]} if self.on_request else None,
+        )
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    async def connect(self, stack: AsyncExitStack) -> ClientSession:
+        """An initialized session outside the pool, closed with `stack`."""
+        read, write, _ = await stack.enter_async_context(
+            streamablehttp_client(
+                self.url,
+                auth=self.auth,
+                httpx_client_factory=self._http_client,
+            )
+        )
+        session = await stack.enter_async_context(
+            ClientSession(
+                read, write, read_timeout_seconds=timedelta(seconds=MCP_REQUEST_TIMEOUT)
+            )
+        )
+        await session.initialize()
+        return session
+
+    async def _open(self, stack: AsyncExitStack) -> ClientSession:
+        session = await self.connect(stack)
+        tools = (await session.list_tools()).tools
+        if not self.tools:
+            self.tools = tools
+        self._listed[session] = self._generation
+        return session
+
+    def set_tools(self, tools: list[Tool]) -> None:
+        self.tools = tools
+        self._generation += 1
+
+    async def _keep(self, opened: asyncio.Future) -> None:
+        """
+        Holds one session until the pool closes, opening a new one whenever
+        it dies. `opened` gets the outcome of the first attempt; if that
+        fails the slot is given up.
+        """
+        delay = RECONNECT_DELAY
+        while not self._stop.is_set():
+            try:
+                async with AsyncExitStack() as stack:
+                    session = await self._open(stack)
+                    dead = self._alive[session] = asyncio.Event()
+                    self._idle.put_nowait(session)
+                    self.open_sessions += 1
+                    if opened.done():
+                        self.reconnects += 1
+                    else:
+                        opened.set_result(None)
+                    delay = RECONNECT_DELAY
+                    try:
+                        if not self._stop.is_set():
+                            await dead.wait()
+                    finally:
+                        del self._alive[session]
+                        self._listed.pop(session, None)
+                        self.open_sessions -= 1
+            except Exception as exc:
+                if not opened.done():
+                    opened.set_exception(exc)
+                    return
+                traceback.print_exc()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), delay)
+            delay = min(delay * 2, RECONNECT_MAX_BACKOFF)
+
+    async def _run(self) -> None:
+        keepers: list[asyncio.Task] = []
+        try:
+            for _ in range(self.size):
+                if self._stop.is_set():
+                    break
+                opened = asyncio.get_running_loop().create_future()
+                keepers.append(asyncio.create_task(self._keep(opened)))
+                try:
+                    await opened
+                except Exception as exc:
+                    if not self.open_sessions:
+                        self._error = exc
+                        break
+                    # serve with the sessions that are already open
+                    traceback.print_exc()
+                    break
+                self._ready.set()
+            await asyncio.gather(*keepers)
+        finally:
+            self._ready.set()
+
+    @asynccontextmanager
+    async def session(self):
+        while True:
+            try:
+                session = await asyncio.wait_for(self._idle.get(), MCP_REQUEST_TIMEOUT)
+            except TimeoutError:
+                raise TimeoutError(
+                    f"no MCP session to {self.url} free after {MCP_REQUEST_TIMEOUT}s "
+                    f"({self.open_sessions} of {self.size} open)"
+                ) from None
+            dead = self._alive.get(session)
+            if dead is not None and not dead.is_set():
+                break  # dead sessions are dropped here
+        try:
+            if self._listed[session] != self._generation:
+                generation = self._generation
+                await session.list_tools()
+                self._listed[session] = generation
+            yield session
+        except Exception as exc:
+            if _connection_lost(exc):
+                dead.set()  # its task opens a new one
+            raise
+        finally:
+            if not dead.is_set():
+                self._idle.put_nowait(session)
+
+    async def close(self) -> None:
+        self._stop.set()
+        for dead in list(self._alive.values()):
+            dead.set()
+        if self._task is not None:
+            await self._task
+
+
+def _connection_lost(exc: BaseException) -> bool:
+    if isinstance(exc, McpError):
+        return exc.error.code in (CONNECTION_CLOSED, httpx.codes.REQUEST_TIMEOUT)
+    return isinstance(
+        exc, (httpx.TransportError, anyio.ClosedResourceError, anyio.BrokenResourceError)
+    )
+
+
+def _tool_text(result) -> str:
+    return "\n".join(c.text for c in result.content if isinstance(c, TextContent))
 
 
 class FurnitureAgent:
-    def __init__(self) -> None:
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        self.client: MultiServerMCPClient | None = None
+    """
+    One agent graph and one pool of long-lived MCP sessions shared by all
+    requests; nothing in either is mutated per request. The token is
+    applied per HTTP request by `TokenAuth`. The tool list is fetched once
+    and kept, or taken from the previous run's TOOL_CACHE_FILE and checked
+    against the server in the background.
+    """
+
+    def __init__(
+        self, llm: "BaseChatModel | None" = None, pool_size: int = MCP_POOL_SIZE
+    ) -> None:
+        self.llm = llm  # the default model is created by initialize()
+        self.pool_size = pool_size
+        self.pool: McpSessionPool | None = None
+        self.tools: list["StructuredTool"] | None = None
         self.agent = None
         self.token = None
         self.expires = datetime.min
         self.is_initialized = False
+        self.init_error: str | None = None
+        self.init_seconds: float | None = None
+        self.tools_from_cache = False
+        self.http_requests = 0
+        self.tool_calls = 0
+        self._token_lock = asyncio.Lock()
+        self._init_lock = asyncio.Lock()
+        self._refresh: asyncio.Task | None = None
+
+    async def _fresh_token(self, force: bool = False) -> str | None:
+        if NO_AUTH:
+            return None
+
+        async with self._token_lock:
+            now = datetime.now(timezone.utc)
+            if (
+                not force
+                and self.token
+                and now + timedelta(seconds=60) < self.expires
+            ):
+                return self.token
+
+            payload = {
+                "grant_type": "client_credentials",
+                "client_id": AUTH0_CLIENT_ID,
+                "client_secret": AUTH0_CLIENT_SECRET,
+                "audience": API_AUDIENCE,
+                "scope": "read:add",
+            }
+
+            async with httpx.AsyncClient() as http:
+                r = await http.post(TOKEN_URL, json=payload, timeout=10)
+                r.raise_for_status()
+                data = r.json()
 
-    async def _fresh_token(self) -> str:
-        now = datetime.now(timezone.utc)
-        if self.token and now + timedelta(seconds=60) < self.expires:
+            self.token = data["access_token"]
+            self.expires = now + timedelta(seconds=data.get("expires_in", 3600))
             return self.token
 
-        payload = {
-            "grant_type": "client_credentials",
-            "client_id": AUTH0_CLIENT_ID,
-            "client_secret": AUTH0_CLIENT_SECRET,
-            "audience": API_AUDIENCE,
-            "scope": "read:add",
-        }
+    async def _count_request(self, request: httpx.Request) -> None:
+        self.http_requests += 1
+
+    def _make_tool(self, tool: Tool) -> "StructuredTool":
+        from langchain_core.tools import StructuredTool, ToolException
+
+        async def call(**arguments) -> str:
+            self.tool_calls += 1
+            async with self.pool.session() as session:
+                result = await session.call_tool(tool.name, arguments)
+            if result.isError:
+                raise ToolException(_tool_text(result))
+            return _tool_text(result)
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description or "",
+            args_schema=tool.inputSchema,
+            coroutine=call,
+            handle_tool_error=True,
+        )
 
-        async with httpx.AsyncClient() as http:
-            r = await http.post(TOKEN_URL, json=payload, timeout=10)
-            r.raise_for_status()
-            data = r.json()
+    async def _load_llm(self) -> None:
+        if self.llm is None:
+            self.llm = await asyncio.to_thread(_default_llm)
 
-        self.token = data["access_token"]
-        self.expires = now + timedelta(seconds=data.get("expires_in", 3600))
-        return self.token
+    def _build(self, tools: list[Tool]) -> tuple[list["StructuredTool"], object]:
+        structured = sorted((self._make_tool(t) for t in tools), key=lambda t: t.name)
+        return structured, _build_graph(self.llm, structured)
+
+    async def _use_tools(self, tools: list[Tool]) -> None:
+        self.tools, self.agent = await asyncio.to_thread(self._build, tools)
 
     async def initialize(self) -> None:
+        """
+        Connects the session pool while the model loads, then builds the
+        graph. Safe to call concurrently; only the first call does the work.
+        """
+        async with self._init_lock:
+            if self.is_initialized:
+                return
+            started = time.perf_counter()
+            try:
+                if self.pool is None:
+                    cached = _load_tool_cache(FURNITURE_SERVER_URL)
+                    pool = McpSessionPool(
+                        FURNITURE_SERVER_URL,
+                        self.pool_size,
+                        auth=TokenAuth(self._fresh_token),
+                        on_request=self._count_request,
+                        tools=cached,
+                    )
+                    try:
+                        await asyncio.gather(pool.start(), self._load_llm())
+                    except BaseException:
+                        await pool.close()
+                        raise
+                    self.pool = pool
+                    self.tools_from_cache = cached is not None
+                    if self.tools_from_cache:
+                        self._refresh = asyncio.create_task(self.refresh_tools())
+                    else:
+                        _save_tool_cache(FURNITURE_SERVER_URL, pool.tools)
+                await self._load_llm()
+                await self._use_tools(self.pool.tools)
+                self.is_initialized = True
+                self.init_error = None
+                self.init_seconds = time.perf_counter() - started
+            except Exception as e:
+                self.init_error = repr(e)
+                traceback.print_exc()
+                raise
+
+    async def refresh_tools(self) -> None:
+        """Lists the server's tools and rebuilds the graph if they changed."""
         try:
-            token = await self._fresh_token()
-            self.client = MultiServerMCPClient(
-                {
-                    "furn": {
-                        "transport": "streamable_http",
-                        "url": "http://furniture_server:3000/mcp",
-                        "headers": {"Authorization": f"Bearer {token}"},
-                    }
-                }
-            )
-            tools = await self.client.get_tools()
-            self.agent = create_react_agent(self.llm, tools)
-            self.is_initialized = True
+            async with self.pool.session() as session:
+                tools = (await session.list_tools()).tools
+            if _dump_tools(tools) != _dump_tools(self.pool.tools):
+                self.pool.set_tools(tools)
+                await self._use_tools(tools)
+                _save_tool_cache(FURNITURE_SERVER_URL, tools)
         except Exception:
             traceback.print_exc()
-            raise
+
+    async def _ready(self) -> None:
+        if not self.is_initialized:
+            await self.initialize()
 
     async def ask(self, messages: list[BaseMessage]) -> str:
         try:
-            if not self.is_initialized:
-                await self.initialize()
-
-            token = await self._fresh_token()
-            self.client.connections["furn"]["headers"]["Authorization"] = (
-                f"Bearer {token}"
-            )
+            await self._ready()
 
             result = await self.agent.ainvoke({"messages": messages})
             for msg in reversed(result["messages"]):
@@ -88,7 +481,89 @@ class FurnitureAgent:
             traceback.print_exc()
             return f"Error: {e}"
 
+    async def stream(self, messages: list[BaseMessage]) -> AsyncIterator[dict]:
+        """
+        Yields tool calls and answer tokens while the agent is still running,
+        then the final answer. Tokens are only for display: a model that does
+        not stream sends none, the answer comes from its last message.
+        """
+        await self._ready()
+
+        final: AIMessage | None = None
+        async for event in self.agent.astream_events(
+            {"messages": messages}, version="v2"
+        ):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    yield {"type": "token", "content": content}
+            elif kind == "on_chat_model_end":
+                final = event["data"]["output"]
+            elif kind == "on_tool_start":
+                yield {
+                    "type": "tool_start",
+                    "name": event["name"],
+                    "input": event["data"].get("input"),
+                }
+            elif kind == "on_tool_end":
+                output = event["data"].get("output")
+                yield {
+                    "type": "tool_end",
+                    "name": event["name"],
+                    "output": str(getattr(output, "content", output)),
+                }
+        yield {"type": "answer", "content": final.content if final is not None else ""}
+
+    async def summarize(self, summary: str | None, messages: list[BaseMessage]) -> str:
+        transcript = "\n".join(f"{m.type}: {m.content}" for m in messages)
+        if summary:
+            transcript = f"Earlier summary: {summary}\n{transcript}"
+        result = await self.llm.ainvoke(
+            [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content=transcript)]
+        )
+        return result.content
+
+    async def catalogue_version(self) -> str:
+        await self._ready()
+        async with self.pool.session() as session:
+            result = await session.read_resource(AnyUrl(CATALOGUE_VERSION_URI))
+        return result.contents[0].text
+
+    async def catalogue_versions(self) -> AsyncIterator[str]:
+        """
+        The catalogue version, then each new one as soon as the server
+        reports it: reads of furniture://catalogue/version/{after} return
+        on a change (or empty-handed after a while, and are repeated). They
+        hold a session of their own, not one of the pool's.
+        """
+        await self._ready()
+        version = await self.catalogue_version()
+        yield version
+        async with AsyncExitStack() as stack:
+            session = await self.pool.connect(stack)
+            while True:
+                uri = AnyUrl(f"{CATALOGUE_VERSION_URI}/{version}")
+                latest = (await session.read_resource(uri)).contents[0].text
+                if latest != version:
+                    version = latest
+                    yield version
+
+    def metrics(self) -> dict:
+        return {
+            "tool_calls": self.tool_calls,
+            "http_requests": self.http_requests,
+            "pool_size": self.pool_size,
+            "open_sessions": self.pool.open_sessions if self.pool else 0,
+            "init_seconds": self.init_seconds,
+            "tools_from_cache": self.tools_from_cache,
+        }
+
     async def close(self):
-        self.client = None
+        if self._refresh is not None:
+            self._refresh.cancel()
+        if self.pool is not None:
+            await self.pool.close()
+        self.pool = None
         self.agent = None
         self.is_initialized = False
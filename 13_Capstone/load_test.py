@@ -0,0 +1,161 @@
+"""
+Local load test for the agent API: starts furniture_server.py without auth,
+runs api_server in-process with a fake LLM that always looks up a price
+(one tool call, then an answer, each after `--llm-latency` seconds) and
+fires `--requests` /ask calls at each concurrency level.
+
+    python load_test.py --requests 200 --concurrency 1 8 32 128
+
+Questions are unique, so the answer cache never hits.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+os.environ.update(
+    AUTH0_DOMAIN="",
+    FURNITURE_NO_AUTH="1",
+    FURNITURE_SERVER_URL="http://127.0.0.1:3000/mcp",
+    CATALOGUE_CHECK_INTERVAL="3600",
+)
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import api_server
+from llm_furniture_agent import FurnitureAgent
+
+
+class FakeFurnitureLLM(BaseChatModel):
+    latency: float = 0.2
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-furniture"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._respond(messages)
+
+    def _respond(self, messages) -> ChatResult:
+        if isinstance(messages[-1], ToolMessage):
+            message = AIMessage(content=f"Here you go: {messages[-1].content}")
+        else:
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "get_furniture_price",
+                        "args": {"name_fragment": "sofa"},
+                        "id": uuid.uuid4().hex,
+                    }
+                ],
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"nothing listening on port {port}")
+
+
+async def run_level(client: httpx.AsyncClient, requests: int, concurrency: int) -> None:
+    agent_before = (await client.get("/metrics/agent")).json()
+    latencies: list[float] = []
+    queued: list[float] = []
+    statuses: dict[int, int] = {}
+    todo = iter(range(requests))
+
+    async def worker() -> None:
+        for i in todo:
+            body = {"messages": [{"role": "human", "content": f"price of sofa #{i} {uuid.uuid4()}"}]}
+            t0 = time.perf_counter()
+            r = await client.post("/ask", json=body)
+            latencies.append(time.perf_counter() - t0)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+            timing = r.headers.get("server-timing", "")
+            if timing.startswith("queue;dur="):
+                queued.append(float(timing.split(",")[0].split("=")[1]))
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    agent = (await client.get("/metrics/agent")).json()
+    tool_calls = agent["tool_calls"] - agent_before["tool_calls"]
+    http_requests = agent["http_requests"] - agent_before["http_requests"]
+
+    latencies.sort()
+    print(
+        f"concurrency {concurrency:>4}: {requests / elapsed:7.1f} req/s  "
+        f"p50 {latencies[len(latencies) // 2] * 1000:7.1f}ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:7.1f}ms  "
+        f"queue p50 {statistics.median(queued) if queued else 0:6.1f}ms  "
+        f"statuses {dict(sorted(statuses.items()))}  "
+        f"HTTP requests per tool call {http_requests / max(tool_calls, 1):.2f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    api_server.FurnitureAgent = lambda: FurnitureAgent(
+        llm=FakeFurnitureLLM(latency=args.llm_latency), pool_size=args.pool_size
+    )
+    app = api_server.app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://api", timeout=60
+        ) as client:
+            t0 = time.perf_counter()
+            while (await client.get("/readyz")).status_code != 200:
+                await asyncio.sleep(0.05)
+            agent = (await client.get("/metrics/agent")).json()
+            print(
+                f"ready after {time.perf_counter() - t0:.2f}s "
+                f"(tools from cache: {agent['tools_from_cache']})"
+            )
+            for concurrency in args.concurrency:
+                await run_level(client, args.requests, concurrency)
+            print("admission:", (await client.get("/metrics/admission")).json())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [sys.executable, "furniture_server.py"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(3000)
+        asyncio.run(main(args))
+    finally:
+        server.terminate()
+        server.wait()
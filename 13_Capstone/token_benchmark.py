@@ -0,0 +1,147 @@
+"""
+Tokens the agent's LLM reads for a few typical questions against a large
+catalogue: the tool definitions sent with every model call plus the tool
+results of the calls the agent needs. "before" are the original string
+tools (full listing, name-only matches), "after" the current tools, which
+filter, sort and limit on the server.
+
+    python token_benchmark.py --items 10000
+
+Counts use tiktoken's o200k_base encoding (gpt-4o-mini); without it
+(e.g. offline) they are estimated at 4 characters per token.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+
+from fastmcp import Client, FastMCP
+
+from catalogue_benchmark import synthetic_names, synthetic_price
+
+
+def token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text)), "o200k_base"
+    except Exception:
+        return lambda text: (len(text) + 3) // 4, "estimated (chars / 4)"
+
+
+def legacy_server(furniture_db: list[dict]) -> FastMCP:
+    """The furniture tools as they were before structured output."""
+    server = FastMCP(name="LegacyFurniture")
+
+    def _find_matches(fragment: str):
+        q = fragment.lower()
+        return [item for item in furniture_db if q in item["name"].lower()]
+
+    @server.tool(description="List all furniture and prices")
+    def list_all_furniture() -> str:
+        return "\n".join(
+            f"- {item['name']}: ${item['price']:.2f}" for item in furniture_db
+        )
+
+    @server.tool(description="Get price/details for furniture by (partial) name")
+    def get_furniture_price(name_fragment: str) -> str:
+        matches = _find_matches(name_fragment)
+        if not matches:
+            return "No matching furniture item found."
+        if len(matches) == 1:
+            item = matches[0]
+            return f"{item['name']} costs ${item['price']:.2f}"
+        return "Multiple matches:\n" + "\n".join(
+            f"- {item['name']}" for item in matches
+        )
+
+    return server
+
+
+def scenarios(names: list[str]) -> list[tuple[str, list, list]]:
+    """(question, tool calls before, tool calls after)"""
+    item = names[len(names) // 2]
+    return [
+        (
+            "How much is one specific item?",
+            [("get_furniture_price", {"name_fragment": item})],
+            [("get_furniture_price", {"name_fragment": item})],
+        ),
+        (
+            "What is the cheapest oak desk?",
+            # names only, so the prices have to come from the full listing
+            [
+                ("get_furniture_price", {"name_fragment": "oak desk"}),
+                ("list_all_furniture", {}),
+            ],
+            [
+                (
+                    "get_furniture_price",
+                    {"name_fragment": "oak desk", "sort": "price_asc", "limit": 1},
+                )
+            ],
+        ),
+        (
+            "Which sofas cost less than $100?",
+            [("list_all_furniture", {})],
+            [("get_furniture_price", {"name_fragment": "sofa", "max_price": 100})],
+        ),
+        (
+            "What do you sell?",
+            [("list_all_furniture", {})],
+            [("list_all_furniture", {})],
+        ),
+    ]
+
+
+async def measure(server: FastMCP, calls: list, count) -> tuple[int, int]:
+    async with Client(server) as client:
+        tools = await client.list_tools()
+        definitions = json.dumps(
+            [
+                {"name": t.name, "description": t.description, "parameters": t.inputSchema}
+                for t in tools
+            ]
+        )
+        results = 0
+        for name, arguments in calls:
+            result = await client.call_tool(name, arguments)
+            results += count("\n".join(c.text for c in result.content))
+    return count(definitions), results
+
+
+async def main(n: int) -> None:
+    count, encoding = token_counter()
+    names = synthetic_names(n)
+    furniture_db = [
+        {"name": name, "price": synthetic_price(i)} for i, name in enumerate(names)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalogue.json")
+        with open(path, "w") as f:
+            json.dump(furniture_db, f)
+        os.environ["FURNITURE_CATALOGUE_FILE"] = path
+        os.environ["AUTH0_DOMAIN"] = ""
+        os.environ["FURNITURE_NO_AUTH"] = "1"
+        from furniture_server import server
+
+    before_server = legacy_server(furniture_db)
+    print(f"{n} items, tokens: {encoding}")
+    print(f"{'question':<36}{'before':>10}{'after':>10}   (definitions + results)")
+    for question, before_calls, after_calls in scenarios(names):
+        before = await measure(before_server, before_calls, count)
+        after = await measure(server, after_calls, count)
+        print(
+            f"{question:<36}{sum(before):>10}{sum(after):>10}   "
+            f"({before[0]} + {before[1]} -> {after[0]} + {after[1]})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10_000)
+    asyncio.run(main(parser.parse_args().items))
@@ -0,0 +1,197 @@
+import asyncio
+import base64
+import json
+import os
+import time
+from pathlib import Path
+
+import httpx
+from authlib.jose import JsonWebKey, JsonWebSignature
+from authlib.jose.errors import BadSignatureError, DecodeError
+from authlib.jose.rfc7517 import Key
+from fastmcp.server.auth import JWTVerifier
+
+
+def _b64decode(segment: bytes) -> bytes:
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def _kid(token: str) -> str | None:
+    return json.loads(_b64decode(token.split(".", 1)[0].encode())).get("kid")
+
+
+def import_jwks(jwks: dict) -> dict[str | None, Key]:
+    """Signing keys of a JWKS document as ready-to-use key objects, by `kid`."""
+    keys = {}
+    for data in jwks.get("keys", []):
+        if data.get("use", "sig") == "sig":
+            keys[data.get("kid")] = JsonWebKey.import_key(data)
+    return keys
+
+
+class _PreparedJWT:
+    """
+    `JsonWebToken.decode` for compact tokens of one algorithm, checked
+    directly against an imported key instead of going through authlib's
+    generic header validation and key preparation on every call.
+    """
+
+    def __init__(self, algorithm: str):
+        self.algorithm = JsonWebSignature.ALGORITHMS_REGISTRY[algorithm]
+
+    def decode(self, token: str, key: Key) -> dict:
+        try:
+            signing_input, signature = token.encode().rsplit(b".", 1)
+            header, payload = signing_input.split(b".")
+            header = json.loads(_b64decode(header))
+            claims = json.loads(_b64decode(payload))
+            signature = _b64decode(signature)
+        except ValueError as e:
+            raise DecodeError(f"Malformed token: {e}")
+        if header.get("alg") != self.algorithm.name or "crit" in header:
+            raise DecodeError("Unexpected token header")
+        if not isinstance(claims, dict):
+            raise DecodeError("Token payload is not a JSON object")
+        if not self.algorithm.verify(signing_input, signature, key):
+            raise BadSignatureError(None)
+        return claims
+
+
+class LocalJWKSVerifier(JWTVerifier):
+    """
+    JWTVerifier that checks signatures against keys held in memory, imported
+    once into key objects so no PEM or JWK is parsed per token, and decoded
+    with a single-algorithm fast path (`_PreparedJWT`).
+
+    With `jwks_file` the keys come from that file, which is re-read when its
+    mtime changes (checked at most every `watch_interval` seconds, and at
+    once for an unknown `kid`), so keys are rotated by replacing the file.
+
+    Otherwise they come from `jwks_uri`, and the last fetched set is kept in
+    `cache_file`: a restart verifies from the cached copy without any network.
+    The remote set is fetched again for an unknown `kid` (at most every
+    `refresh_interval` seconds, or `retry_interval` while no keys are held)
+    and, in the background, once the held copy is older than an hour. If a
+    fetch fails the held keys stay in use.
+
+    `reloads` counts the key sets loaded, so caches of verified tokens can
+    tell when the keys changed.
+    """
+
+    def __init__(
+        self,
+        *args,
+        jwks_file: str | None = None,
+        cache_file: str | None = None,
+        watch_interval: float = 5.0,
+        refresh_interval: float = 300.0,
+        retry_interval: float = 5.0,
+        **kwargs,
+    ):
+        if jwks_file is not None:
+            kwargs.setdefault("jwks_uri", Path(jwks_file).resolve().as_uri())
+        super().__init__(*args, **kwargs)
+        self.jwt = _PreparedJWT(self.algorithm)
+        self.jwks_file = jwks_file
+        self.cache_file = cache_file
+        self.watch_interval = watch_interval
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.reloads = 0
+        self._keys: dict[str | None, Key] = {}
+        self._mtime: int | None = None
+        self._checked = 0.0
+        self._fetched = 0.0  # when the held remote set was fetched
+        self._attempted = 0.0  # when a fetch was last tried
+        self._lock = asyncio.Lock()
+        self._refreshing: asyncio.Task | None = None
+
+        if jwks_file is not None:
+            self._checked = time.monotonic()
+            self._reload_file()
+        elif cache_file is not None and os.path.exists(cache_file):
+            with open(cache_file) as f:
+                self._keys = import_jwks(json.load(f))
+            self._fetched = self._attempted = os.path.getmtime(cache_file)
+
+    def _known(self, kid: str | None) -> bool:
+        return kid in self._keys or (kid is None and len(self._keys) == 1)
+
+    def _reload_file(self) -> None:
+        try:
+            mtime = os.stat(self.jwks_file).st_mtime_ns
+            if mtime == self._mtime:
+                return
+            with open(self.jwks_file) as f:
+                keys = import_jwks(json.load(f))
+        except (OSError, ValueError) as e:
+            # missing or half-written file: keep the keys we have
+            if not self._keys:
+                raise ValueError(f"Failed to load JWKS file: {e}")
+            self.logger.warning("Keeping current keys, JWKS file unreadable: %s", e)
+            return
+        self._keys, self._mtime = keys, mtime
+        self.reloads += 1
+
+    async def _refresh(self) -> None:
+        async with self._lock:
+            # retry soon while there are no keys at all, every token fails until then
+            interval = self.refresh_interval if self._keys else self.retry_interval
+            if time.time() - self._attempted < interval:
+                return  # someone else just tried
+            self._attempted = time.time()
+            try:
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    response = await client.get(self.jwks_uri)
+                    response.raise_for_status()
+                    jwks = response.json()
+                keys = import_jwks(jwks)
+            except (httpx.HTTPError, ValueError) as e:
+                self.logger.warning("JWKS fetch failed, keeping current keys: %s", e)
+                return
+            self._keys, self._fetched = keys, time.time()
+            self.reloads += 1
+
+            if self.cache_file is not None:
+                tmp = self.cache_file + ".tmp"
+                with open(tmp, "w") as f:
+                    json.dump(jwks, f)
+                os.replace(tmp, self.cache_file)
+
+    def _background_refresh(self) -> None:
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._refresh())
+
+    def check_keys(self) -> None:
+        """
+        Picks up rotated keys: re-reads the JWKS file if it changed (checked
+        every `watch_interval` seconds), or refreshes a stale remote set in
+        the background.
+        """
+        if self.jwks_file is not None:
+            now = time.monotonic()
+            if now - self._checked >= self.watch_interval:
+                self._checked = now
+                self._reload_file()
+        elif time.time() - self._fetched > self._cache_ttl:
+            self._background_refresh()
+
+    async def _get_verification_key(self, token: str) -> Key:
+        try:
+            kid = _kid(token)
+        except ValueError as e:
+            raise ValueError(f"Failed to extract key ID from token: {e}")
+
+        self.check_keys()
+        if not self._known(kid):
+            if self.jwks_file is not None:
+                self._checked = time.monotonic()
+                self._reload_file()
+            else:
+                await self._refresh()
+
+        if kid in self._keys:
+            return self._keys[kid]
+        if kid is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+        raise ValueError(f"Key ID '{kid}' not found in JWKS")
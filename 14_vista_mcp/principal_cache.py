@@ -0,0 +1,98 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from fastmcp.server.auth import JWTVerifier
+from fastmcp.server.dependencies import AccessToken
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """What tools need to know about the caller, derived once per token."""
+
+    client_id: str
+    scopes: frozenset[str]
+    expires_at: int | None
+    claims: dict = field(repr=False, compare=False)
+
+    def info(self, slim: bool = True) -> dict:
+        """Caller info for a tool response; `slim=False` also echoes the raw claims."""
+        info = {"client_id": self.client_id, "scopes": sorted(self.scopes)}
+        if not slim:
+            info["expires_at"] = self.expires_at
+            info["token_claims"] = self.claims
+        return info
+
+
+class CachingJWTVerifier(JWTVerifier):
+    """
+    JWTVerifier that checks each distinct token once. The verified token and
+    its Principal are kept until the token expires (or `max_age` seconds for
+    tokens without `exp`), so the signature check runs once per token rather
+    than on every HTTP request of a session. Failed verifications are not
+    cached. When the verifier's key set reloads (its `reloads` count
+    changes, see LocalJWKSVerifier) the cache is cleared, so tokens signed
+    with a rotated-out key are rejected at once.
+    """
+
+    def __init__(self, *args, max_entries: int = 10_000, max_age: float = 3600.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._verified: OrderedDict[str, tuple[float, AccessToken, Principal]] = (
+            OrderedDict()
+        )
+        self._keys_seen = getattr(self, "reloads", 0)
+
+    def check_keys(self) -> None:
+        """Looks for rotated signing keys, if a verifier later in the MRO holds any."""
+        check = getattr(super(), "check_keys", None)
+        if check is not None:
+            check()
+
+    async def load_access_token(self, token: str) -> AccessToken | None:
+        # cache hits skip the key lookup, so look for rotated keys here
+        self.check_keys()
+        if getattr(self, "reloads", 0) != self._keys_seen:
+            self._keys_seen = getattr(self, "reloads", 0)
+            self._verified.clear()
+
+        entry = self._verified.get(token)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._verified.move_to_end(token)
+                self.hits += 1
+                return entry[1]
+            del self._verified[token]
+
+        self.misses += 1
+        access = await super().load_access_token(token)
+        if access is None:
+            return None
+
+        valid_until = time.time() + self.max_age
+        if access.expires_at is not None:
+            valid_until = min(valid_until, access.expires_at)
+        principal = Principal(
+            client_id=access.client_id,
+            scopes=frozenset(access.scopes),
+            expires_at=access.expires_at,
+            claims=access.claims,
+        )
+        self._verified[token] = (valid_until, access, principal)
+        while len(self._verified) > self.max_entries:
+            self._verified.popitem(last=False)
+        return access
+
+    def principal(self, access: AccessToken) -> Principal:
+        entry = self._verified.get(access.token)
+        if entry is not None:
+            return entry[2]
+        return Principal(
+            client_id=access.client_id,
+            scopes=frozenset(access.scopes),
+            expires_at=access.expires_at,
+            claims=access.claims,
+        )
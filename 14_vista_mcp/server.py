@@ -1,13 +1,16 @@
 from dataclasses import dataclass
 from enum import Enum
 from fastmcp import Context, FastMCP
-from fastmcp.server.auth import RemoteAuthProvider, JWTVerifier
+from fastmcp.server.auth import RemoteAuthProvider
 from fastmcp.server.dependencies import get_access_token, AccessToken
 from dotenv import load_dotenv
 import os
 from auth0.authentication import GetToken
 import asyncio
 
+from jwks_keys import LocalJWKSVerifier
+from principal_cache import CachingJWTVerifier, Principal
+
 load_dotenv()
 
 
@@ -27,31 +30,52 @@ CIMPRESS_OAUTH_AUDIENCE = "https://api.cimpress.io/"
 CIMPRESS_OAUTH_ALGORITHM = "RS256"
 
 AUTH_TOKEN_MAX_AGE_SECONDS = 24 * 60 * 60  # 24 hours
-jwt_verifier = JWTVerifier(jwks_uri=CIMPRESS_OAUTH_JWKS_URI, issuer=OAUTH_ISSUER.AUTH0, 
-                          audience=CIMPRESS_OAUTH_AUDIENCE, base_url=base_url)
+# A local JWKS file (rotated by replacing it) takes precedence; otherwise the
+# remote set is fetched once and kept in the cache file for offline restarts.
+CIMPRESS_JWKS_FILE = os.getenv("CIMPRESS_JWKS_FILE") or None
+CIMPRESS_JWKS_CACHE_FILE = os.getenv(
+    "CIMPRESS_JWKS_CACHE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".jwks_cache.json"),
+)
+
+class VistaJWTVerifier(CachingJWTVerifier, LocalJWKSVerifier):
+    """Per-token cache on top of locally held, pre-parsed signing keys."""
+
+jwt_verifier = VistaJWTVerifier(jwks_uri=CIMPRESS_OAUTH_JWKS_URI, jwks_file=CIMPRESS_JWKS_FILE,
+                                cache_file=CIMPRESS_JWKS_CACHE_FILE, issuer=OAUTH_ISSUER.AUTH0,
+                                audience=CIMPRESS_OAUTH_AUDIENCE, base_url=base_url,
+                                max_age=AUTH_TOKEN_MAX_AGE_SECONDS)
 auth_provider = RemoteAuthProvider(token_verifier=jwt_verifier, authorization_servers=[CIMPRESS_OAUTH_BASE_URL], 
                                    base_url=base_url)
 
 mcp = FastMCP("My Vista MCP Server", auth=jwt_verifier)
 
+def current_principal() -> Principal | None:
+    """The caller of the current request, from the verifier's per-token cache."""
+    token: AccessToken | None = get_access_token()
+    return None if token is None else jwt_verifier.principal(token)
+
 @mcp.tool
 async def add(a: int, b: int, ctx: Context) -> dict:
+    """Add two numbers for an authenticated caller."""
+    principal = current_principal()
+
+    if principal is None:
+        return {"authenticated": False}
+
+    # slim: no claims echoed back on every call
+    return {"authenticated": True, **principal.info(slim=True), "result": a + b}
+
+@mcp.tool
+async def whoami(ctx: Context) -> dict:
 
     """Get information about the authenticated user."""
-    # Get the access token (None if not authenticated)
-    token: AccessToken | None = get_access_token()
-    
-    if token is None:
+    principal = current_principal()
+
+    if principal is None:
         return {"authenticated": False}
-    
-    return {
-        "authenticated": True,
-        "client_id": token.client_id,
-        "scopes": token.scopes,
-        "expires_at": token.expires_at,
-        "token_claims": token.claims,  # JWT claims or custom token data
-        "result": a + b
-    }
+
+    return {"authenticated": True, **principal.info(slim=False)}
 
 if __name__ == "__main__":
     mcp.run(transport="http", host="0.0.0.0", port=8005)
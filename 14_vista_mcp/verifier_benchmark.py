@@ -0,0 +1,110 @@
+"""
+Times signature verification of RS256 test tokens, without the per-token
+cache, for:
+
+- pem: JWTVerifier(public_key=...), which parses the PEM on every token
+- jwks: JWTVerifier(jwks_uri=...) with its JWKS already fetched (the
+  current server's steady state)
+- local: LocalJWKSVerifier reading a JWKS file, keys imported once
+
+then rotates the file to a new key and checks that tokens signed with it
+are accepted (and the old ones rejected) on the next file check.
+
+    python verifier_benchmark.py --tokens 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from authlib.jose import JsonWebKey
+from fastmcp.server.auth import JWTVerifier
+from fastmcp.server.auth.providers.jwt import RSAKeyPair
+
+from jwks_keys import LocalJWKSVerifier
+
+ISSUER = "https://issuer.example/"
+AUDIENCE = "https://api.example/"
+
+
+def jwks_for(pair: RSAKeyPair, kid: str) -> dict:
+    jwk = JsonWebKey.import_key(pair.public_key, {"kty": "RSA"}).as_dict()
+    return {"keys": [{**jwk, "kid": kid, "use": "sig", "alg": "RS256"}]}
+
+
+def write_jwks(path: str, jwks: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(jwks, f)
+    os.replace(tmp, path)
+
+
+def tokens_for(pair: RSAKeyPair, kid: str, n: int) -> list[str]:
+    return [
+        pair.create_token(
+            subject=f"client-{i}", issuer=ISSUER, audience=AUDIENCE, kid=kid
+        )
+        for i in range(n)
+    ]
+
+
+async def rate(verifier: JWTVerifier, tokens: list[str]) -> float:
+    t0 = time.perf_counter()
+    for token in tokens:
+        if await verifier.load_access_token(token) is None:
+            raise RuntimeError(f"{type(verifier).__name__} rejected a valid token")
+    return len(tokens) / (time.perf_counter() - t0)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=2000)
+    args = parser.parse_args()
+
+    pair = RSAKeyPair.generate()
+    tokens = tokens_for(pair, "k1", args.tokens)
+
+    pem = JWTVerifier(public_key=pair.public_key, issuer=ISSUER, audience=AUDIENCE)
+    jwks = JWTVerifier(
+        jwks_uri="https://issuer.example/.well-known/jwks.json",
+        issuer=ISSUER,
+        audience=AUDIENCE,
+    )
+    jwks._jwks_cache = {
+        "k1": JsonWebKey.import_key(pair.public_key, {"kty": "RSA"}).get_public_key()
+    }
+    jwks._jwks_cache_time = time.time()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jwks.json")
+        write_jwks(path, jwks_for(pair, "k1"))
+        local = LocalJWKSVerifier(
+            jwks_file=path, issuer=ISSUER, audience=AUDIENCE, watch_interval=0.0
+        )
+
+        results = {}
+        for label, verifier in [("pem", pem), ("jwks", jwks), ("local", local)]:
+            await rate(verifier, tokens[:100])  # warm up
+            results[label] = await rate(verifier, tokens)
+        for label, per_second in results.items():
+            print(
+                f"{label:<6} {per_second:10,.0f} verifications/s "
+                f"({per_second / results['jwks']:.2f}x jwks)"
+            )
+
+        rotated = RSAKeyPair.generate()
+        write_jwks(path, jwks_for(rotated, "k2"))
+        new_ok = await local.load_access_token(tokens_for(rotated, "k2", 1)[0])
+        old_ok = await local.load_access_token(tokens[0])
+        print(
+            f"rotation: new key {'accepted' if new_ok else 'REJECTED'}, "
+            f"old key {'ACCEPTED' if old_ok else 'rejected'}, "
+            f"{local.reloads} file loads"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""
+Import-time startup benchmark for every server in the repo.
+
+Each server module is imported (not run) in a fresh interpreter with
+`python -X importtime`, from its own directory, `--repeat` times. For
+each server it reports the fastest run's cumulative import time, the
+number of modules imported and the heaviest top-level packages.
+
+The number of modules is checked against startup_budget.json: unlike the
+time, it is the same on every run and machine, and a heavy dependency
+imported at startup shows up as hundreds of extra modules. Exits with
+status 1 if a server is over its budget or no longer imports. Servers
+without a budget that fail to import (e.g. on an SDK version they do not
+support) are listed separately and do not fail the check:
+
+    python startup_benchmark.py
+    python startup_benchmark.py --update   # rewrite the budget from this run
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUDGET_FILE = os.path.join(HERE, "startup_budget.json")
+SERVERS = [
+    "01_FirstMCPServer/server.py",
+    "02_TransportMethods/sse/server.py",
+    "02_TransportMethods/stdinout/server.py",
+    "02_TransportMethods/streamable_http/server.py",
+    "03_RessourcesPromptsTools/server.py",
+    "04_Context/server.py",
+    "05_Discovery/server.py",
+    "06_Roots/server.py",
+    "07_Sampling/server.py",
+    "08_LangGraph_MCP/server.py",
+    "09_Authorization/server.py",
+    "10_Fastapi_Integration/app.py",
+    "11_Composition/server.py",
+    "12_Proxy_Servers/backend_server_1.py",
+    "12_Proxy_Servers/backend_server_2.py",
+    "12_Proxy_Servers/proxy_servers.py",
+    "13_Capstone/api_server.py",
+    "13_Capstone/furniture_server.py",
+    "14_vista_mcp/server.py",
+]
+# placeholders for settings a server cannot be imported without
+SERVER_ENV = {
+    "09_Authorization/server.py": {"AUTH0_DOMAIN": "https://example.auth0.com"},
+    "13_Capstone/furniture_server.py": {"FURNITURE_NO_AUTH": "1"},
+}
+# budget = modules imported * HEADROOM on --update, room for small additions
+HEADROOM = 1.1
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_times(path: str) -> tuple[float, int, list[tuple[str, float]]]:
+    """Cumulative import time of the module at `path` in seconds, the
+    number of modules it imports and its top-level packages by cumulative
+    import time."""
+    directory, filename = os.path.split(os.path.join(HERE, path))
+    module = filename.removesuffix(".py")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=directory,
+        env={**os.environ, "PYTHONPATH": directory, **SERVER_ENV.get(path, {})},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total, modules, packages = None, 0, []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match is None:
+            continue
+        modules += 1
+        _, cumulative, indent, name = match.groups()
+        if name == module and not indent:
+            total = int(cumulative) / 1e6
+        elif "." not in name:
+            packages.append((name, int(cumulative) / 1e6))
+    packages.sort(key=lambda p: p[1], reverse=True)
+    return total, modules, packages
+
+
+def load_budget() -> dict[str, int]:
+    try:
+        with open(BUDGET_FILE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main(args: argparse.Namespace) -> int:
+    budget = load_budget()
+    measured: dict[str, int] = {}
+    over = 0
+    skipped: list[tuple[str, str]] = []
+    for path in args.servers:
+        try:
+            runs = [import_times(path) for _ in range(args.repeat)]
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            if path not in budget:
+                skipped.append((path, str(e)))
+                continue
+            print(f"{path:<46} failed to import: {e}")
+            over += 1
+            continue
+        seconds, modules, packages = min(runs, key=lambda run: run[0])
+        measured[path] = modules
+        limit = budget.get(path)
+        status = f"{modules:5d} modules"
+        if limit is not None:
+            status += f" (budget {limit})"
+            if modules > limit:
+                status += " OVER"
+                over += 1
+        heaviest = ", ".join(f"{name} {t * 1000:.0f}ms" for name, t in packages[: args.top])
+        print(f"{path:<46} {seconds * 1000:6.0f}ms  {status:<30} {heaviest}")
+
+    if skipped:
+        print("\nnot measured, failed to import and no budget:")
+        for path, error in skipped:
+            print(f"  {path:<44} {error}")
+
+    if args.update:
+        budget.update({path: int(m * HEADROOM) for path, m in measured.items()})
+        with open(BUDGET_FILE, "w") as f:
+            json.dump(dict(sorted(budget.items())), f, indent=2)
+            f.write("\n")
+        print(f"\nwrote {len(measured)} budgets to {BUDGET_FILE}")
+        return 0
+    if over:
+        print(f"\n{over} server(s) over budget or failing to import")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("servers", nargs="*", default=SERVERS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=4, help="heaviest packages to list")
+    parser.add_argument("--update", action="store_true")
+    sys.exit(main(parser.parse_args()))